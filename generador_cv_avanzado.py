@@ -5,7 +5,9 @@ from datetime import datetime
 from docx import Document
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib import colors
 import json
 import logging
 import sqlite3
@@ -17,10 +19,24 @@ from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email import encoders
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 import time
-from urllib.parse import urljoin, urlparse
-from typing import Optional, Dict, Any, List, Tuple
+import threading
+import queue
+import hashlib
+import unicodedata
+import bisect
+import heapq
+import math
+import copy
+import io
+import contextlib
+import shutil
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+from typing import Optional, Dict, Any, List, Tuple, Iterator, Iterable
 
 # Intentar cargar python-dotenv (opcional)
 try:
@@ -31,6 +47,34 @@ except ImportError:
     DOTENV_AVAILABLE = False
     logging.warning("python-dotenv no está instalado. Para usar .env: pip install python-dotenv")
 
+# Backends de parsing HTML opcionales (html.parser siempre está disponible)
+try:
+    import lxml  # noqa: F401 - solo se verifica que esté instalado
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# NumPy opcional: acelera el scoring de fit por lotes
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# pyarrow opcional: lectura y escritura de trabajos/batch en Parquet
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 # Configurar logging con encoding UTF-8
 logging.basicConfig(
     level=logging.INFO,
@@ -53,11 +97,1398 @@ class FileProcessingError(CVGeneratorError):
     """Error procesando archivos"""
     pass
 
+class LimitadorPorHost:
+    """Aplica el delay de cortesía entre requests de forma independiente por host.
+
+    Cada host tiene su propio "próximo turno": los hilos que apuntan al mismo
+    portal se serializan respetando el delay, mientras que portales distintos
+    pueden consultarse en paralelo.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._proximo_turno: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def esperar_turno(self, host: str, deadline: Optional[float] = None) -> bool:
+        """Bloquea hasta que el host admita un nuevo request.
+
+        Devuelve False (sin esperar) si el turno asignado cae después del deadline.
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._proximo_turno.get(host, ahora))
+            if deadline is not None and turno > deadline:
+                return False
+            self._proximo_turno[host] = turno + self.delay
+
+        espera = turno - time.monotonic()
+        if espera > 0:
+            time.sleep(espera)
+        return True
+
+class CacheRespuestasHTTP:
+    """Cache en disco de respuestas HTTP con soporte para GET condicional.
+
+    Cada URL se guarda como dos archivos (cuerpo + metadatos JSON) nombrados por
+    el hash de la URL. Dentro del TTL la respuesta se sirve sin tocar la red;
+    vencido el TTL se revalida con If-None-Match / If-Modified-Since.
+    """
+
+    def __init__(self, carpeta: str, ttl_segundos: int):
+        self.carpeta = carpeta
+        self.ttl_segundos = ttl_segundos
+        os.makedirs(self.carpeta, exist_ok=True)
+
+    def _rutas(self, url: str) -> Tuple[str, str]:
+        clave = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.carpeta, clave)
+        return base + '.body', base + '.json'
+
+    def obtener(self, url: str) -> Optional[Dict[str, Any]]:
+        """Devuelve la entrada cacheada (metadatos + 'content') o None"""
+        ruta_body, ruta_meta = self._rutas(url)
+        try:
+            with open(ruta_meta, 'r', encoding='utf-8') as f:
+                entrada = json.load(f)
+            with open(ruta_body, 'rb') as f:
+                entrada['content'] = f.read()
+            return entrada
+        except (OSError, ValueError):
+            return None
+
+    def es_fresca(self, entrada: Dict[str, Any]) -> bool:
+        return time.time() - entrada.get('guardado_en', 0) < self.ttl_segundos
+
+    def headers_condicionales(self, entrada: Dict[str, Any]) -> Dict[str, str]:
+        headers = {}
+        if entrada.get('etag'):
+            headers['If-None-Match'] = entrada['etag']
+        if entrada.get('last_modified'):
+            headers['If-Modified-Since'] = entrada['last_modified']
+        return headers
+
+    def guardar(self, url: str, content: bytes, etag: Optional[str], last_modified: Optional[str]):
+        ruta_body, ruta_meta = self._rutas(url)
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'guardado_en': time.time()
+        }
+        # Escritura atómica: otro hilo nunca ve un archivo a medio escribir
+        for ruta, datos, modo in ((ruta_body, content, 'wb'), (ruta_meta, json.dumps(meta), 'w')):
+            tmp = f"{ruta}.{threading.get_ident()}.tmp"
+            with open(tmp, modo, **({} if 'b' in modo else {'encoding': 'utf-8'})) as f:
+                f.write(datos)
+            os.replace(tmp, ruta)
+
+    def renovar(self, url: str, entrada: Dict[str, Any]):
+        """Marca una entrada revalidada (304) como fresca otra vez"""
+        self.guardar(url, entrada['content'], entrada.get('etag'), entrada.get('last_modified'))
+
+    @staticmethod
+    def como_respuesta(url: str, content: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response._content = content
+        response.url = url
+        response.encoding = 'utf-8'
+        return response
+
+class ExtractorPortal:
+    """Parser + selectores CSS de un portal.
+
+    Backends soportados: 'selectolax' (lexbor), 'lxml' y 'html.parser'. Si el
+    backend pedido no está instalado se cae al siguiente disponible. Con los
+    backends de BeautifulSoup los selectores se compilan una sola vez con
+    soupsieve, y cuando el selector del contenedor es simple (tag, .clase,
+    tag.clase o #id) solo se construyen los subárboles de los contenedores de
+    trabajos en lugar del documento completo. selectolax no expone selectores
+    precompilados: lexbor vuelve a parsear el selector en cada búsqueda.
+    """
+
+    CAMPOS = ('title', 'company', 'description', 'salary', 'location')
+    _SELECTOR_SIMPLE = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*)?(?:(?P<tipo>[.#])(?P<valor>[\w-]+))?$')
+
+    def __init__(self, selectores: Dict[str, str], parser: str = 'lxml'):
+        self.backend = self.resolver_backend(parser)
+        self.selector_contenedor = selectores['job_container']
+        self.selectores_campos = {campo: selectores.get(campo) or None for campo in self.CAMPOS}
+        
+        if self.backend != 'selectolax':
+            self._contenedor = soupsieve.compile(self.selector_contenedor)
+            self._campos = {
+                campo: soupsieve.compile(sel) if sel else None
+                for campo, sel in self.selectores_campos.items()
+            }
+            self._strainer = self.crear_strainer(self.selector_contenedor)
+
+    @staticmethod
+    def resolver_backend(parser: str) -> str:
+        if parser == 'selectolax' and SELECTOLAX_AVAILABLE:
+            return 'selectolax'
+        if parser in ('selectolax', 'lxml') and LXML_AVAILABLE:
+            return 'lxml'
+        return 'html.parser'
+
+    @classmethod
+    def crear_strainer(cls, selector: str) -> Optional[SoupStrainer]:
+        """SoupStrainer equivalente al selector, o None si no es un selector simple"""
+        match = cls._SELECTOR_SIMPLE.match(selector.strip())
+        if not match or not (match.group('tag') or match.group('tipo')):
+            return None
+        attrs = {}
+        if match.group('tipo') == '.':
+            attrs['class'] = match.group('valor')
+        elif match.group('tipo') == '#':
+            attrs['id'] = match.group('valor')
+        return SoupStrainer(match.group('tag'), attrs)
+
+    def contenedores(self, content: bytes) -> list:
+        """Parsea el HTML y devuelve los contenedores de trabajos"""
+        if self.backend == 'selectolax':
+            return LexborHTMLParser(content).css(self.selector_contenedor)
+        soup = BeautifulSoup(content, self.backend, parse_only=self._strainer)
+        return self._contenedor.select(soup)
+
+    def texto(self, contenedor, campo: str) -> Optional[str]:
+        """Texto del primer elemento del campo dentro del contenedor (None si no hay)"""
+        if self.backend == 'selectolax':
+            selector = self.selectores_campos.get(campo)
+            nodo = contenedor.css_first(selector) if selector else None
+            return nodo.text(strip=True) if nodo is not None else None
+        
+        patron = self._campos.get(campo)
+        elem = patron.select_one(contenedor) if patron else None
+        return elem.get_text(strip=True) if elem is not None else None
+
+class CacheCVBase:
+    """CV base parseado una sola vez, en memoria y en disco, por ruta + mtime + tamaño.
+
+    python-docx tarda en abrir el .docx; mientras el archivo no cambie se
+    reutiliza el resultado (párrafos y texto unido). Si cambia el mtime o el
+    tamaño se vuelve a parsear solo.
+    """
+
+    def __init__(self, ruta: str, carpeta: Optional[str] = None):
+        self.ruta = ruta
+        self.carpeta = carpeta
+        self._entrada: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self.parseos = 0
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+
+    def firma(self) -> List[Any]:
+        stat = os.stat(self.ruta)
+        return [os.path.abspath(self.ruta), stat.st_mtime_ns, stat.st_size]
+
+    def _ruta_disco(self) -> str:
+        nombre = hashlib.sha256(os.path.abspath(self.ruta).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.carpeta, f"cv_base_{nombre}.json")
+
+    def obtener(self) -> Dict[str, Any]:
+        """{'parrafos': [...no vacíos], 'texto': str, 'total_parrafos': int}"""
+        firma = self.firma()
+        with self._lock:
+            if self._entrada is not None and self._entrada['firma'] == firma:
+                return self._entrada
+            
+            entrada = self._leer_disco(firma)
+            if entrada is None:
+                entrada = self._parsear(firma)
+                self._guardar_disco(entrada)
+            self._entrada = entrada
+            return entrada
+
+    def _parsear(self, firma: List[Any]) -> Dict[str, Any]:
+        doc = Document(self.ruta)
+        self.parseos += 1
+        parrafos = [p.text for p in doc.paragraphs if p.text.strip() != ""]
+        logging.info(f"CV base parseado: {self.ruta}")
+        return {
+            'firma': firma,
+            'parrafos': parrafos,
+            'texto': "\n".join(parrafos),
+            'total_parrafos': len(doc.paragraphs)
+        }
+
+    def _leer_disco(self, firma: List[Any]) -> Optional[Dict[str, Any]]:
+        if not self.carpeta:
+            return None
+        try:
+            with open(self._ruta_disco(), 'r', encoding='utf-8') as f:
+                entrada = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entrada if entrada.get('firma') == firma else None
+
+    def _guardar_disco(self, entrada: Dict[str, Any]):
+        if not self.carpeta:
+            return
+        ruta = self._ruta_disco()
+        tmp = f"{ruta}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entrada, f, ensure_ascii=False)
+            os.replace(tmp, ruta)
+        except OSError as e:
+            logging.warning(f"No se pudo guardar el cache del CV base: {e}")
+
+class PlantillaCV:
+    """CV base compilado una vez en segmentos fijos y slots con nombre.
+
+    Slots: 'titulo' (cada aparición del título base), 'perfil' (primera oración
+    del primer párrafo de la sección de perfil), 'logros' (al final de la
+    sección de logros) y 'tecnologias' (al final del documento). Renderizar una
+    variante es un solo join. Si una sección no está en el CV se avisa al
+    compilar, en vez de que la adaptación no haga nada sin decirlo.
+    """
+
+    SECCIONES = ['Perfil Profesional', 'Logros Relevantes', 'Experiencia Profesional',
+                 'Tecnologías y Herramientas', 'Educación', 'Experiencias Técnicas Destacadas']
+
+    def __init__(self, texto_cv: str, ancla_titulo: str = 'QA Engineer',
+                 seccion_perfil: str = 'Perfil Profesional', seccion_logros: str = 'Logros Relevantes'):
+        self.texto_cv = texto_cv
+        self.segmentos: List[Tuple[bool, str]] = []
+        self.slots = set()
+        fijos = []
+        
+        lineas = texto_cv.split('\n')
+        seccion = None
+        perfil_pendiente = True
+        for i, linea in enumerate(lineas):
+            limpia = linea.strip()
+            if limpia in self.SECCIONES:
+                seccion = limpia
+            elif seccion == seccion_perfil and perfil_pendiente and limpia:
+                # La primera oración del perfil se reemplaza por el perfil adaptado
+                fin = linea.find('. ')
+                fin = len(linea) if fin == -1 else fin + 1
+                self._agregar_slot('perfil')
+                linea = linea[fin:]
+                perfil_pendiente = False
+            
+            self._agregar_texto(linea, ancla_titulo, fijos)
+            
+            siguiente = lineas[i + 1].strip() if i + 1 < len(lineas) else None
+            if seccion == seccion_logros and limpia and (siguiente is None or siguiente in self.SECCIONES):
+                self._agregar_slot('logros')
+            if i + 1 < len(lineas):
+                self._agregar_fijo('\n', fijos)
+        
+        self._agregar_slot('tecnologias')
+        self._texto_fijo = ''.join(fijos).lower()
+        
+        for slot, descripcion in (('titulo', f"el título '{ancla_titulo}'"),
+                                  ('perfil', f"la sección '{seccion_perfil}'"),
+                                  ('logros', f"la sección '{seccion_logros}'")):
+            if slot not in self.slots:
+                logging.warning(f"Plantilla CV: no se encontró {descripcion}; ese bloque no se adaptará")
+
+    def _agregar_fijo(self, texto: str, fijos: List[str]):
+        if not texto:
+            return
+        fijos.append(texto)
+        if self.segmentos and not self.segmentos[-1][0]:
+            self.segmentos[-1] = (False, self.segmentos[-1][1] + texto)
+        else:
+            self.segmentos.append((False, texto))
+
+    def _agregar_slot(self, nombre: str):
+        self.segmentos.append((True, nombre))
+        self.slots.add(nombre)
+
+    def _agregar_texto(self, linea: str, ancla_titulo: str, fijos: List[str]):
+        partes = linea.split(ancla_titulo) if ancla_titulo else [linea]
+        for j, parte in enumerate(partes):
+            if j:
+                self._agregar_slot('titulo')
+            self._agregar_fijo(parte, fijos)
+
+    def contiene(self, texto: str, valores: Dict[str, str]) -> bool:
+        """Si texto (en minúsculas) aparece en el CV renderizado con esos valores"""
+        return texto in self._texto_fijo or any(texto in valor.lower() for valor in valores.values())
+
+    def renderizar(self, valores: Dict[str, str]) -> str:
+        return ''.join(valores.get(texto, '') if es_slot else texto for es_slot, texto in self.segmentos)
+
+def escribir_archivo_atomico(ruta: str, contenido: bytes):
+    """Escribe en un temporal y lo renombra: nunca queda un archivo a medio escribir"""
+    tmp = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(contenido)
+    os.replace(tmp, ruta)
+
+class AlmacenContenido:
+    """Archivos generados guardados una sola vez por hash de contenido.
+
+    Cada objeto vive en <carpeta>/<hash[:2]>/<hash><extension>; los nombres por
+    postulación son hardlinks al objeto (o copias si el sistema de archivos no
+    admite hardlinks). Así N postulaciones con el mismo CV adaptado ocupan un
+    solo PDF y se renderizan una sola vez.
+    """
+
+    def __init__(self, carpeta: str, extension: str = '.pdf'):
+        self.carpeta = carpeta
+        self.extension = extension
+        os.makedirs(carpeta, exist_ok=True)
+
+    @staticmethod
+    def calcular_hash(*partes: str) -> str:
+        return hashlib.sha256('\x00'.join(partes).encode('utf-8')).hexdigest()
+
+    def ruta(self, hash_contenido: str) -> str:
+        return os.path.join(self.carpeta, hash_contenido[:2], hash_contenido + self.extension)
+
+    def existe(self, hash_contenido: str) -> bool:
+        return os.path.exists(self.ruta(hash_contenido))
+
+    def guardar(self, hash_contenido: str, escribir) -> str:
+        """Crea el objeto llamando a escribir(ruta_temporal); escritura atómica"""
+        ruta = self.ruta(hash_contenido)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        tmp = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            escribir(tmp)
+            os.replace(tmp, ruta)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return ruta
+
+    def guardar_bytes(self, hash_contenido: str, contenido: bytes) -> str:
+        return self.guardar(hash_contenido, lambda ruta: escribir_archivo_atomico(ruta, contenido))
+
+    def publicar(self, hash_contenido: str, destino: str):
+        """Expone el objeto con el nombre de la postulación (hardlink, o copia como fallback)"""
+        origen = self.ruta(hash_contenido)
+        if os.path.exists(destino):
+            os.remove(destino)
+        try:
+            os.link(origen, destino)
+        except OSError:
+            shutil.copyfile(origen, destino)
+
+# Formatos de tabla para trabajos, entradas de batch y reportes: CSV, JSONL y Parquet
+EXTENSIONES_TABLA = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet', '.pq': 'parquet'}
+TIPOS_PARQUET = {'str': 'string', 'int': 'int64', 'float': 'double', 'bool': 'bool'}
+
+def formato_tabla(ruta: str) -> str:
+    """'csv', 'jsonl' o 'parquet' según la extensión (CSV si no se reconoce)"""
+    return EXTENSIONES_TABLA.get(os.path.splitext(ruta)[1].lower(), 'csv')
+
+def _requiere_pyarrow(ruta: str):
+    if not PYARROW_AVAILABLE:
+        raise FileProcessingError(f"Para usar Parquet ({ruta}) instalá pyarrow: pip install pyarrow")
+
+def leer_tabla(ruta: str, columnas: Optional[List[str]] = None, filas_por_lote: int = 1000) -> Iterator[Dict[str, Any]]:
+    """Filas de la tabla de a una, como dicts
+    
+    Con columnas se proyecta: en Parquet solo se leen esas columnas del archivo
+    (de a un lote por vez dentro de cada row group); en CSV y JSONL se recortan
+    las filas. Columnas que el archivo no tiene quedan afuera.
+    """
+    formato = formato_tabla(ruta)
+    if formato == 'parquet':
+        _requiere_pyarrow(ruta)
+        archivo = pq.ParquetFile(ruta)
+        if columnas is not None:
+            columnas = [c for c in columnas if c in archivo.schema_arrow.names]
+        for lote in archivo.iter_batches(batch_size=filas_por_lote, columns=columnas):
+            yield from lote.to_pylist()
+        return
+    
+    with open(ruta, 'r', encoding='utf-8', newline='') as f:
+        filas = csv.DictReader(f) if formato == 'csv' else (json.loads(linea) for linea in f if linea.strip())
+        for fila in filas:
+            yield fila if columnas is None else {c: fila[c] for c in columnas if c in fila}
+
+class EscritorTabla:
+    """Escribe filas (dicts) en CSV, JSONL o Parquet según la extensión de ruta.
+
+    Se usa como context manager y escribe a medida que llegan las filas: en
+    Parquet se juntan filas_por_grupo filas por row group. tipos mapea columna
+    a 'str', 'int', 'float' o 'bool' para el esquema Parquet (default 'str').
+    En JSONL cada línea lleva solo las columnas que trae la fila.
+    """
+
+    def __init__(self, ruta: str, columnas: List[str], tipos: Optional[Dict[str, str]] = None,
+                 filas_por_grupo: int = 10000):
+        self.ruta = ruta
+        self.columnas = columnas
+        self.formato = formato_tabla(ruta)
+        self.filas_por_grupo = filas_por_grupo
+        self.total = 0
+        if self.formato == 'parquet':
+            _requiere_pyarrow(ruta)
+            tipos = tipos or {}
+            self._esquema = pa.schema([(c, pa.type_for_alias(TIPOS_PARQUET[tipos.get(c, 'str')])) for c in columnas])
+        self._archivo = None
+        self._escritor = None
+        self._grupo: List[Dict[str, Any]] = []
+
+    def __enter__(self) -> 'EscritorTabla':
+        carpeta = os.path.dirname(self.ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        if self.formato == 'parquet':
+            self._escritor = pq.ParquetWriter(self.ruta, self._esquema)
+        else:
+            self._archivo = open(self.ruta, 'w', encoding='utf-8', newline='')
+            if self.formato == 'csv':
+                self._escritor = csv.DictWriter(self._archivo, fieldnames=self.columnas, extrasaction='ignore')
+                self._escritor.writeheader()
+        return self
+
+    def escribir(self, fila: Dict[str, Any]):
+        self.total += 1
+        if self.formato == 'csv':
+            self._escritor.writerow(fila)
+        elif self.formato == 'jsonl':
+            self._archivo.write(json.dumps({c: fila[c] for c in self.columnas if c in fila}, ensure_ascii=False) + '\n')
+        else:
+            self._grupo.append(fila)
+            if len(self._grupo) >= self.filas_por_grupo:
+                self._escribir_grupo()
+
+    def _escribir_grupo(self):
+        if self._grupo:
+            self._escritor.write_table(pa.Table.from_pylist(self._grupo, schema=self._esquema))
+            self._grupo = []
+
+    def __exit__(self, *exc):
+        if self.formato == 'parquet':
+            self._escribir_grupo()
+            self._escritor.close()
+        else:
+            self._archivo.close()
+        return False
+
+class RenderizadorPDF:
+    """Motor de PDF de larga vida: estilos armados una vez y párrafos ya parseados en cache.
+
+    Parsear el markup de un Paragraph es lo caro; las líneas del CV que se
+    repiten entre variantes (casi todas) se parsean una sola vez y cada
+    documento usa una copia del prototipo, así que solo se re-diagraman las
+    secciones adaptadas. Cada build registra su duración en ultima_duracion.
+    """
+
+    EMPRESAS = ['Municipalidad', 'FABRICARG', 'CECAL', 'Proyecto Freelance']
+    MAX_PROTOTIPOS = 2000
+    # Subir si cambia el diseño del PDF: invalida los PDFs del almacén por contenido
+    VERSION = 1
+
+    def __init__(self, secciones: Iterable[str] = PlantillaCV.SECCIONES):
+        self.secciones = set(secciones)
+        styles = getSampleStyleSheet()
+        self.estilo_normal = styles["Normal"]
+        
+        # Estilos personalizados
+        self.estilo_titulo = ParagraphStyle(
+            'TituloPersonal',
+            parent=styles['Heading1'],
+            fontSize=16,
+            spaceAfter=6,
+            alignment=TA_CENTER,
+            textColor=colors.darkblue
+        )
+        
+        self.estilo_subtitulo = ParagraphStyle(
+            'SubtituloPersonal', 
+            parent=styles['Heading2'],
+            fontSize=12,
+            spaceAfter=8,
+            textColor=colors.darkblue,
+            borderWidth=1,
+            borderColor=colors.lightgrey,
+            borderPadding=3
+        )
+        
+        self._prototipos: Dict[Tuple[str, str], Paragraph] = {}
+        self._lock = threading.Lock()
+        self.ultima_duracion = 0.0
+
+    def parrafo(self, tipo: str, linea: str) -> Paragraph:
+        """Copia de un Paragraph ya parseado para (tipo de línea, texto)"""
+        clave = (tipo, linea)
+        with self._lock:
+            prototipo = self._prototipos.get(clave)
+            if prototipo is None:
+                if len(self._prototipos) >= self.MAX_PROTOTIPOS:
+                    self._prototipos.clear()
+                if tipo == 'titulo':
+                    prototipo = Paragraph(linea, self.estilo_titulo)
+                elif tipo == 'seccion':
+                    prototipo = Paragraph(linea, self.estilo_subtitulo)
+                elif tipo == 'empresa':
+                    prototipo = Paragraph(f"<b>{linea}</b>", self.estilo_normal)
+                else:
+                    prototipo = Paragraph(linea, self.estilo_normal)
+                self._prototipos[clave] = prototipo
+        return copy.copy(prototipo)
+
+    def clasificar(self, indice: int, linea: str) -> str:
+        if indice == 0:
+            return 'titulo'  # Nombre (primera línea)
+        if linea in self.secciones:
+            return 'seccion'
+        if any(empresa in linea for empresa in self.EMPRESAS):
+            return 'empresa'
+        return 'normal'
+
+    def flowables(self, texto_cv: str) -> List[Any]:
+        # Los Spacer se crean por documento: reportlab los modifica al diagramar
+        contenido = []
+        for i, linea in enumerate(texto_cv.split('\n')):
+            linea = linea.strip()
+            if not linea:
+                contenido.append(Spacer(1, 6))
+                continue
+            
+            tipo = self.clasificar(i, linea)
+            if tipo == 'titulo':
+                contenido += [self.parrafo(tipo, linea), Spacer(1, 12)]
+            elif tipo == 'seccion':
+                contenido += [Spacer(1, 12), self.parrafo(tipo, linea), Spacer(1, 6)]
+            elif tipo == 'empresa':
+                contenido += [Spacer(1, 8), self.parrafo(tipo, linea), Spacer(1, 4)]
+            else:
+                contenido += [self.parrafo(tipo, linea), Spacer(1, 4)]
+        return contenido
+
+    def renderizar(self, texto_cv: str, destino) -> float:
+        """Arma el PDF en destino (ruta o archivo binario) y devuelve los segundos que tardó"""
+        inicio = time.perf_counter()
+        doc = SimpleDocTemplate(destino, pagesize=A4, 
+                                leftMargin=50, rightMargin=50, 
+                                topMargin=50, bottomMargin=50)
+        doc.build(self.flowables(texto_cv))
+        self.ultima_duracion = time.perf_counter() - inicio
+        return self.ultima_duracion
+
+    def renderizar_bytes(self, texto_cv: str) -> bytes:
+        """Arma el PDF en memoria (para adjuntarlo o guardarlo sin releer el archivo)"""
+        buffer = io.BytesIO()
+        self.renderizar(texto_cv, buffer)
+        return buffer.getvalue()
+
+class IndiceSimHash:
+    """Índice de huellas SimHash de 64 bits para detectar casi-duplicados.
+
+    Dos textos se consideran el mismo aviso si sus huellas difieren en a lo sumo
+    distancia_maxima bits. La huella se parte en distancia_maxima + 1 bandas:
+    por el principio del palomar, dos huellas dentro del umbral coinciden
+    exactamente en al menos una banda, así que cada búsqueda solo compara contra
+    los candidatos de esos buckets y no contra todo el histórico.
+    """
+
+    BITS = 64
+
+    def __init__(self, distancia_maxima: int = 6):
+        self.distancia_maxima = distancia_maxima
+        self.num_bandas = min(self.BITS, distancia_maxima + 1)
+        ancho = self.BITS // self.num_bandas
+        self._bandas = [
+            (i * ancho, self.BITS - i * ancho if i == self.num_bandas - 1 else ancho)
+            for i in range(self.num_bandas)
+        ]
+        self._buckets: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in range(self.num_bandas)]
+        self.total = 0
+
+    @staticmethod
+    def tokenizar(texto: str) -> List[str]:
+        """Palabras en minúsculas y sin acentos (las de una letra se ignoran)"""
+        texto = unicodedata.normalize('NFKD', texto.lower())
+        texto = ''.join(c for c in texto if not unicodedata.combining(c))
+        return [t for t in re.findall(r'\w+', texto) if len(t) > 1]
+
+    @classmethod
+    def caracteristicas(cls, texto: str, n: int = 4) -> List[str]:
+        """Shingles de n caracteres sobre el texto normalizado
+        
+        En textos cortos como un aviso, los shingles de caracteres dan huellas
+        mucho más estables que las palabras sueltas ante cambios menores de título.
+        """
+        normalizado = ' '.join(cls.tokenizar(texto))
+        return [normalizado[i:i + n] for i in range(max(1, len(normalizado) - n + 1))]
+
+    @classmethod
+    def calcular(cls, texto: str) -> int:
+        """Huella SimHash del texto (estable entre procesos)"""
+        pesos = [0] * cls.BITS
+        for token in cls.caracteristicas(texto):
+            h = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+            for bit in range(cls.BITS):
+                pesos[bit] += 1 if (h >> bit) & 1 else -1
+        huella = 0
+        for bit, peso in enumerate(pesos):
+            if peso > 0:
+                huella |= 1 << bit
+        return huella
+
+    def _valores_banda(self, huella: int) -> List[int]:
+        return [(huella >> inicio) & ((1 << ancho) - 1) for inicio, ancho in self._bandas]
+
+    def buscar(self, huella: int, excluir: Optional[str] = None) -> Optional[str]:
+        """Clave de un elemento indexado a distancia <= distancia_maxima, o None
+        
+        Las entradas cuya clave sea excluir se ignoran (un elemento no es
+        casi-duplicado de sí mismo).
+        """
+        for banda, valor in enumerate(self._valores_banda(huella)):
+            for candidata, clave in self._buckets[banda].get(valor, ()):
+                if clave != excluir and bin(candidata ^ huella).count('1') <= self.distancia_maxima:
+                    return clave
+        return None
+
+    def agregar(self, huella: int, clave: str):
+        valores = self._valores_banda(huella)
+        if (huella, clave) in self._buckets[0].get(valores[0], ()):
+            return
+        for banda, valor in enumerate(valores):
+            self._buckets[banda].setdefault(valor, []).append((huella, clave))
+        self.total += 1
+
+    def quitar(self, huella: int, clave: str):
+        valores = self._valores_banda(huella)
+        if (huella, clave) not in self._buckets[0].get(valores[0], ()):
+            return
+        for banda, valor in enumerate(valores):
+            bucket = self._buckets[banda][valor]
+            bucket.remove((huella, clave))
+            if not bucket:
+                del self._buckets[banda][valor]
+        self.total -= 1
+
+class IndiceBM25:
+    """Índice invertido disperso (término -> {clave: frecuencia}) con ranking BM25.
+
+    Se actualiza de a un documento: agregar() solo toca los términos de ese
+    documento, y los estadísticos globales (cantidad de documentos, largo
+    promedio, df por término) se derivan del índice al puntuar.
+    """
+
+    STOPWORDS = {
+        'de', 'la', 'el', 'en', 'y', 'a', 'los', 'las', 'del', 'con', 'para', 'por', 'un', 'una',
+        'que', 'se', 'al', 'lo', 'su', 'sus', 'es', 'como', 'o', 'e', 'nos', 'muy', 'mas',
+        'the', 'and', 'of', 'to', 'in', 'for', 'with', 'on', 'an', 'is', 'are', 'be', 'we', 'you'
+    }
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._terminos_doc: Dict[str, Dict[str, int]] = {}
+        self._largos: Dict[str, int] = {}
+        self._largo_total = 0
+
+    @classmethod
+    def tokenizar(cls, texto: str) -> List[str]:
+        """Palabras en minúsculas y sin tildes, sin stopwords ni números"""
+        return [t for t in re.findall(r'\w+', plegar_acentos((texto or '').lower()))
+                if len(t) > 1 and not t.isdigit() and t not in cls.STOPWORDS]
+
+    @classmethod
+    def frecuencias(cls, texto: str) -> Dict[str, int]:
+        frecuencias: Dict[str, int] = {}
+        for termino in cls.tokenizar(texto):
+            frecuencias[termino] = frecuencias.get(termino, 0) + 1
+        return frecuencias
+
+    @property
+    def total(self) -> int:
+        return len(self._largos)
+
+    def contiene(self, clave: str) -> bool:
+        return clave in self._largos
+
+    def agregar(self, clave: str, frecuencias: Dict[str, int]):
+        """Agrega (o reemplaza) un documento ya tokenizado"""
+        if clave in self._largos:
+            self.quitar(clave)
+        self._terminos_doc[clave] = frecuencias
+        self._largos[clave] = sum(frecuencias.values())
+        self._largo_total += self._largos[clave]
+        for termino, frecuencia in frecuencias.items():
+            self._postings.setdefault(termino, {})[clave] = frecuencia
+
+    def quitar(self, clave: str):
+        for termino in self._terminos_doc.pop(clave, {}):
+            documentos = self._postings.get(termino)
+            if documentos is not None:
+                documentos.pop(clave, None)
+                if not documentos:
+                    del self._postings[termino]
+        self._largo_total -= self._largos.pop(clave, 0)
+
+    def idf(self, termino: str) -> float:
+        df = len(self._postings.get(termino, ()))
+        return math.log(1 + (self.total - df + 0.5) / (df + 0.5))
+
+    def puntuar(self, consulta: Iterable[str], claves: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Puntaje BM25 de cada documento (o solo de las claves dadas) contra la consulta"""
+        if not self.total:
+            return {}
+        filtro = set(claves) if claves is not None else None
+        largo_promedio = self._largo_total / self.total or 1
+        puntajes: Dict[str, float] = {}
+        
+        for termino in set(consulta):
+            documentos = self._postings.get(termino)
+            if not documentos:
+                continue
+            idf = self.idf(termino)
+            for clave, frecuencia in documentos.items():
+                if filtro is not None and clave not in filtro:
+                    continue
+                norma = self.k1 * (1 - self.b + self.b * self._largos[clave] / largo_promedio)
+                puntajes[clave] = puntajes.get(clave, 0.0) + idf * frecuencia * (self.k1 + 1) / (frecuencia + norma)
+        
+        return puntajes
+
+    def mejores(self, consulta: Iterable[str], k: int, claves: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        puntajes = self.puntuar(consulta, claves)
+        return heapq.nlargest(k, puntajes.items(), key=lambda item: item[1])
+
+def plegar_acentos(texto: str) -> str:
+    """Quita tildes y diacríticos carácter a carácter, conservando la longitud
+    
+    Mantener la longitud permite usar los mismos offsets sobre el texto
+    original y el plegado. Los caracteres que al descomponerse no quedan en
+    una sola letra (ligaduras, fracciones) se dejan como están.
+    """
+    if texto.isascii():
+        return texto
+    plegado = []
+    for caracter in texto:
+        base = ''.join(c for c in unicodedata.normalize('NFKD', caracter) if not unicodedata.combining(c))
+        plegado.append(base if len(base) == 1 else caracter)
+    return ''.join(plegado)
+
+def normalizar_keyword(keyword: str) -> str:
+    return plegar_acentos(keyword.lower())
+
+class CoincidenciasKeywords:
+    """Resultado de un escaneo con AutomataKeywords: cada keyword con sus offsets.
+
+    El texto escaneado puede tener un segmento principal (la postulación) y un
+    extra al final (p.ej. el nombre de la empresa); contiene() mira solo el
+    segmento principal, contiene_en_todo() el texto completo. Las consultas
+    aceptan la keyword tal como está en la configuración (con tildes/mayúsculas).
+    """
+
+    def __init__(self, hits: List[Tuple[int, str]], largo_principal: int):
+        self.hits = hits
+        self.largo_principal = largo_principal
+        self._posiciones: Dict[str, List[int]] = {}
+        for offset, keyword in hits:
+            self._posiciones.setdefault(keyword, []).append(offset)
+
+    def contiene_en_rango(self, keyword: str, inicio: int, fin: int) -> bool:
+        keyword = normalizar_keyword(keyword)
+        return any(inicio <= offset and offset + len(keyword) <= fin
+                   for offset in self._posiciones.get(keyword, ()))
+
+    def contiene(self, keyword: str) -> bool:
+        return self.contiene_en_rango(keyword, 0, self.largo_principal)
+
+    def contiene_en_todo(self, keyword: str) -> bool:
+        return normalizar_keyword(keyword) in self._posiciones
+
+    def alguna(self, keywords: Iterable[str]) -> bool:
+        return any(self.contiene(kw) for kw in keywords)
+
+    def presentes(self, keywords: Iterable[str]) -> List[str]:
+        """Las keywords de la lista que aparecen, en el orden de la lista"""
+        return [kw for kw in keywords if self.contiene(kw)]
+
+class AutomataKeywords:
+    """Matcher multi-patrón compilado una sola vez a partir de todos los vocabularios.
+
+    Las keywords se guardan (en minúsculas y sin tildes) en un trie. Del trie
+    se genera una regex de lookahead que encuentra en C todas las posiciones
+    donde empieza alguna keyword; desde cada una se recorre el trie para emitir
+    todas las keywords que arrancan ahí, incluidos solapamientos como 'java'
+    dentro de 'javascript'. El texto se recorre una sola vez.
+
+    Las keywords cortas (siglas como 'jr', 'qa', 'git', 'orm') solo cuentan
+    como palabra completa, admitiendo plural con 's' ('APIs'); así 'jr' no
+    aparece en 'jrpg' ni 'git' en 'digital'. Las largas se buscan como
+    substring, igual que antes.
+    """
+
+    _FIN = None  # marca de nodo terminal en el trie
+    LARGO_SIGLA = 3
+
+    def __init__(self, vocabularios: Dict[str, Iterable[str]]):
+        self.categorias: Dict[str, List[str]] = {}
+        self._trie: Dict[Any, Any] = {}
+        
+        for categoria, keywords in vocabularios.items():
+            lista = self.categorias.setdefault(categoria, [])
+            for keyword in keywords:
+                keyword = normalizar_keyword(keyword)
+                if not keyword:
+                    continue
+                lista.append(keyword)
+                nodo = self._trie
+                for caracter in keyword:
+                    nodo = nodo.setdefault(caracter, {})
+                nodo[self._FIN] = keyword
+        
+        self._inicios = re.compile('(?=' + self._regex_nodo(self._trie) + ')') if self._trie else None
+
+    @classmethod
+    def _regex_nodo(cls, nodo: Dict[Any, Any]) -> str:
+        # Para ubicar inicios alcanza con el prefijo más corto que sea keyword
+        if cls._FIN in nodo:
+            return ''
+        alternativas = [re.escape(c) + cls._regex_nodo(hijo) for c, hijo in nodo.items()]
+        return alternativas[0] if len(alternativas) == 1 else '(?:' + '|'.join(alternativas) + ')'
+
+    @classmethod
+    def respeta_limites(cls, texto: str, inicio: int, keyword: str) -> bool:
+        """Para siglas, exige que el match no esté pegado a otras letras/dígitos"""
+        if len(keyword.strip()) > cls.LARGO_SIGLA:
+            return True
+        fin = inicio + len(keyword)
+        if keyword[0].isalnum() and inicio > 0 and texto[inicio - 1].isalnum():
+            return False
+        if keyword[-1].isalnum() and fin < len(texto) and texto[fin].isalnum():
+            # Plural simple: 'apis', 'qas'
+            return texto[fin] == 's' and (fin + 1 == len(texto) or not texto[fin + 1].isalnum())
+        return True
+
+    def buscar(self, texto: str, extra: Optional[str] = None) -> CoincidenciasKeywords:
+        """Escanea texto (y opcionalmente texto + ' ' + extra) en una sola pasada"""
+        texto = normalizar_keyword(texto)
+        largo_principal = len(texto)
+        if extra is not None:
+            texto = f"{texto} {normalizar_keyword(extra)}"
+        
+        hits = []
+        if self._inicios is not None:
+            largo = len(texto)
+            for match in self._inicios.finditer(texto):
+                nodo = self._trie
+                i = match.start()
+                while i < largo:
+                    nodo = nodo.get(texto[i])
+                    if nodo is None:
+                        break
+                    i += 1
+                    if self._FIN in nodo and self.respeta_limites(texto, match.start(), nodo[self._FIN]):
+                        hits.append((match.start(), nodo[self._FIN]))
+        
+        return CoincidenciasKeywords(hits, largo_principal)
+
+class ReglasTipoPosicion:
+    """Reglas declarativas de detectar_tipo_posicion compiladas a una tabla plana.
+
+    Cada regla suma sus puntos por tipo una sola vez si aparece cualquiera de
+    sus keywords. El bono de desarrollo general suma puntos a los tipos que ya
+    tienen puntaje. La tabla keyword -> reglas permite puntuar recorriendo una
+    sola vez los hits del escaneo, sin revisar regla por regla.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.tipos: List[str] = list(spec['tipos'])
+        self.pesos: List[Dict[str, int]] = []
+        self.tabla: Dict[str, List[int]] = {}
+        for indice, regla in enumerate(spec.get('reglas', [])):
+            desconocidos = set(regla['puntos']) - set(self.tipos)
+            if desconocidos:
+                raise ConfigurationError(f"Tipos de posición desconocidos en reglas_tipo_posicion: {sorted(desconocidos)}")
+            self.pesos.append(dict(regla['puntos']))
+            for keyword in regla['keywords']:
+                reglas = self.tabla.setdefault(normalizar_keyword(keyword), [])
+                if indice not in reglas:
+                    reglas.append(indice)
+        
+        bono = spec.get('bono_desarrollo_general', {})
+        self.keywords_bono = {normalizar_keyword(kw) for kw in bono.get('keywords', [])}
+        self.puntos_bono = bono.get('puntos', 0)
+
+    def vocabulario(self) -> List[str]:
+        return list(self.tabla) + sorted(self.keywords_bono)
+
+    def puntuar(self, coincidencias: CoincidenciasKeywords) -> Tuple[Dict[str, int], bool]:
+        """Puntos por tipo y si se mencionó desarrollo general sin ninguna tecnología"""
+        disparadas = set()
+        menciona_desarrollo = False
+        for offset, keyword in coincidencias.hits:
+            if offset + len(keyword) > coincidencias.largo_principal:
+                continue  # solo cuenta el texto de la postulación, no la empresa
+            disparadas.update(self.tabla.get(keyword, ()))
+            if keyword in self.keywords_bono:
+                menciona_desarrollo = True
+        
+        puntos = {tipo: 0 for tipo in self.tipos}
+        for indice in sorted(disparadas):
+            for tipo, peso in self.pesos[indice].items():
+                puntos[tipo] += peso
+        
+        sin_tecnologia = False
+        if menciona_desarrollo:
+            if max(puntos.values()) > 0:
+                for tipo in puntos:
+                    if puntos[tipo] > 0:
+                        puntos[tipo] += self.puntos_bono
+            else:
+                sin_tecnologia = True
+        
+        return puntos, sin_tecnologia
+
+class MotorSalarios:
+    """Extractor de salarios compilado una sola vez desde deteccion_salarios.
+
+    Todos los patrones de config (primero los de dólar, después los de peso) se
+    combinan en una única regex con un grupo con nombre por patrón, así cada
+    texto se recorre una sola vez. En los patrones, {monto} se reemplaza por
+    una expresión que entiende separadores de miles ("1.200"), decimales y
+    sufijos "k"/"mil" ("1.5k", "150 mil"). Los patrones sin {monto} deben
+    capturar el importe en su primer grupo, como los originales. Después de
+    cada importe se reconoce un rango opcional ("USD 1.200 - 1.800"); en los
+    patrones que empiezan con {monto} (moneda al final), también antes
+    ("1.2 - 1.8k usd").
+    """
+
+    MONTO = r'(\d{1,3}(?:[.,]\d{3})+(?!\d)|\d+(?:[.,]\d+)?)(?:\s*(k|mil)\b)?'
+    _CONECTOR_RANGO = r'\s*(?:-|–|a|al|hasta)\s*(?:usd|u\$s|ars|\$)?\s*'
+    _CONECTOR_RANGO_PREVIO = r'\s*(?:-|–|a|al|hasta)\s*'
+    SEPARADOR_LOTE = '\x00'
+
+    def __init__(self, config_salarios: Dict[str, Any]):
+        alternativas = []
+        self._grupos: Dict[str, Tuple[str, bool, bool]] = {}
+        for moneda, clave in (('USD', 'patrones_dolar'), ('ARS', 'patrones_peso')):
+            for i, patron in enumerate(config_salarios.get(clave, [])):
+                nombre = f"{moneda.lower()}_{i}"
+                con_plantilla = '{monto}' in patron
+                # Moneda al final: el mínimo de un rango viene antes del importe anclado
+                rango_previo = patron.startswith('{monto}')
+                expresion = patron.replace('{monto}', self.MONTO)
+                if rango_previo:
+                    expresion = f"(?:{self.MONTO}{self._CONECTOR_RANGO_PREVIO})?{expresion}"
+                alternativas.append(f"(?P<{nombre}>{expresion})")
+                self._grupos[nombre] = (moneda, con_plantilla, rango_previo)
+        
+        self._patron = re.compile('|'.join(alternativas)) if alternativas else None
+        self._rango = re.compile(self._CONECTOR_RANGO + self.MONTO)
+        self.salario_minimo_usd = config_salarios.get('salario_minimo_esperado_usd')
+        self.salario_maximo_usd = config_salarios.get('salario_maximo_esperado_usd')
+
+    @staticmethod
+    def convertir_monto(numero: str, multiplicador: Optional[str]) -> int:
+        if re.fullmatch(r'\d{1,3}(?:[.,]\d{3})+', numero):
+            valor = float(re.sub(r'[.,]', '', numero))
+        else:
+            valor = float(numero.replace(',', '.'))
+        if multiplicador in ('k', 'mil'):
+            valor *= 1000
+        return int(round(valor))
+
+    def _montos_match(self, texto: str, match) -> List[Dict[str, Any]]:
+        nombre = match.lastgroup
+        moneda, con_plantilla, rango_previo = self._grupos[nombre]
+        base = self._patron.groupindex[nombre]
+        if rango_previo:
+            # Grupos base+1/base+2: mínimo opcional; base+3/base+4: importe anclado
+            multiplicador = match.group(base + 4)
+            monto = {'moneda': moneda, 'valor': self.convertir_monto(match.group(base + 3), multiplicador),
+                     'posicion': match.start(base + 3)}
+            if match.group(base + 1) is None:
+                return [monto]
+            sufijo_minimo = match.group(base + 2) or multiplicador
+            minimo = self.convertir_monto(match.group(base + 1), sufijo_minimo)
+            # "2000 - 1500 usd" o "3 a 1500 usd" no son rangos
+            if minimo > monto['valor'] or minimo * 10 < monto['valor']:
+                return [monto]
+            return [{'moneda': moneda, 'valor': minimo, 'posicion': match.start()}, monto]
+        
+        multiplicador = match.group(base + 2) if con_plantilla else None
+        montos = [{
+            'moneda': moneda,
+            'valor': self.convertir_monto(match.group(base + 1), multiplicador),
+            'posicion': match.start()
+        }]
+        
+        rango = self._rango.match(texto, match.end())
+        if rango:
+            maximo = self.convertir_monto(rango.group(1), rango.group(2))
+            # "1.2 - 1.8k": el sufijo del segundo importe aplica a los dos
+            if rango.group(2) and not multiplicador and montos[0]['valor'] < 1000:
+                montos[0]['valor'] = self.convertir_monto(match.group(base + 1), rango.group(2))
+            # "usd 1200 a 3 años" no es un rango
+            if maximo >= montos[0]['valor']:
+                montos.append({'moneda': moneda, 'valor': maximo, 'posicion': rango.start(1)})
+        return montos
+
+    def extraer_montos(self, texto: str) -> List[Dict[str, Any]]:
+        """Todos los importes del texto (minúsculas, sin tildes) en una pasada"""
+        if self._patron is None:
+            return []
+        montos = []
+        for match in self._patron.finditer(texto):
+            montos.extend(self._montos_match(texto, match))
+        return montos
+
+    def resumir(self, montos: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Arma el resultado de detectar_salario: USD tiene prioridad sobre ARS"""
+        resultado = {
+            'salario_detectado': False,
+            'moneda': None,
+            'rango_min': None,
+            'rango_max': None,
+            'es_competitivo': None,
+            'alertas': [],
+            'montos': [{'moneda': m['moneda'], 'valor': m['valor']} for m in montos]
+        }
+        
+        for moneda in ('USD', 'ARS'):
+            salarios = [m['valor'] for m in montos if m['moneda'] == moneda]
+            if salarios:
+                resultado['salario_detectado'] = True
+                resultado['moneda'] = moneda
+                resultado['rango_min'] = min(salarios)
+                resultado['rango_max'] = max(salarios) if len(salarios) > 1 else None
+                break
+        
+        # Evaluar competitividad
+        if resultado['moneda'] == 'USD':
+            min_esperado = self.salario_minimo_usd
+            max_esperado = self.salario_maximo_usd
+            
+            if resultado['rango_min'] < min_esperado:
+                resultado['alertas'].append(f"💰 Salario bajo: ${resultado['rango_min']} USD (mínimo esperado: ${min_esperado})")
+                resultado['es_competitivo'] = False
+            elif resultado['rango_min'] > max_esperado:
+                resultado['alertas'].append(f"🎯 Salario alto: ${resultado['rango_min']} USD (máximo esperado: ${max_esperado})")
+                resultado['es_competitivo'] = True
+            else:
+                resultado['es_competitivo'] = True
+                resultado['alertas'].append(f"✅ Salario competitivo: ${resultado['rango_min']} USD")
+        
+        return resultado
+
+    def analizar(self, texto: str) -> Dict[str, Any]:
+        return self.resumir(self.extraer_montos(texto))
+
+    def analizar_lote(self, textos: Iterable[str]) -> List[Dict[str, Any]]:
+        """Analiza muchos textos cortos (p.ej. el campo 'salary' scrapeado) de una vez
+        
+        Los textos se unen con un separador que ningún patrón cruza y se
+        recorren con un solo finditer; cada importe se asigna a su texto por offset.
+        """
+        normalizados = [plegar_acentos(' '.join((t or '').lower().split())) for t in textos]
+        inicios = []
+        offset = 0
+        for texto in normalizados:
+            inicios.append(offset)
+            offset += len(texto) + len(self.SEPARADOR_LOTE)
+        
+        montos_por_texto: List[List[Dict[str, Any]]] = [[] for _ in normalizados]
+        for monto in self.extraer_montos(self.SEPARADOR_LOTE.join(normalizados)):
+            indice = bisect.bisect_right(inicios, monto['posicion']) - 1
+            montos_por_texto[indice].append(monto)
+        
+        return [self.resumir(montos) for montos in montos_por_texto]
+
+class ConexionDB:
+    """Conexión SQLite única y de larga vida para aplicaciones.db.
+
+    Se abre al primer uso con WAL y pragmas ajustados (synchronous NORMAL,
+    cache y mmap más grandes). Al reutilizar la misma conexión, sqlite3
+    reutiliza también las sentencias preparadas de cada SQL (cached_statements).
+    Un RLock la hace usable desde varios hilos. Cada usar() confirma al salir,
+    salvo dentro de lote(): ahí todo va en una transacción que se confirma al
+    cerrar el lote (o antes, con confirmar()), y cada usar() es un SAVEPOINT
+    para que un error deshaga solo lo suyo.
+    """
+
+    def __init__(self, ruta: str, pragmas: Optional[Dict[str, Any]] = None, sentencias_cache: int = 128):
+        self.ruta = ruta
+        self.pragmas = pragmas or {}
+        self.sentencias_cache = sentencias_cache
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._lotes = 0
+
+    def _abrir(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.ruta, timeout=30, check_same_thread=False,
+                               cached_statements=self.sentencias_cache)
+        conn.execute(f"PRAGMA journal_mode = {self.pragmas.get('journal_mode', 'WAL')}")
+        conn.execute(f"PRAGMA synchronous = {self.pragmas.get('synchronous', 'NORMAL')}")
+        # cache_size negativo = KiB
+        conn.execute(f"PRAGMA cache_size = {-int(self.pragmas.get('cache_mb', 16) * 1024)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.pragmas.get('mmap_mb', 64) * 1024 * 1024)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    @contextlib.contextmanager
+    def usar(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._abrir()
+            conn = self._conn
+            if self._lotes == 0:
+                try:
+                    yield conn
+                except BaseException:
+                    conn.rollback()
+                    raise
+                conn.commit()
+                return
+            
+            if not conn.in_transaction:
+                conn.execute('BEGIN')
+            conn.execute('SAVEPOINT usar')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK TO usar')
+                raise
+            finally:
+                conn.execute('RELEASE usar')
+
+    @contextlib.contextmanager
+    def lote(self) -> Iterator['ConexionDB']:
+        """Agrupa en una transacción todas las escrituras (de cualquier hilo) hasta salir"""
+        with self._lock:
+            self._lotes += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._lotes -= 1
+                if self._lotes == 0 and self._conn is not None:
+                    self._conn.commit()
+
+    def confirmar(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+
+    def cerrar(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+class CacheAnalisis:
+    """Memoización del análisis de postulaciones en dos niveles: LRU en memoria y SQLite.
+
+    La clave es el hash del texto normalizado + empresa + la huella de la
+    configuración que afecta al análisis, así que al cambiar perfil_tecnico o
+    las reglas de scoring las entradas viejas dejan de coincidir; además se
+    borran del disco al crear el cache. La tabla cache_analisis se limita por
+    tamaño: al pasar max_bytes se descartan las entradas usadas hace más tiempo.
+    """
+
+    def __init__(self, db: ConexionDB, huella_config: str, max_memoria: int = 256, max_bytes: int = 20 * 1024 * 1024):
+        self.db = db
+        self.huella_config = huella_config
+        self.max_memoria = max_memoria
+        self.max_bytes = max_bytes
+        self._memoria: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.purgar_obsoletas()
+        self._bytes_disco = self._calcular_bytes_disco()
+
+    def _calcular_bytes_disco(self) -> int:
+        """Tamaño total de la tabla; se lee una vez y después se lleva la cuenta en guardar()"""
+        try:
+            with self.db.usar() as conn:
+                return conn.execute('SELECT COALESCE(SUM(tamano), 0) FROM cache_analisis').fetchone()[0]
+        except Exception as e:
+            logging.warning(f"Error midiendo cache de análisis: {e}")
+            return 0
+
+    @staticmethod
+    def calcular_huella(*secciones: Any) -> str:
+        serializado = json.dumps(secciones, sort_keys=True, ensure_ascii=False, default=list)
+        return hashlib.sha256(serializado.encode('utf-8')).hexdigest()
+
+    def clave(self, texto_postulacion: str, empresa: str) -> str:
+        texto = ' '.join((texto_postulacion or '').lower().split())
+        empresa = ' '.join((empresa or '').lower().split())
+        contenido = f"{self.huella_config}\x00{empresa}\x00{texto}"
+        return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+    def obtener(self, clave: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            resultado = self._memoria.get(clave)
+            if resultado is not None:
+                self._memoria.move_to_end(clave)
+                self.aciertos += 1
+                return copy.deepcopy(resultado)
+        
+        try:
+            with self.db.usar() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT resultado FROM cache_analisis WHERE clave = ?', (clave,))
+                fila = cursor.fetchone()
+                if fila:
+                    cursor.execute('UPDATE cache_analisis SET ultimo_uso = ? WHERE clave = ?', (time.time(), clave))
+        except Exception as e:
+            logging.warning(f"Error leyendo cache de análisis: {e}")
+            fila = None
+        
+        with self._lock:
+            if fila is None:
+                self.fallos += 1
+                return None
+            self.aciertos += 1
+            resultado = json.loads(fila[0])
+            self._guardar_en_memoria(clave, resultado)
+            return copy.deepcopy(resultado)
+
+    def guardar(self, clave: str, resultado: Dict[str, Any]):
+        serializado = json.dumps(resultado, ensure_ascii=False)
+        with self._lock:
+            self._guardar_en_memoria(clave, json.loads(serializado))
+        
+        try:
+            with self.db.usar() as conn:
+                cursor = conn.cursor()
+                # Total llevado en memoria (bajo el lock de la conexión): sumar la tabla
+                # en cada escritura costaría más cuanto más grande es el cache
+                cursor.execute('SELECT tamano FROM cache_analisis WHERE clave = ?', (clave,))
+                anterior = cursor.fetchone()
+                total = self._bytes_disco + len(serializado) - (anterior[0] if anterior else 0)
+                cursor.execute('''
+                    INSERT OR REPLACE INTO cache_analisis (clave, huella_config, resultado, tamano, ultimo_uso)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (clave, self.huella_config, serializado, len(serializado), time.time()))
+                
+                if total > self.max_bytes:
+                    # Desalojar las menos usadas recientemente hasta volver al límite
+                    cursor.execute('SELECT clave, tamano FROM cache_analisis ORDER BY ultimo_uso')
+                    desalojar = []
+                    for clave_vieja, tamano in cursor:
+                        if total <= self.max_bytes:
+                            break
+                        desalojar.append((clave_vieja,))
+                        total -= tamano
+                    cursor.executemany('DELETE FROM cache_analisis WHERE clave = ?', desalojar)
+                self._bytes_disco = total
+        except Exception as e:
+            logging.warning(f"Error guardando cache de análisis: {e}")
+
+    def _guardar_en_memoria(self, clave: str, resultado: Dict[str, Any]):
+        self._memoria[clave] = resultado
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.max_memoria:
+            self._memoria.popitem(last=False)
+
+    def purgar_obsoletas(self):
+        """Borra las entradas calculadas con otra configuración"""
+        try:
+            with self.db.usar() as conn:
+                # Primero solo se lee: el DELETE pide el lock de escritura aunque no borre
+                # nada, y los workers de --workers arrancan mientras el batch tiene su
+                # transacción abierta (esperarían el timeout de la conexión)
+                obsoletas = conn.execute('SELECT 1 FROM cache_analisis WHERE huella_config != ? LIMIT 1',
+                                         (self.huella_config,)).fetchone()
+                borradas = 0
+                if obsoletas:
+                    borradas = conn.execute('DELETE FROM cache_analisis WHERE huella_config != ?',
+                                            (self.huella_config,)).rowcount
+            if borradas:
+                logging.info(f"Cache de análisis: {borradas} entradas invalidadas por cambios de configuración")
+        except Exception as e:
+            logging.warning(f"Error purgando cache de análisis: {e}")
+
+class ContextoAnalisis:
+    """Todo lo que los detectores necesitan de una postulación, calculado una vez.
+
+    - texto: minúsculas con espacios colapsados
+    - texto_plegado: igual que texto pero sin tildes (mismos offsets)
+    - tokens / indice_tokens: palabras del texto plegado y, por palabra, sus
+      posiciones en la lista de tokens
+    - coincidencias: escaneo único de keywords sobre postulación + empresa
+    """
+
+    def __init__(self, texto_postulacion: str, empresa: str, automata: AutomataKeywords):
+        self.texto_original = texto_postulacion
+        self.empresa = empresa
+        self.texto = ' '.join(texto_postulacion.lower().split())
+        self.texto_plegado = plegar_acentos(self.texto)
+        self.tokens: List[str] = re.findall(r'\w+', self.texto_plegado)
+        self.indice_tokens: Dict[str, List[int]] = {}
+        for posicion, token in enumerate(self.tokens):
+            self.indice_tokens.setdefault(token, []).append(posicion)
+        self.coincidencias = automata.buscar(self.texto, empresa)
+
+    def tiene_token(self, token: str) -> bool:
+        return normalizar_keyword(token) in self.indice_tokens
+
 class GeneradorCVInteligente:
-    def __init__(self, config_path="config.json"):
-        # Cargar configuración
+    # Vocabularios fijos de los detectores (los configurables viven en config.json)
+    KEYWORDS_TIPO_POSICION = {
+        'qa_automatizacion': ['automatización', 'selenium', 'automatizador', 'automation', 'locust', 'cypress'],
+        'qa_manual': ['qa funcional', 'testing funcional', 'qa manual', 'casos de prueba'],
+        'desarrollador_python': ['python', 'django', 'flask', 'fastapi', 'pandas', 'numpy'],
+        'desarrollador_java': ['java', 'spring', 'spring boot', 'hibernate'],
+        'desarrollador_frontend': ['vue.js', 'vue', 'angular', 'frontend', 'front-end', 'javascript', 'typescript'],
+        'desarrollador_fullstack': ['full stack', 'fullstack', 'full-stack']
+    }
+    KEYWORDS_QA_GENERAL = ['qa', 'testing', 'pruebas', 'quality assurance']
+    KEYWORDS_DESARROLLO_GENERAL = ['desarrollador', 'developer', 'programador']
+    # Se evalúan en este orden: SSR primero, después junior y senior
+    KEYWORDS_SENIORITY = {
+        'semi_senior': ['ssr', 'semi senior', 'semi-senior', 'advance', 'intermedio'],
+        'junior': ['junior', 'jr', 'trainee', 'entry level', 'sin experiencia'],
+        'senior': ['senior', ' sr ', 'lead', 'líder', 'tech lead']
+    }
+    KEYWORDS_GENERALES = ['qa', 'testing', 'pruebas', 'developer', 'desarrollador', 
+                          'programador', 'java', 'python', 'sql', 'api', 'web', 
+                          'frontend', 'backend', 'full stack', 'scrum', 'agile']
+    TECNOLOGIAS_PRINCIPALES = {
+        'Python': ['python', 'fastapi', 'django', 'flask'],
+        'Java': ['java', 'spring', 'spring boot'],
+        'JavaScript': ['javascript', 'vue', 'react', 'angular', 'next.js'],
+        'QA': ['qa', 'testing', 'selenium', 'automation'],
+        'SQL': ['sql', 'postgresql', 'mysql', 'database']
+    }
+    # Keywords que tenemos en nuestro CV (basado en tu experiencia real)
+    FORTALEZAS_CV = ['python', 'fastapi', 'postgresql', 'vue', 'quasar', 'next.js', 
+                     'locust', 'postman', 'qa', 'manual', 'testing', 'scrum', 'kanban', 'git',
+                     'javascript', 'sql', 'api', 'rest', 'agile', 'full stack', 'desarrollador', 
+                     'angular', 'webservices', 'selenium', 'automatización', 'automation',
+                     'frontend', 'backend', 'casos de prueba', 'validaciones', 'metodologías']
+    TIPOS_QA = ['qa_manual', 'qa_automatizacion']
+    # Bonificaciones de fit: (keywords que deben estar en coincidencias, puntos)
+    BONOS_FIT_QA = [
+        (['qa', 'testing', 'automatización', 'selenium'], 15),
+        (['sql', 'api', 'rest'], 10),
+        (['git', 'scrum', 'agile'], 5)
+    ]
+    BONOS_FIT_JAVA = [
+        (['sql', 'base de datos'], 10),     # Tenemos experiencia SQL
+        (['api', 'rest'], 10),              # Experiencia en APIs
+        (['scrum', 'ágiles', 'agile'], 5)   # Metodologías ágiles
+    ]
+    KEYWORDS_BRECHA_GIT = ['code review', 'git flow', 'deploy']
+    # Subir cuando cambie la lógica de análisis para invalidar cache_analisis
+    VERSION_ANALISIS = 1
+    # PDFs escribiéndose en segundo plano antes de frenar al render
+    MAX_ESCRITURAS_PDF = 32
+    # Filas por lote de generar_analisis_fit_lote en --triage
+    LOTE_TRIAGE = 1000
+    COLUMNAS_REPORTE_BATCH = ['fila', 'empresa', 'estado', 'tipo_posicion', 'fit', 'cv_path', 'razon']
+
+    def __init__(self, config_path="config.json", config: Optional[Dict[str, Any]] = None):
+        # Cargar configuración (o usar la ya cargada, p.ej. con los overrides de la CLI)
+        self.config_path = config_path
         try:
-            self.config = self.cargar_configuracion(config_path)
+            self.config = config if config is not None else self.cargar_configuracion(config_path)
             self.cv_base_path = self.config['configuracion_general']['cv_base_path']
             self.carpeta_salida = self.config['configuracion_general']['carpeta_salida']
             self.umbral_fit = self.config['configuracion_general']['umbral_fit']
@@ -66,16 +1497,91 @@ class GeneradorCVInteligente:
         except Exception as e:
             raise ConfigurationError(f"Error cargando configuración: {e}")
         
+        # Motor de PDF reutilizable (estilos y párrafos parseados en cache)
+        self.renderizador_pdf = RenderizadorPDF()
+        
+        # PDFs por hash de contenido: variantes idénticas se renderizan y guardan una vez
+        self.almacen_pdfs = None
+        self.ultimo_pdf_reutilizado = False
+        self.ultimo_pdf_bytes: Optional[bytes] = None
+        self._pdfs_recientes: 'OrderedDict[str, bytes]' = OrderedDict()  # variantes recientes, para adjuntar sin releer
+        
+        # Escritura de PDFs en segundo plano (la activa el modo batch)
+        self.escritura_pdf_asincrona = False
+        self._escritor_pdf: Optional[ThreadPoolExecutor] = None
+        self._escrituras_pdf: List[Tuple[str, Future]] = []
+        self.ultima_escritura_pdf: Optional[Future] = None  # la del último generar_cv_pdf, si quedó en curso
+        self._consola_lock = threading.Lock()
+        if self.config['configuracion_general'].get('deduplicar_pdfs', False):
+            self.almacen_pdfs = AlmacenContenido(os.path.join(self.carpeta_salida, '.objetos'))
+        
+        # Plantilla con slots del CV base (se compila al primer uso)
+        self._plantilla_cv: Optional[PlantillaCV] = None
+        
+        # CV base parseado una sola vez (se re-parsea solo si cambia el archivo)
+        self.cache_cv_base = CacheCVBase(
+            self.cv_base_path,
+            self.config['configuracion_general'].get('carpeta_cache_cv', '.cache_cv')
+        )
+        
         # Validar CV base
         if not self.validar_cv_base():
             raise FileProcessingError("CV base no válido")
             
         os.makedirs(self.carpeta_salida, exist_ok=True)
         
-        # Inicializar base de datos
+        # Delay de cortesía por host para el scraping
+        scraping_config = self.config.get('scraping_config', {})
+        self.limitador_hosts = LimitadorPorHost(scraping_config.get('delay_between_requests', 0))
+        
+        # Extractor de salarios compilado desde deteccion_salarios
+        self.motor_salarios = MotorSalarios(self.config['deteccion_salarios'])
+        
+        # Reglas de puntaje por tipo de posición compiladas desde config
+        self.reglas_tipo_posicion = ReglasTipoPosicion(
+            self.config.get('reglas_tipo_posicion') or self.reglas_tipo_posicion_por_defecto()
+        )
+        
+        # Matcher único para todos los vocabularios de los detectores
+        self.automata_keywords = self.construir_automata_keywords()
+        
+        # Índices SimHash de casi-duplicados por contexto ('scraping', 'batch')
+        self._indices_duplicados: Dict[str, IndiceSimHash] = {}
+        self._duplicados_lock = threading.Lock()
+        
+        # Índice BM25 de trabajos scrapeados y términos del CV base (se cargan al primer uso)
+        self._indice_relevancia: Optional[IndiceBM25] = None
+        self._terminos_cv: Optional[Tuple[str, List[str]]] = None
+        
+        # Parsers/selectores compilados por portal (se crean al primer uso)
+        self._extractores: Dict[str, ExtractorPortal] = {}
+        
+        # Sesiones HTTP (keep-alive) por portal y cache de respuestas en disco
+        self._sesiones: Dict[str, requests.Session] = {}
+        self._sesiones_lock = threading.Lock()
+        cache_config = scraping_config.get('cache_http', {})
+        self.cache_http = None
+        if cache_config.get('enabled'):
+            self.cache_http = CacheRespuestasHTTP(
+                cache_config.get('carpeta', '.cache_http'),
+                cache_config.get('ttl_segundos', 3600)
+            )
+        
+        # Inicializar base de datos (una conexión persistente para todo el generador)
         self.db_path = "aplicaciones.db"
+        self.db = ConexionDB(self.db_path, self.config.get('base_datos', {}))
         self.inicializar_base_datos()
         
+        # Memoización del análisis (tipo, keywords, salario, fit) por contenido
+        config_cache = self.config.get('cache_analisis', {})
+        self.cache_analisis = None
+        if config_cache.get('enabled', False):
+            self.cache_analisis = CacheAnalisis(
+                self.db, self.huella_config_analisis(),
+                config_cache.get('max_memoria', 256),
+                int(config_cache.get('max_mb_disco', 20) * 1024 * 1024)
+            )
+        
         # Adaptaciones del CV según el tipo de posición
         self.adaptaciones_cv = {
             'qa_automatizacion': {
@@ -171,126 +1677,121 @@ class GeneradorCVInteligente:
             
             # Verificar que sea un archivo Word válido
             try:
-                doc = Document(self.cv_base_path)
-                if len(doc.paragraphs) < 5:
+                if self.cache_cv_base.obtener()['total_parrafos'] < 5:
                     raise FileProcessingError("CV base parece estar vacío o corrupto")
             except Exception as e:
                 raise FileProcessingError(f"Error leyendo CV base: {e}")
             
-            logging.info(f"CV base validado: {self.cv_base_path}")
-            return True
-            
-        except FileProcessingError as e:
-            logging.error(f"Error validando CV base: {e}")
-            return False
-
-    def detectar_salario(self, texto_postulacion: str) -> Dict[str, Any]:
-        """Detecta rangos salariales en la postulación"""
-        resultado = {
-            'salario_detectado': False,
-            'moneda': None,
-            'rango_min': None,
-            'rango_max': None,
-            'es_competitivo': None,
-            'alertas': []
-        }
-        
-        texto = texto_postulacion.lower()
-        
-        # Patrones para detectar salarios
-        patrones_usd = [
-            r'usd\s*(\d+(?:\.\d{3})*)',
-            r'dolares?\s*(\d+(?:\.\d{3})*)',
-            r'\$\s*(\d+(?:\.\d{3})*)\s*usd'
-        ]
-        
-        patrones_ars = [
-            r'\$\s*(\d+(?:\.\d{3})*)',
-            r'pesos\s*(\d+(?:\.\d{3})*)',
-            r'ars\s*(\d+(?:\.\d{3})*)'
-        ]
-        
-        # Buscar USD primero
-        for patron in patrones_usd:
-            matches = re.findall(patron, texto)
-            if matches:
-                resultado['salario_detectado'] = True
-                resultado['moneda'] = 'USD'
-                salarios = [int(m.replace('.', '')) for m in matches]
-                resultado['rango_min'] = min(salarios)
-                resultado['rango_max'] = max(salarios) if len(salarios) > 1 else None
-                break
-        
-        # Si no encontró USD, buscar ARS
-        if not resultado['salario_detectado']:
-            for patron in patrones_ars:
-                matches = re.findall(patron, texto)
-                if matches:
-                    resultado['salario_detectado'] = True
-                    resultado['moneda'] = 'ARS'
-                    salarios = [int(m.replace('.', '')) for m in matches]
-                    resultado['rango_min'] = min(salarios)
-                    resultado['rango_max'] = max(salarios) if len(salarios) > 1 else None
-                    break
-        
-        # Evaluar competitividad
-        if resultado['salario_detectado'] and resultado['moneda'] == 'USD':
-            min_esperado = self.config['deteccion_salarios']['salario_minimo_esperado_usd']
-            max_esperado = self.config['deteccion_salarios']['salario_maximo_esperado_usd']
-            
-            if resultado['rango_min'] < min_esperado:
-                resultado['alertas'].append(f"💰 Salario bajo: ${resultado['rango_min']} USD (mínimo esperado: ${min_esperado})")
-                resultado['es_competitivo'] = False
-            elif resultado['rango_min'] > max_esperado:
-                resultado['alertas'].append(f"🎯 Salario alto: ${resultado['rango_min']} USD (máximo esperado: ${max_esperado})")
-                resultado['es_competitivo'] = True
-            else:
-                resultado['es_competitivo'] = True
-                resultado['alertas'].append(f"✅ Salario competitivo: ${resultado['rango_min']} USD")
-        
-        return resultado
+            logging.info(f"CV base validado: {self.cv_base_path}")
+            return True
+            
+        except FileProcessingError as e:
+            logging.error(f"Error validando CV base: {e}")
+            return False
+
+    def detectar_salario(self, contexto: ContextoAnalisis) -> Dict[str, Any]:
+        """Detecta rangos salariales en la postulación"""
+        contexto = self._como_contexto(contexto)
+        return self.motor_salarios.analizar(contexto.texto_plegado)
+
+    def detectar_salarios_lote(self, textos: Iterable[str]) -> List[Dict[str, Any]]:
+        """Detecta salarios en muchos textos a la vez (p.ej. el campo 'salary' de trabajos scrapeados)"""
+        return self.motor_salarios.analizar_lote(textos)
 
     def inicializar_base_datos(self):
         """Inicializa la base de datos SQLite"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Crear tabla de aplicaciones
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS aplicaciones (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    empresa TEXT NOT NULL,
-                    tipo_posicion TEXT NOT NULL,
-                    nivel_seniority TEXT NOT NULL,
-                    fecha_aplicacion DATETIME NOT NULL,
-                    fit_percentage INTEGER NOT NULL,
-                    salario_detectado REAL,
-                    moneda TEXT,
-                    keywords TEXT,
-                    cv_path TEXT,
-                    postulacion_path TEXT,
-                    estado TEXT DEFAULT 'enviado',
-                    notas TEXT,
-                    fecha_respuesta DATETIME,
-                    fecha_entrevista DATETIME,
-                    resultado_final TEXT
-                )
-            ''')
-            
-            # Crear tabla de estadísticas
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS estadisticas_diarias (
-                    fecha DATE PRIMARY KEY,
-                    aplicaciones_enviadas INTEGER DEFAULT 0,
-                    entrevistas_obtenidas INTEGER DEFAULT 0,
-                    ofertas_recibidas INTEGER DEFAULT 0,
-                    fit_promedio REAL DEFAULT 0
-                )
-            ''')
+            with self.db.usar() as conn:
+                cursor = conn.cursor()
+            
+                # Crear tabla de aplicaciones
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS aplicaciones (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        empresa TEXT NOT NULL,
+                        tipo_posicion TEXT NOT NULL,
+                        nivel_seniority TEXT NOT NULL,
+                        fecha_aplicacion DATETIME NOT NULL,
+                        fit_percentage INTEGER NOT NULL,
+                        salario_detectado REAL,
+                        moneda TEXT,
+                        keywords TEXT,
+                        cv_path TEXT,
+                        postulacion_path TEXT,
+                        estado TEXT DEFAULT 'enviado',
+                        notas TEXT,
+                        fecha_respuesta DATETIME,
+                        fecha_entrevista DATETIME,
+                        resultado_final TEXT
+                    )
+                ''')
+            
+                # Crear tabla de estadísticas
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS estadisticas_diarias (
+                        fecha DATE PRIMARY KEY,
+                        aplicaciones_enviadas INTEGER DEFAULT 0,
+                        entrevistas_obtenidas INTEGER DEFAULT 0,
+                        ofertas_recibidas INTEGER DEFAULT 0,
+                        fit_promedio REAL DEFAULT 0
+                    )
+                ''')
+            
+                # Índice persistente de trabajos ya scrapeados (scraping incremental)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS trabajos_vistos (
+                        clave TEXT PRIMARY KEY,
+                        portal TEXT,
+                        title TEXT,
+                        company TEXT,
+                        primera_vez DATETIME NOT NULL,
+                        ultima_vez DATETIME NOT NULL
+                    )
+                ''')
+            
+                # Huellas SimHash para detectar avisos republicados (casi-duplicados)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS huellas_trabajos (
+                        contexto TEXT NOT NULL,
+                        clave TEXT NOT NULL,
+                        simhash TEXT NOT NULL,
+                        fecha DATETIME NOT NULL,
+                        PRIMARY KEY (contexto, clave)
+                    )
+                ''')
+            
+                # Resultados memoizados del análisis de postulaciones (ver CacheAnalisis)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS cache_analisis (
+                        clave TEXT PRIMARY KEY,
+                        huella_config TEXT NOT NULL,
+                        resultado TEXT NOT NULL,
+                        tamano INTEGER NOT NULL,
+                        ultimo_uso REAL NOT NULL
+                    )
+                ''')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_cache_analisis_uso ON cache_analisis (ultimo_uso)')
             
-            conn.commit()
-            conn.close()
+                # Términos de cada trabajo scrapeado para el ranking de relevancia (BM25)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS terminos_trabajos (
+                        clave TEXT PRIMARY KEY,
+                        terminos TEXT NOT NULL,
+                        fecha DATETIME NOT NULL
+                    )
+                ''')
+            
+                # Resultado de cada fila de un batch, por hash del archivo (para --resume)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS journal_batch (
+                        hash_archivo TEXT NOT NULL,
+                        fila INTEGER NOT NULL,
+                        estado TEXT NOT NULL,
+                        registro TEXT NOT NULL,
+                        fecha DATETIME NOT NULL,
+                        PRIMARY KEY (hash_archivo, fila)
+                    )
+                ''')
             logging.info("Base de datos inicializada correctamente")
             
         except Exception as e:
@@ -302,49 +1803,46 @@ class GeneradorCVInteligente:
                             cv_path: str, postulacion_path: str) -> int:
         """Guarda una aplicación en la base de datos"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.db.usar() as conn:
+                cursor = conn.cursor()
             
-            # Convertir datetime a string para evitar warnings
-            fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            fecha_hoy_str = datetime.now().strftime("%Y-%m-%d")
+                # Convertir datetime a string para evitar warnings
+                fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                fecha_hoy_str = datetime.now().strftime("%Y-%m-%d")
             
-            cursor.execute('''
-                INSERT INTO aplicaciones (
-                    empresa, tipo_posicion, nivel_seniority, fecha_aplicacion,
-                    fit_percentage, salario_detectado, moneda, keywords,
+                cursor.execute('''
+                    INSERT INTO aplicaciones (
+                        empresa, tipo_posicion, nivel_seniority, fecha_aplicacion,
+                        fit_percentage, salario_detectado, moneda, keywords,
+                        cv_path, postulacion_path
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    empresa, tipo_posicion, nivel, fecha_actual,
+                    fit_percentage, 
+                    salario_info.get('rango_min'), 
+                    salario_info.get('moneda'),
+                    ', '.join(keywords),
                     cv_path, postulacion_path
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                empresa, tipo_posicion, nivel, fecha_actual,
-                fit_percentage, 
-                salario_info.get('rango_min'), 
-                salario_info.get('moneda'),
-                ', '.join(keywords),
-                cv_path, postulacion_path
-            ))
-            
-            aplicacion_id = cursor.lastrowid
-            
-            # Actualizar estadísticas diarias
-            cursor.execute('''
-                INSERT OR IGNORE INTO estadisticas_diarias (fecha, aplicaciones_enviadas, fit_promedio)
-                VALUES (?, 1, ?)
-            ''', (fecha_hoy_str, fit_percentage))
-            
-            cursor.execute('''
-                UPDATE estadisticas_diarias 
-                SET aplicaciones_enviadas = aplicaciones_enviadas + 1,
-                    fit_promedio = (
-                        SELECT AVG(fit_percentage) 
-                        FROM aplicaciones 
-                        WHERE DATE(fecha_aplicacion) = ?
-                    )
-                WHERE fecha = ?
-            ''', (fecha_hoy_str, fecha_hoy_str))
+                ))
+            
+                aplicacion_id = cursor.lastrowid
             
-            conn.commit()
-            conn.close()
+                # Actualizar estadísticas diarias
+                cursor.execute('''
+                    INSERT OR IGNORE INTO estadisticas_diarias (fecha, aplicaciones_enviadas, fit_promedio)
+                    VALUES (?, 1, ?)
+                ''', (fecha_hoy_str, fit_percentage))
+            
+                cursor.execute('''
+                    UPDATE estadisticas_diarias 
+                    SET aplicaciones_enviadas = aplicaciones_enviadas + 1,
+                        fit_promedio = (
+                            SELECT AVG(fit_percentage) 
+                            FROM aplicaciones 
+                            WHERE DATE(fecha_aplicacion) = ?
+                        )
+                    WHERE fecha = ?
+                ''', (fecha_hoy_str, fecha_hoy_str))
             
             logging.info(f"Aplicacion guardada en DB: ID {aplicacion_id}")
             return aplicacion_id
@@ -356,54 +1854,52 @@ class GeneradorCVInteligente:
     def obtener_estadisticas(self) -> Dict[str, Any]:
         """Obtiene estadísticas generales de aplicaciones"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Estadísticas generales
-            cursor.execute('SELECT COUNT(*) FROM aplicaciones')
-            total_aplicaciones = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT AVG(fit_percentage) FROM aplicaciones')
-            fit_promedio = cursor.fetchone()[0] or 0
-            
-            # Por tipo de posición
-            cursor.execute('''
-                SELECT tipo_posicion, COUNT(*), AVG(fit_percentage), AVG(salario_detectado)
-                FROM aplicaciones 
-                GROUP BY tipo_posicion
-                ORDER BY COUNT(*) DESC
-            ''')
-            por_tipo = cursor.fetchall()
-            
-            # Por empresa
-            cursor.execute('''
-                SELECT empresa, COUNT(*), MAX(fecha_aplicacion)
-                FROM aplicaciones 
-                GROUP BY empresa
-                ORDER BY COUNT(*) DESC
-                LIMIT 10
-            ''')
-            por_empresa = cursor.fetchall()
-            
-            # Últimas 7 aplicaciones
-            cursor.execute('''
-                SELECT empresa, tipo_posicion, fit_percentage, fecha_aplicacion
-                FROM aplicaciones 
-                ORDER BY fecha_aplicacion DESC
-                LIMIT 7
-            ''')
-            ultimas_aplicaciones = cursor.fetchall()
-            
-            # Estadísticas salariales
-            cursor.execute('''
-                SELECT moneda, AVG(salario_detectado), MIN(salario_detectado), MAX(salario_detectado)
-                FROM aplicaciones 
-                WHERE salario_detectado IS NOT NULL
-                GROUP BY moneda
-            ''')
-            estadisticas_salarios = cursor.fetchall()
-            
-            conn.close()
+            with self.db.usar() as conn:
+                cursor = conn.cursor()
+            
+                # Estadísticas generales
+                cursor.execute('SELECT COUNT(*) FROM aplicaciones')
+                total_aplicaciones = cursor.fetchone()[0]
+            
+                cursor.execute('SELECT AVG(fit_percentage) FROM aplicaciones')
+                fit_promedio = cursor.fetchone()[0] or 0
+            
+                # Por tipo de posición
+                cursor.execute('''
+                    SELECT tipo_posicion, COUNT(*), AVG(fit_percentage), AVG(salario_detectado)
+                    FROM aplicaciones 
+                    GROUP BY tipo_posicion
+                    ORDER BY COUNT(*) DESC
+                ''')
+                por_tipo = cursor.fetchall()
+            
+                # Por empresa
+                cursor.execute('''
+                    SELECT empresa, COUNT(*), MAX(fecha_aplicacion)
+                    FROM aplicaciones 
+                    GROUP BY empresa
+                    ORDER BY COUNT(*) DESC
+                    LIMIT 10
+                ''')
+                por_empresa = cursor.fetchall()
+            
+                # Últimas 7 aplicaciones
+                cursor.execute('''
+                    SELECT empresa, tipo_posicion, fit_percentage, fecha_aplicacion
+                    FROM aplicaciones 
+                    ORDER BY fecha_aplicacion DESC
+                    LIMIT 7
+                ''')
+                ultimas_aplicaciones = cursor.fetchall()
+            
+                # Estadísticas salariales
+                cursor.execute('''
+                    SELECT moneda, AVG(salario_detectado), MIN(salario_detectado), MAX(salario_detectado)
+                    FROM aplicaciones 
+                    WHERE salario_detectado IS NOT NULL
+                    GROUP BY moneda
+                ''')
+                estadisticas_salarios = cursor.fetchall()
             
             return {
                 'total_aplicaciones': total_aplicaciones,
@@ -462,70 +1958,365 @@ class GeneradorCVInteligente:
         
         print("\n" + "="*60)
 
-    def procesar_batch_csv(self, archivo_csv: str) -> Dict[str, Any]:
-        """Procesa múltiples postulaciones desde archivo CSV"""
+    def procesar_batch_csv(self, archivo_csv: str, workers: int = 1,
+                           ruta_reporte: Optional[str] = None, reanudar: bool = False,
+                           max_aplicaciones: Optional[int] = None,
+                           tiempo_limite: Optional[float] = None) -> Dict[str, Any]:
+        """Procesa múltiples postulaciones desde archivo CSV
+        
+        Pipeline por etapas unidas por colas acotadas (si una etapa se atrasa,
+        las anteriores esperan): lectura y análisis en este hilo → render de PDF
+        y resumen (workers procesos, o un hilo) → persistencia en orden del CSV
+        (base y reporte por fila) → emails (pipeline_batch.hilos_notificacion).
+        El detalle de cada fila va al reporte en vez de quedar en memoria.
+        
+        Cada fila terminada queda en journal_batch (hash del archivo + número de
+        fila); con reanudar=True se saltean las que ya tienen resultado, salvo las
+        que terminaron en error. La huella de casi-duplicados de una fila se
+        confirma en la misma transacción que su journal, así una fila cortada a
+        mitad de camino no se toma como duplicada de sí misma al reanudar.
+        
+        Con max_aplicaciones o tiempo_limite (segundos) primero se puntúan todas
+        las filas y se procesan solo las aptas, de mayor a menor fit: las
+        max_aplicaciones mejores, o hasta que se acabe el tiempo.
+        """
+        inicio = time.monotonic()
         if not os.path.exists(archivo_csv):
             raise FileProcessingError(f"Archivo CSV no encontrado: {archivo_csv}")
         
+        hash_archivo = self.calcular_hash_archivo(archivo_csv)
+        if reanudar:
+            completadas = self.filas_completadas_batch(hash_archivo)
+            print(f"⏩ Reanudando {archivo_csv}: {len(completadas)} filas ya procesadas")
+        else:
+            completadas = set()
+            self.limpiar_journal_batch(hash_archivo)
+        
+        config_pipeline = self.config['configuracion_general'].get('pipeline_batch', {})
+        capacidad = max(1, config_pipeline.get('capacidad_cola', 32))
+        if tiempo_limite:
+            # Lo encolado se renderiza aunque se pase el tiempo: alcanza con tener
+            # ocupados a los workers y una fila más esperando
+            capacidad = min(capacidad, max(1, workers) + 1)
+        hilos_notificacion = max(1, config_pipeline.get('hilos_notificacion', 1))
+        if ruta_reporte is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            formato = config_pipeline.get('formato_reporte', 'jsonl')
+            ruta_reporte = os.path.join(self.carpeta_salida, f"reporte_batch_{timestamp}.{formato}")
+        
         resultados = {
             'procesadas': 0,
             'exitosas': 0,
             'rechazadas': 0,
             'errores': 0,
-            'detalle': []
+            'duplicadas': 0,
+            'reanudadas': 0,
+            'pendientes': 0,
+            'reporte': ruta_reporte
         }
         
+        programadas = None
+        if max_aplicaciones or tiempo_limite:
+            # Solo con tiempo límite no hay cantidad: se acota a max_candidatas
+            max_filas = max_aplicaciones or max(1, config_pipeline.get('max_candidatas', 1000))
+            try:
+                programadas, puntuadas, aptas = self.seleccionar_mejores_filas(archivo_csv, max_filas, completadas)
+            except Exception as e:
+                raise FileProcessingError(f"Error leyendo CSV: {e}")
+            resultados['reanudadas'] = len(completadas)
+            print(f"🎯 {len(programadas)} postulaciones aptas de {puntuadas} filas, en orden de fit "
+                  f"({time.monotonic() - inicio:.1f}s de pre-análisis)")
+            if not max_aplicaciones and aptas > len(programadas):
+                # Las que no entraron en max_candidatas también quedan pendientes (--resume las retoma)
+                resultados['pendientes'] = aptas - len(programadas)
+                print(f"⚠️ {resultados['pendientes']} aptas más quedan afuera por "
+                      f"pipeline_batch.max_candidatas ({max_filas})")
+        
+        # En batch los PDFs se escriben en segundo plano
+        self.escritura_pdf_asincrona = self.config['configuracion_general'].get('escritura_pdf_asincrona', False)
+        if workers > 1:
+            render = ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker_batch,
+                                         initargs=(self.config_path, self.config, self.umbral_fit))
+            print(f"⚙️ Generando PDFs con {workers} procesos")
+        else:
+            render = ThreadPoolExecutor(max_workers=1)
+        
+        cola_persistir: "queue.Queue[Any]" = queue.Queue(maxsize=capacidad)
+        cola_notificar: "queue.Queue[Any]" = queue.Queue(maxsize=capacidad)
+        cancelado = threading.Event()
+        errores_etapa: List[Exception] = []
+        FIN = object()
+        
+        def publicar(cola, item) -> bool:
+            while not cancelado.is_set():
+                try:
+                    cola.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def esperar_lugar(cola, limite: float) -> bool:
+            # False si se llega a limite antes de que haya lugar en la cola: así no
+            # se analiza ni se manda a render una fila que ya no entra en el tiempo
+            while cola.full() and not cancelado.is_set():
+                if time.monotonic() > limite:
+                    return False
+                time.sleep(0.05)
+            return time.monotonic() <= limite
+        
+        def consumir(cola) -> Iterator[Any]:
+            while not cancelado.is_set():
+                try:
+                    item = cola.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if item is FIN:
+                    return
+                yield item
+        
+        config_db = self.config.get('base_datos', {})
+        filas_por_commit = max(1, config_db.get('filas_por_commit', 100))
+        segundos_por_commit = config_db.get('segundos_por_commit', 1.0)
+        
+        def persistir():
+            # Aplicaciones y journal de cada fila van en la misma transacción, que se
+            # confirma cada tanto; los emails salen recién después de confirmar sus filas
+            por_notificar = []
+            sin_confirmar, ultimo_commit = 0, time.monotonic()
+            try:
+                with self.db.lote(), EscritorTabla(ruta_reporte, self.COLUMNAS_REPORTE_BATCH,
+                                                   {'fila': 'int', 'fit': 'int'}) as reporte:
+                    for fila in consumir(cola_persistir):
+                        registro, notificacion = self._cerrar_fila_batch(resultados, fila)
+                        reporte.escribir(registro)
+                        self.guardar_fila_journal(hash_archivo, registro)
+                        if notificacion is not None:
+                            por_notificar.append(notificacion)
+                        sin_confirmar += 1
+                        if sin_confirmar >= filas_por_commit or time.monotonic() - ultimo_commit >= segundos_por_commit:
+                            self.db.confirmar()
+                            sin_confirmar, ultimo_commit = 0, time.monotonic()
+                            for notificacion in por_notificar:
+                                publicar(cola_notificar, notificacion)
+                            por_notificar = []
+                # Al salir del lote queda todo confirmado
+                for notificacion in por_notificar:
+                    publicar(cola_notificar, notificacion)
+            except Exception as e:
+                errores_etapa.append(e)
+                cancelado.set()
+            finally:
+                for _ in range(hilos_notificacion):
+                    publicar(cola_notificar, FIN)
+        
+        def notificar():
+            for plan, archivos in consumir(cola_notificar):
+                self.notificar_postulacion(plan, archivos)
+        
+        hilos = [threading.Thread(target=persistir, name='batch-persistencia', daemon=True)]
+        hilos += [threading.Thread(target=notificar, name=f'batch-email-{i}', daemon=True)
+                  for i in range(hilos_notificacion)]
+        for hilo in hilos:
+            hilo.start()
+        
         try:
-            with open(archivo_csv, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                
-                for row in reader:
-                    empresa = row.get('empresa', '').strip()
-                    descripcion = row.get('descripcion', '').strip()
-                    
-                    if not empresa or not descripcion:
-                        print(f"⚠️ Fila incompleta ignorada: {empresa}")
-                        continue
-                    
-                    resultados['procesadas'] += 1
-                    print(f"\n{'='*50}")
-                    print(f"📝 Procesando {resultados['procesadas']}: {empresa}")
-                    
-                    try:
-                        resultado = self.procesar_postulacion(descripcion, empresa)
-                        
-                        if resultado:
-                            resultados['exitosas'] += 1
-                            resultados['detalle'].append({
-                                'empresa': empresa,
-                                'estado': 'exitosa',
-                                'tipo_posicion': resultado['tipo_posicion'],
-                                'cv_path': resultado['cv_path']
-                            })
-                            print(f"✅ {empresa}: CV generado exitosamente")
-                        else:
-                            resultados['rechazadas'] += 1
-                            resultados['detalle'].append({
-                                'empresa': empresa,
-                                'estado': 'rechazada',
-                                'razon': 'Fit insuficiente o fuera de estrategia'
-                            })
-                            print(f"❌ {empresa}: Rechazada (fit insuficiente)")
-                            
-                    except Exception as e:
-                        resultados['errores'] += 1
-                        resultados['detalle'].append({
-                            'empresa': empresa,
-                            'estado': 'error',
-                            'razon': str(e)
-                        })
-                        print(f"💥 {empresa}: Error - {e}")
-                        logging.error(f"Error procesando {empresa}: {e}")
+            filas = self.leer_filas_batch(archivo_csv) if programadas is None else programadas
+            for i, (numero, empresa, descripcion) in enumerate(filas):
+                if numero in completadas:
+                    resultados['reanudadas'] += 1
+                    continue
+                if tiempo_limite and not esperar_lugar(cola_persistir, inicio + tiempo_limite):
+                    resultados['pendientes'] += len(programadas) - i
+                    print(f"⏱️ Tiempo límite de {tiempo_limite:.0f}s alcanzado - "
+                          f"{resultados['pendientes']} postulaciones aptas sin procesar")
+                    break
+                if not publicar(cola_persistir, self._analizar_fila_batch(resultados, numero, empresa, descripcion, render)):
+                    break
+        except Exception as e:
+            errores_etapa.append(FileProcessingError(f"Error leyendo CSV: {e}"))
+        except BaseException:
+            cancelado.set()
+            raise
+        finally:
+            # Las filas ya analizadas se terminan de persistir antes de salir
+            publicar(cola_persistir, FIN)
+            for hilo in hilos:
+                hilo.join()
+            render.shutdown(wait=True)
+            # Cada fila ya esperó su escritura en _cerrar_fila_batch (y las fallidas
+            # quedaron como error); acá solo se vacía la lista
+            self.esperar_escrituras_pdf()
+            self.escritura_pdf_asincrona = False
+        
+        if errores_etapa:
+            error = errores_etapa[0]
+            raise error if isinstance(error, CVGeneratorError) else FileProcessingError(f"Error en el batch: {error}")
+        return resultados
+
+    @staticmethod
+    def calcular_hash_archivo(ruta: str) -> str:
+        sha = hashlib.sha256()
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                sha.update(bloque)
+        return sha.hexdigest()
+
+    def filas_completadas_batch(self, hash_archivo: str) -> set:
+        """Números de fila con resultado en el journal para ese archivo
         
+        Las filas con estado 'error' no cuentan: suelen ser fallas transitorias
+        (SMTP, disco lleno) y --resume las vuelve a intentar.
+        """
+        try:
+            with self.db.usar() as conn:
+                filas = {fila for (fila,) in conn.execute(
+                    "SELECT fila FROM journal_batch WHERE hash_archivo = ? AND estado != 'error'", (hash_archivo,))}
+            return filas
         except Exception as e:
-            raise FileProcessingError(f"Error leyendo CSV: {e}")
+            logging.warning(f"Error leyendo journal de batch: {e}")
+            return set()
+
+    def limpiar_journal_batch(self, hash_archivo: str):
+        """Una corrida desde cero descarta el journal anterior del mismo archivo"""
+        try:
+            with self.db.usar() as conn:
+                conn.execute('DELETE FROM journal_batch WHERE hash_archivo = ?', (hash_archivo,))
+        except Exception as e:
+            logging.warning(f"Error limpiando journal de batch: {e}")
+
+    def guardar_fila_journal(self, hash_archivo: str, registro: Dict[str, Any]):
+        """Marca una fila como terminada (en batch se confirma junto con su fila de aplicaciones)"""
+        with self.db.usar() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO journal_batch (hash_archivo, fila, estado, registro, fecha) VALUES (?, ?, ?, ?, ?)',
+                (hash_archivo, registro['fila'], registro['estado'], json.dumps(registro, ensure_ascii=False),
+                 datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+
+    def leer_filas_batch(self, archivo_csv: str) -> Iterator[Tuple[int, str, str]]:
+        """Filas válidas del archivo como (número de fila, empresa, descripción), de a una
         
-        return resultados
+        Acepta CSV, JSONL o Parquet (ver leer_tabla); solo se leen empresa y descripcion.
+        """
+        for numero, row in enumerate(leer_tabla(archivo_csv, ['empresa', 'descripcion']), 1):
+            empresa = str(row.get('empresa') or '').strip()
+            descripcion = str(row.get('descripcion') or '').strip()
+            
+            if not empresa or not descripcion:
+                print(f"⚠️ Fila incompleta ignorada: {empresa}")
+                continue
+            yield numero, empresa, descripcion
+
+    def _analizar_fila_batch(self, resultados: Dict[str, Any], numero: int, empresa: str, descripcion: str,
+                             render) -> Dict[str, Any]:
+        """Etapa de análisis: descarta casi-duplicados, arma el plan y lo manda a render"""
+        clave_batch = hashlib.sha1(f"{empresa}_{descripcion}".lower().encode('utf-8')).hexdigest()
+        fila = {'fila': numero, 'empresa': empresa, 'plan': None, 'archivos': None, 'error': None,
+                'clave': clave_batch, 'huella': None}
+        
+        # Avisos casi idénticos a uno que ya generó CV no pasan por el pipeline
+        texto_huella = f"{descripcion} {empresa}"
+        huella = IndiceSimHash.calcular(texto_huella) if self.deteccion_duplicados_activa() else None
+        # En batch la misma clave sí es duplicado: es una postulación ya hecha
+        if self.buscar_casi_duplicado('batch', texto_huella, clave_batch, registrar=False,
+                                      excluir_propia=False, huella=huella):
+            resultados['duplicadas'] += 1
+            fila['estado'] = 'duplicada'
+            print(f"♻️ {empresa}: casi-duplicado de una postulación ya procesada - se omite")
+            return fila
+        
+        resultados['procesadas'] += 1
+        print(f"\n{'='*50}")
+        print(f"📝 Procesando {resultados['procesadas']}: {empresa}")
+        
+        try:
+            fila['plan'] = self.preparar_postulacion(descripcion, empresa)
+            if fila['plan'] is not None:
+                if isinstance(render, ProcessPoolExecutor):
+                    fila['archivos'] = render.submit(_generar_archivos_worker, fila['plan'])
+                else:
+                    fila['archivos'] = render.submit(self.generar_archivos_postulacion, fila['plan'])
+                # Una vez encolado el render, la huella entra al índice en memoria para que
+                # las filas siguientes (que se analizan mientras esta se renderiza) ya la
+                # vean; se persiste recién cuando la postulación queda registrada
+                # (_cerrar_fila_batch). Si el pool rechaza la tarea no se registra.
+                self.buscar_casi_duplicado('batch', texto_huella, clave_batch, excluir_propia=False,
+                                           persistir=False, huella=huella)
+                fila['huella'] = huella
+        except Exception as e:
+            fila['error'] = e
+        return fila
+
+    def _cerrar_fila_batch(self, resultados: Dict[str, Any],
+                           fila: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """Etapa de persistencia: contadores y base de una fila ya renderizada
+        
+        Devuelve el registro para el reporte y, si corresponde, el (plan, archivos) a notificar.
+        """
+        empresa = fila['empresa']
+        registro = {'fila': fila['fila'], 'empresa': empresa}
+        if fila.get('estado') == 'duplicada':
+            registro['estado'] = 'duplicada'
+            return registro, None
+        
+        plan, archivos = fila['plan'], fila['archivos']
+        try:
+            if fila['error'] is not None:
+                raise fila['error']
+            resultado = None
+            if plan is not None:
+                archivos = archivos.result()
+                # La fila cuenta como hecha recién con el PDF en disco: un error de
+                # escritura (disco lleno) la deja en 'error' y --resume la reintenta
+                escritura = archivos.pop('escritura', None)
+                if escritura is not None:
+                    escritura.result()
+                if not archivos['ok']:
+                    raise FileProcessingError("Error generando PDF")
+                resultado = self.registrar_postulacion(plan, archivos, notificar=False)
+            
+            if resultado:
+                if fila['huella'] is not None:
+                    # Misma transacción que el journal de la fila
+                    self.registrar_huella('batch', fila['clave'], fila['huella'])
+                    fila['huella'] = None
+                resultados['exitosas'] += 1
+                registro.update({
+                    'estado': 'exitosa',
+                    'tipo_posicion': resultado['tipo_posicion'],
+                    'fit': plan['analisis_fit']['fit_percentage'],
+                    'cv_path': resultado['cv_path']
+                })
+                print(f"✅ {empresa}: CV generado exitosamente")
+                if self.config['email_config']['enabled']:
+                    return registro, (plan, archivos)
+            else:
+                resultados['rechazadas'] += 1
+                registro.update({
+                    'estado': 'rechazada',
+                    'razon': 'Fit insuficiente o fuera de estrategia'
+                })
+                print(f"❌ {empresa}: Rechazada (fit insuficiente)")
+                
+        except Exception as e:
+            resultados['errores'] += 1
+            registro.update({
+                'estado': 'error',
+                'razon': str(e)
+            })
+            print(f"💥 {empresa}: Error - {e}")
+            logging.error(f"Error procesando {empresa}: {e}")
+        
+        # Sin postulación registrada, la fila no debe bloquear a otras iguales
+        if fila['huella'] is not None:
+            self.olvidar_huella('batch', fila['clave'], fila['huella'])
+        return registro, None
+
+    @staticmethod
+    def leer_reporte_batch(ruta_reporte: str) -> Iterator[Dict[str, Any]]:
+        """Registros del reporte de un batch, de a uno"""
+        return leer_tabla(ruta_reporte)
 
     def mostrar_resumen_batch(self, resultados: Dict[str, Any]):
         """Muestra resumen de procesamiento batch"""
@@ -538,42 +2329,197 @@ class GeneradorCVInteligente:
         print(f"   • ✅ Exitosas: {resultados['exitosas']}")
         print(f"   • ❌ Rechazadas: {resultados['rechazadas']}")
         print(f"   • 💥 Errores: {resultados['errores']}")
+        if resultados.get('duplicadas'):
+            print(f"   • ♻️ Casi-duplicados omitidos: {resultados['duplicadas']}")
+        if resultados.get('reanudadas'):
+            print(f"   • ⏩ Ya procesadas en una corrida anterior: {resultados['reanudadas']}")
+        if resultados.get('pendientes'):
+            print(f"   • ⏱️ Aptas sin procesar (tiempo límite o max_candidatas): {resultados['pendientes']}")
         
         if resultados['procesadas'] > 0:
             tasa_exito = (resultados['exitosas'] / resultados['procesadas']) * 100
             print(f"   • 📊 Tasa de éxito: {tasa_exito:.1f}%")
         
-        # Detalles por estado
+        # Detalles por estado (se leen del reporte, una pasada por sección)
+        ruta_reporte = resultados.get('reporte')
+        if not ruta_reporte or not os.path.exists(ruta_reporte):
+            print("\n" + "="*60)
+            return
+        
         if resultados['exitosas'] > 0:
             print(f"\n✅ APLICACIONES EXITOSAS:")
-            for detalle in resultados['detalle']:
+            for detalle in self.leer_reporte_batch(ruta_reporte):
                 if detalle['estado'] == 'exitosa':
                     print(f"   • {detalle['empresa']} ({detalle['tipo_posicion']})")
         
         if resultados['rechazadas'] > 0:
             print(f"\n❌ APLICACIONES RECHAZADAS:")
-            for detalle in resultados['detalle']:
+            for detalle in self.leer_reporte_batch(ruta_reporte):
                 if detalle['estado'] == 'rechazada':
                     print(f"   • {detalle['empresa']}: {detalle['razon']}")
         
         if resultados['errores'] > 0:
             print(f"\n💥 ERRORES:")
-            for detalle in resultados['detalle']:
+            for detalle in self.leer_reporte_batch(ruta_reporte):
                 if detalle['estado'] == 'error':
                     print(f"   • {detalle['empresa']}: {detalle['razon']}")
         
+        print(f"\n📄 Reporte por fila: {ruta_reporte}")
+        print("\n" + "="*60)
+
+    def triage_batch_csv(self, archivo_csv: str, ruta_salida: Optional[str] = None) -> Dict[str, Any]:
+        """Puntúa todas las filas del CSV sin generar nada: ni PDFs, ni archivos, ni filas en la base
+        
+        Corre solo detección de tipo y nivel, keywords, salario y análisis de fit
+        (ver puntuar_filas_batch) y escribe un único archivo ordenado por fit.
+        La salida es CSV o JSONL según la extensión; el CSV conserva empresa y
+        descripcion, así se puede pasar directo a --batch.
+        """
+        if not os.path.exists(archivo_csv):
+            raise FileProcessingError(f"Archivo CSV no encontrado: {archivo_csv}")
+        if ruta_salida is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            ruta_salida = os.path.join(self.carpeta_salida, f"triage_{timestamp}.csv")
+        
+        inicio = time.perf_counter()
+        try:
+            filas = list(self.puntuar_filas_batch(archivo_csv))
+        except Exception as e:
+            raise FileProcessingError(f"Error leyendo CSV: {e}")
+        
+        filas.sort(key=lambda fila: (-fila['fit'], fila['fila']))
+        self.escribir_salida_triage(filas, ruta_salida)
+        
+        return {
+            'analizadas': len(filas),
+            'aptas': sum(1 for fila in filas if fila['apta']),
+            'sin_posicion': sum(1 for fila in filas if not fila['tipo_posicion']),
+            'duracion': time.perf_counter() - inicio,
+            'salida': ruta_salida,
+            'mejores': filas[:10]
+        }
+
+    def puntuar_filas_batch(self, archivo_csv: str, omitir: Optional[set] = None) -> Iterator[Dict[str, Any]]:
+        """Análisis liviano de cada fila del CSV (sin archivos, base ni cache), en orden del archivo
+        
+        Tipo y nivel, keywords, salario y fit por lotes de LOTE_TRIAGE filas con
+        generar_analisis_fit_lote. Los detectores explican cada decisión por
+        pantalla; acá esa salida se descarta.
+        """
+        filas = self.leer_filas_batch(archivo_csv)
+        while True:
+            lote = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                for numero, empresa, descripcion in filas:
+                    if omitir and numero in omitir:
+                        continue
+                    lote.append(self._puntuar_fila_batch(numero, empresa, descripcion))
+                    if len(lote) >= self.LOTE_TRIAGE:
+                        break
+                candidatas = [(fila, keywords) for fila, keywords in lote if keywords is not None]
+                analisis_fit = self.generar_analisis_fit_lote([
+                    (keywords, fila['tipo_posicion'], fila['nivel']) for fila, keywords in candidatas
+                ])
+            for (fila, _), fit in zip(candidatas, analisis_fit):
+                fila['fit'] = fit['fit_percentage']
+                fila['apta'] = fila['en_estrategia'] and fit['fit_percentage'] >= self.umbral_fit
+                fila['brechas'] = '; '.join(fit['brechas'])
+            for fila, _ in lote:
+                yield fila
+            if len(lote) < self.LOTE_TRIAGE:
+                return
+
+    def _puntuar_fila_batch(self, numero: int, empresa: str, descripcion: str) -> Tuple[Dict[str, Any], Optional[List[str]]]:
+        """Fila puntuable y sus keywords (None si no se detectó una posición válida)"""
+        contexto = self.crear_contexto(descripcion, empresa)
+        tipo_posicion, nivel = self.detectar_tipo_posicion(contexto)
+        fila = {'fila': numero, 'empresa': empresa, 'fit': 0, 'apta': False,
+                'tipo_posicion': tipo_posicion or '', 'nivel': nivel or '', 'en_estrategia': False,
+                'salario_min': None, 'moneda': None, 'keywords': '', 'brechas': '',
+                'descripcion': descripcion}
+        if tipo_posicion is None:
+            return fila, None
+        
+        keywords = self.extraer_keywords_avanzado(contexto)
+        try:
+            info_salario = self.detectar_salario(contexto)
+        except Exception as e:
+            logging.warning(f"Error detectando salario: {e}")
+            info_salario = {}
+        fila.update({
+            'en_estrategia': self.validar_estrategia_aplicacion(tipo_posicion, nivel),
+            'salario_min': info_salario.get('rango_min'),
+            'moneda': info_salario.get('moneda'),
+            'keywords': ', '.join(sorted(keywords))
+        })
+        return fila, keywords
+
+    def seleccionar_mejores_filas(self, archivo_csv: str, max_filas: Optional[int] = None,
+                                  omitir: Optional[set] = None) -> Tuple[List[Tuple[int, str, str]], int, int]:
+        """Filas aptas del CSV en orden de fit descendente (empate: orden del archivo)
+        
+        Con max_filas solo se guardan las mejores en un heap acotado, así la
+        memoria depende de max_filas y no del tamaño del CSV (el batch siempre
+        lo pasa; sin él se guardan todas las aptas). Devuelve las filas
+        como (número, empresa, descripción), la cantidad de filas puntuadas y
+        la de aptas (incluidas las que no entraron en el heap).
+        """
+        heap: List[Tuple[int, int, int, str, str]] = []  # (fit, -fila, fila, empresa, descripcion)
+        puntuadas = aptas = 0
+        for fila in self.puntuar_filas_batch(archivo_csv, omitir):
+            puntuadas += 1
+            if not fila['apta']:
+                continue
+            aptas += 1
+            item = (fila['fit'], -fila['fila'], fila['fila'], fila['empresa'], fila['descripcion'])
+            if max_filas is None or len(heap) < max_filas:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        filas = [(numero, empresa, descripcion) for _, _, numero, empresa, descripcion in sorted(heap, reverse=True)]
+        return filas, puntuadas, aptas
+
+    def escribir_salida_triage(self, filas: List[Dict[str, Any]], ruta_salida: str):
+        columnas = ['fit', 'apta', 'empresa', 'tipo_posicion', 'nivel', 'en_estrategia',
+                    'salario_min', 'moneda', 'keywords', 'brechas', 'fila', 'descripcion']
+        tipos = {'fit': 'int', 'apta': 'bool', 'en_estrategia': 'bool', 'salario_min': 'float', 'fila': 'int'}
+        with EscritorTabla(ruta_salida, columnas, tipos) as salida:
+            for fila in filas:
+                salida.escribir(fila)
+
+    def mostrar_resumen_triage(self, resultados: Dict[str, Any]):
+        """Muestra resumen del triage"""
+        print("\n" + "="*60)
+        print("🔎 TRIAGE DE POSTULACIONES")
+        print("="*60)
+        print(f"   • Analizadas: {resultados['analizadas']} en {resultados['duracion']:.1f}s")
+        print(f"   • ✅ Aptas (fit >= {self.umbral_fit}% y dentro de estrategia): {resultados['aptas']}")
+        print(f"   • 🚫 Sin posición válida: {resultados['sin_posicion']}")
+        
+        if resultados['mejores']:
+            print(f"\n🏆 MEJORES POR FIT:")
+            for fila in resultados['mejores']:
+                marca = "✅" if fila['apta'] else "  "
+                print(f"   {marca} {fila['fit']:>3}% | {fila['empresa']} ({fila['tipo_posicion'] or '-'} {fila['nivel']})")
+        
+        print(f"\n📄 Resultado ordenado por fit: {resultados['salida']}")
         print("\n" + "="*60)
 
     def enviar_email_aplicacion(self, empresa: str, posicion: str, cv_path: str, speech: str, 
-                               email_destino: str = None) -> bool:
-        """Envía email de aplicación con CV adjunto"""
+                               email_destino: str = None, cv_bytes: Optional[bytes] = None) -> bool:
+        """Envía email de aplicación con CV adjunto
+        
+        Si se pasa cv_bytes (el PDF ya en memoria) se adjunta directo, sin leer cv_path.
+        """
         
         if not self.config['email_config']['enabled']:
             print("📧 Email deshabilitado en configuración")
             return False
         
         if not email_destino:
-            email_destino = input(f"📧 Email para {empresa} (enter para omitir): ").strip()
+            # En batch los emails salen de varios hilos: una pregunta a la vez
+            with self._consola_lock:
+                email_destino = input(f"📧 Email para {empresa} (enter para omitir): ").strip()
             if not email_destino:
                 print("⏭️ Envío de email omitido")
                 return False
@@ -606,10 +2552,12 @@ class GeneradorCVInteligente:
             msg.attach(MIMEText(cuerpo, 'plain', 'utf-8'))
             
             # Adjuntar CV
-            if os.path.exists(cv_path):
+            if cv_bytes is None and os.path.exists(cv_path):
                 with open(cv_path, "rb") as attachment:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(attachment.read())
+                    cv_bytes = attachment.read()
+            if cv_bytes is not None:
+                part = MIMEBase('application', 'octet-stream')
+                part.set_payload(cv_bytes)
                 
                 encoders.encode_base64(part)
                 filename = os.path.basename(cv_path)
@@ -638,21 +2586,13 @@ class GeneradorCVInteligente:
 
     def extraer_tecnologias_principales(self, posicion: str) -> List[str]:
         """Extrae las tecnologías principales mencionadas en la posición"""
-        tecnologias_destacadas = []
-        posicion_lower = posicion.lower()
+        coincidencias = self.buscar_keywords(posicion)
         
         # Buscar tecnologías clave en la posición
-        tech_importantes = {
-            'Python': ['python', 'fastapi', 'django', 'flask'],
-            'Java': ['java', 'spring', 'spring boot'],
-            'JavaScript': ['javascript', 'vue', 'react', 'angular', 'next.js'],
-            'QA': ['qa', 'testing', 'selenium', 'automation'],
-            'SQL': ['sql', 'postgresql', 'mysql', 'database']
-        }
-        
-        for tech_name, keywords in tech_importantes.items():
-            if any(kw in posicion_lower for kw in keywords):
-                tecnologias_destacadas.append(tech_name)
+        tecnologias_destacadas = [
+            tech_name for tech_name, keywords in self.TECNOLOGIAS_PRINCIPALES.items()
+            if coincidencias.alguna(keywords)
+        ]
         
         return tecnologias_destacadas[:3]  # Máximo 3 tecnologías principales
 
@@ -708,18 +2648,108 @@ class GeneradorCVInteligente:
             'Cache-Control': 'max-age=0'
         }
 
-    def scrape_portal(self, portal_name: str, query: str, location: str = "Buenos Aires") -> List[Dict[str, str]]:
-        """Scraping de un portal específico de trabajo"""
+    def obtener_sesion(self, portal_name: str) -> requests.Session:
+        """Devuelve la sesión HTTP del portal, reutilizando conexiones keep-alive"""
+        with self._sesiones_lock:
+            sesion = self._sesiones.get(portal_name)
+            if sesion is None:
+                pool = max(1, self.config['scraping_config'].get('max_concurrency', 4))
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool)
+                sesion = requests.Session()
+                sesion.mount('http://', adapter)
+                sesion.mount('https://', adapter)
+                self._sesiones[portal_name] = sesion
+            return sesion
+
+    def obtener_extractor(self, portal_name: str) -> ExtractorPortal:
+        """Devuelve el extractor del portal, compilando sus selectores una sola vez"""
+        extractor = self._extractores.get(portal_name)
+        if extractor is None:
+            portal_config = self.config['scraping_config']['portales'][portal_name]
+            extractor = ExtractorPortal(portal_config['job_selectors'], portal_config.get('parser', 'lxml'))
+            self._extractores[portal_name] = extractor
+            logging.info(f"Parser de {portal_name}: {extractor.backend}")
+        return extractor
+
+    def obtener_pagina(self, portal_name: str, url: str, headers: Dict[str, str], timeout: int = 15,
+                       deadline: Optional[float] = None) -> Optional[requests.Response]:
+        """GET de una página de portal pasando por el cache HTTP y el limitador por host
+        
+        Una respuesta fresca en cache se devuelve sin red ni delay. Si está vencida
+        se revalida con un GET condicional (304 reutiliza el cuerpo cacheado).
+        Devuelve None si el deadline se alcanza antes de obtener turno.
+        """
+        entrada = self.cache_http.obtener(url) if self.cache_http else None
+        if entrada and self.cache_http.es_fresca(entrada):
+            logging.info(f"Cache HTTP fresca para {url}")
+            return CacheRespuestasHTTP.como_respuesta(url, entrada['content'])
+        
+        # Respetar el delay de cortesía del host antes de pedir
+        if not self.limitador_hosts.esperar_turno(urlparse(url).netloc, deadline):
+            return None
+        
+        headers_request = dict(headers)
+        if entrada:
+            headers_request.update(self.cache_http.headers_condicionales(entrada))
+        
+        response = self.obtener_sesion(portal_name).get(url, headers=headers_request, timeout=timeout)
+        
+        if response.status_code == 304 and entrada:
+            logging.info(f"Cache HTTP revalidada (304) para {url}")
+            self.cache_http.renovar(url, entrada)
+            return CacheRespuestasHTTP.como_respuesta(url, entrada['content'])
+        
+        if response.status_code == 200 and self.cache_http:
+            self.cache_http.guardar(url, response.content,
+                                   response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return response
+
+    def construir_url_pagina(self, portal_config: Dict[str, Any], search_url: str, pagina: int) -> str:
+        """URL de la página N de resultados según la config de paginación del portal"""
+        if pagina == 1:
+            return search_url
+        
+        paginacion = portal_config.get('paginacion', {})
+        parametro = paginacion.get('parametro', 'page')
+        valor = paginacion.get('inicio', 1) + (pagina - 1) * paginacion.get('paso', 1)
+        
+        partes = urlparse(search_url)
+        query = parse_qsl(partes.query, keep_blank_values=True)
+        query = [(k, v) for k, v in query if k != parametro] + [(parametro, str(valor))]
+        return urlunparse(partes._replace(query=urlencode(query)))
+
+    def scrape_portal(self, portal_name: str, query: str, location: str = "Buenos Aires",
+                      deadline: Optional[float] = None) -> List[Dict[str, str]]:
+        """Scraping de un portal específico de trabajo
+        
+        deadline es un instante de time.monotonic(); si el turno del host
+        cae después, el request se omite.
+        """
+        return list(self.iterar_trabajos_portal(portal_name, query, location, deadline=deadline))
+
+    def iterar_trabajos_portal(self, portal_name: str, query: str, location: str = "Buenos Aires",
+                               deadline: Optional[float] = None,
+                               max_resultados: Optional[int] = None) -> Iterator[Dict[str, str]]:
+        """Genera los trabajos de un portal a medida que se parsean, siguiendo la paginación
+        
+        Se detiene al llegar a max_resultados (default: max_results_per_portal),
+        a scraping_config.max_paginas, al deadline o cuando una página viene vacía.
+        """
         if not self.config['scraping_config']['enabled']:
             print(f"🕷️ Web scraping deshabilitado en configuración")
-            return []
+            return
             
         portal_config = self.config['scraping_config']['portales'].get(portal_name)
         if not portal_config or not portal_config['enabled']:
             print(f"⚠️ Portal {portal_name} no está habilitado")
-            return []
+            return
+        
+        if max_resultados is None:
+            max_resultados = self.config['scraping_config']['max_results_per_portal']
+        max_paginas = self.config['scraping_config'].get('max_paginas', 1)
+        incremental = self.config['scraping_config'].get('solo_trabajos_nuevos', False)
         
-        jobs = []
+        emitidos = 0
         headers = self.obtener_headers_aleatorios()
         
         try:
@@ -738,113 +2768,105 @@ class GeneradorCVInteligente:
                 )
             
             print(f"🕷️ Scrapeando {portal_name}: {query} en {location}")
-            print(f"   📍 URL: {search_url}")
-            logging.info(f"Scraping {portal_name}: {search_url}")
-            
-            # Realizar request con mejor manejo de errores
-            response = requests.get(search_url, headers=headers, timeout=15)
-            
-            # Verificar respuesta
-            if response.status_code == 403:
-                print(f"   ❌ 403 Forbidden - {portal_name} bloquea scraping")
-                logging.warning(f"{portal_name} bloquea scraping: 403 Forbidden")
-                return []
-            elif response.status_code == 404:
-                print(f"   ❌ 404 Not Found - URL incorrecta para {portal_name}")
-                logging.warning(f"{portal_name} URL incorrecta: 404")
-                return []
-            elif response.status_code != 200:
-                print(f"   ❌ Error {response.status_code} - {portal_name}")
-                logging.warning(f"{portal_name} error HTTP: {response.status_code}")
-                return []
-            
-            # Verificar que el contenido no esté vacío
-            if len(response.content) < 1000:
-                print(f"   ⚠️ Respuesta muy pequeña de {portal_name} - posible problema")
-                logging.warning(f"{portal_name} respuesta pequeña: {len(response.content)} bytes")
-            
-            response.raise_for_status()
-            
-            # Parsear HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            selectors = portal_config['job_selectors']
-            
-            # Buscar contenedores de trabajos
-            job_containers = soup.select(selectors['job_container'])
-            max_results = self.config['scraping_config']['max_results_per_portal']
-            
-            # DEBUG: Mostrar información sobre el HTML recibido
-            print(f"   🔍 HTML recibido: {len(response.content)} bytes")
-            print(f"   🎯 Selector usado: '{selectors['job_container']}'")
-            print(f"   📦 Contenedores encontrados: {len(job_containers)}")
-            
-            # Si no encuentra trabajos, hacer debug más detallado
-            if len(job_containers) == 0:
-                print(f"   🚨 DEBUG: No se encontraron contenedores con selector '{selectors['job_container']}'")
+            
+            for pagina in range(1, max_paginas + 1):
+                page_url = self.construir_url_pagina(portal_config, search_url, pagina)
+                print(f"   📍 URL: {page_url}")
+                logging.info(f"Scraping {portal_name}: {page_url}")
                 
-                # Mostrar algunos selectores comunes para debug
-                common_selectors = ['.job', '.aviso', '.offer', '.resultado', '.listado', '.item', 
-                                  '[data-job]', '.trabajo', '.empleo', '.card']
+                # Realizar request (cache + delay por host) con mejor manejo de errores
+                response = self.obtener_pagina(portal_name, page_url, headers, timeout=15, deadline=deadline)
+                if response is None:
+                    print(f"   ⏱️ Deadline alcanzado - se omite {portal_name}: {query} (página {pagina})")
+                    logging.warning(f"Deadline alcanzado antes de scrapear {portal_name}: {query} (página {pagina})")
+                    break
                 
-                for sel in common_selectors:
-                    found = soup.select(sel)
-                    if len(found) > 0:
-                        print(f"   💡 Selector alternativo '{sel}': {len(found)} elementos")
-                        
-                # Mostrar parte del HTML para debug manual
-                print(f"   📄 Primeros 500 chars del HTML:")
-                print(f"   {str(soup)[:500]}...")
+                # En páginas siguientes un error o página vacía solo marca el fin de resultados
+                if pagina > 1 and response.status_code != 200:
+                    break
                 
-                return []
-            
-            for i, container in enumerate(job_containers[:max_results]):
-                try:
-                    # Extraer información del trabajo
-                    title_elem = container.select_one(selectors['title'])
-                    company_elem = container.select_one(selectors['company']) 
-                    desc_elem = container.select_one(selectors['description'])
-                    salary_elem = container.select_one(selectors.get('salary', ''))
-                    location_elem = container.select_one(selectors.get('location', ''))
-                    
-                    # Limpiar y extraer texto
-                    title = title_elem.get_text(strip=True) if title_elem else "Sin título"
-                    company = company_elem.get_text(strip=True) if company_elem else "Empresa confidencial"
-                    description = desc_elem.get_text(strip=True) if desc_elem else ""
-                    salary = salary_elem.get_text(strip=True) if salary_elem else ""
-                    job_location = location_elem.get_text(strip=True) if location_elem else location
-                    
-                    # Limpiar datos
-                    title = self.limpiar_texto(title)
-                    company = self.limpiar_texto(company)
-                    description = self.limpiar_texto(description)[:500]  # Limitar descripción
+                # Verificar respuesta
+                if response.status_code == 403:
+                    print(f"   ❌ 403 Forbidden - {portal_name} bloquea scraping")
+                    logging.warning(f"{portal_name} bloquea scraping: 403 Forbidden")
+                    return
+                elif response.status_code == 404:
+                    print(f"   ❌ 404 Not Found - URL incorrecta para {portal_name}")
+                    logging.warning(f"{portal_name} URL incorrecta: 404")
+                    return
+                elif response.status_code != 200:
+                    print(f"   ❌ Error {response.status_code} - {portal_name}")
+                    logging.warning(f"{portal_name} error HTTP: {response.status_code}")
+                    return
+                
+                # Verificar que el contenido no esté vacío
+                if len(response.content) < 1000:
+                    print(f"   ⚠️ Respuesta muy pequeña de {portal_name} - posible problema")
+                    logging.warning(f"{portal_name} respuesta pequeña: {len(response.content)} bytes")
+                
+                response.raise_for_status()
+                
+                # Parsear HTML (solo los contenedores de trabajos cuando es posible)
+                extractor = self.obtener_extractor(portal_name)
+                job_containers = extractor.contenedores(response.content)
+                
+                # DEBUG: Mostrar información sobre el HTML recibido
+                print(f"   🔍 HTML recibido: {len(response.content)} bytes")
+                print(f"   🎯 Selector usado: '{extractor.selector_contenedor}' ({extractor.backend})")
+                print(f"   📦 Contenedores encontrados: {len(job_containers)}")
+                
+                if len(job_containers) == 0 and pagina > 1:
+                    break
+                
+                # Si no encuentra trabajos, hacer debug más detallado
+                if len(job_containers) == 0:
+                    print(f"   🚨 DEBUG: No se encontraron contenedores con selector '{extractor.selector_contenedor}'")
                     
-                    # Filtrar trabajos spam
-                    if self.es_trabajo_spam(title, company, description):
-                        continue
+                    # El debug necesita el documento completo
+                    soup = BeautifulSoup(response.content, 'html.parser')
                     
-                    job_data = {
-                        'portal': portal_name,
-                        'title': title,
-                        'company': company,
-                        'description': description,
-                        'salary': salary,
-                        'location': job_location,
-                        'url': search_url,
-                        'scraped_at': datetime.now().isoformat()
-                    }
+                    # Mostrar algunos selectores comunes para debug
+                    common_selectors = ['.job', '.aviso', '.offer', '.resultado', '.listado', '.item', 
+                                      '[data-job]', '.trabajo', '.empleo', '.card']
                     
-                    jobs.append(job_data)
+                    for sel in common_selectors:
+                        found = soup.select(sel)
+                        if len(found) > 0:
+                            print(f"   💡 Selector alternativo '{sel}': {len(found)} elementos")
+                            
+                    # Mostrar parte del HTML para debug manual
+                    print(f"   📄 Primeros 500 chars del HTML:")
+                    print(f"   {str(soup)[:500]}...")
                     
-                except Exception as e:
-                    logging.warning(f"Error procesando trabajo {i} de {portal_name}: {e}")
-                    continue
-            
-            print(f"✅ {portal_name}: {len(jobs)} trabajos encontrados")
+                    return
+                
+                trabajos_pagina = [
+                    job_data for job_data in (
+                        self.extraer_trabajo(extractor, container, portal_name, page_url, location, i)
+                        for i, container in enumerate(job_containers)
+                    )
+                    if job_data is not None
+                ]
+                
+                # Descartar temprano lo que ya se vio en corridas anteriores
+                if incremental:
+                    nuevos = self.filtrar_trabajos_vistos(trabajos_pagina)
+                    if trabajos_pagina and not nuevos:
+                        print(f"   ⏭️ Página {pagina} ya conocida - fin de la búsqueda incremental")
+                        break
+                else:
+                    nuevos = trabajos_pagina
+                
+                # No se marcan como vistos acá: el yield solo los entrega a la cola de
+                # _stream_busquedas; guardar_trabajos_csv los registra al escribirlos
+                for job_data in nuevos[:max_resultados - emitidos]:
+                    yield job_data
+                    emitidos += 1
+                
+                if emitidos >= max_resultados:
+                    break
             
-            # Delay entre requests para ser respetuosos
-            delay = self.config['scraping_config']['delay_between_requests']
-            if delay > 0:
-                time.sleep(delay)
+            print(f"✅ {portal_name}: {emitidos} trabajos encontrados")
                 
         except requests.exceptions.RequestException as e:
             print(f"❌ Error de red scrapeando {portal_name}: {e}")
@@ -852,8 +2874,262 @@ class GeneradorCVInteligente:
         except Exception as e:
             print(f"❌ Error inesperado scrapeando {portal_name}: {e}")
             logging.error(f"Error inesperado en {portal_name}: {e}")
+
+    def extraer_trabajo(self, extractor: ExtractorPortal, container, portal_name: str,
+                        url: str, location: str, indice: int) -> Optional[Dict[str, str]]:
+        """Arma el registro de un trabajo desde su contenedor (None si es spam o falla)"""
+        try:
+            # Extraer información del trabajo con los selectores precompilados
+            title = extractor.texto(container, 'title') or "Sin título"
+            company = extractor.texto(container, 'company') or "Empresa confidencial"
+            description = extractor.texto(container, 'description') or ""
+            salary = extractor.texto(container, 'salary') or ""
+            job_location = extractor.texto(container, 'location') or location
+            
+            # Limpiar datos
+            title = self.limpiar_texto(title)
+            company = self.limpiar_texto(company)
+            description = self.limpiar_texto(description)[:500]  # Limitar descripción
+            
+            # Filtrar trabajos spam
+            if self.es_trabajo_spam(title, company, description):
+                return None
+            
+            return {
+                'portal': portal_name,
+                'title': title,
+                'company': company,
+                'description': description,
+                'salary': salary,
+                'location': job_location,
+                'url': url,
+                'scraped_at': datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            logging.warning(f"Error procesando trabajo {indice} de {portal_name}: {e}")
+            return None
+
+    def clave_trabajo(self, trabajo: Dict[str, str]) -> str:
+        """Hash estable de título + empresa (misma clave que el dedup en memoria)"""
+        key = f"{trabajo['title']}_{trabajo['company']}".lower()
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def filtrar_trabajos_vistos(self, trabajos: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Devuelve solo los trabajos que no están en trabajos_vistos
+        
+        A los ya conocidos se les actualiza ultima_vez.
+        """
+        if not trabajos:
+            return []
+        
+        claves = [self.clave_trabajo(t) for t in trabajos]
+        try:
+            with self.db.usar() as conn:
+                cursor = conn.cursor()
+                
+                placeholders = ', '.join('?' * len(claves))
+                cursor.execute(f'SELECT clave FROM trabajos_vistos WHERE clave IN ({placeholders})', claves)
+                conocidas = {row[0] for row in cursor.fetchall()}
+                
+                if conocidas:
+                    ahora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    cursor.executemany('UPDATE trabajos_vistos SET ultima_vez = ? WHERE clave = ?',
+                                       [(ahora, clave) for clave in conocidas])
+        except Exception as e:
+            logging.error(f"Error consultando trabajos vistos: {e}")
+            return trabajos
+        
+        return [t for t, clave in zip(trabajos, claves) if clave not in conocidas]
+
+    def registrar_trabajos_vistos(self, trabajos: List[Dict[str, str]]):
+        """Agrega los trabajos al índice persistente de trabajos vistos"""
+        if not trabajos:
+            return
+        
+        ahora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with self.db.usar() as conn:
+                cursor = conn.cursor()
+                cursor.executemany('''
+                    INSERT INTO trabajos_vistos (clave, portal, title, company, primera_vez, ultima_vez)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(clave) DO UPDATE SET ultima_vez = excluded.ultima_vez
+                ''', [
+                    (self.clave_trabajo(t), t['portal'], t['title'], t['company'], ahora, ahora)
+                    for t in trabajos
+                ])
+        except Exception as e:
+            logging.error(f"Error registrando trabajos vistos: {e}")
+
+    def obtener_indice_duplicados(self, contexto: str) -> IndiceSimHash:
+        """Índice SimHash del contexto, cargado desde la base la primera vez"""
+        indice = self._indices_duplicados.get(contexto)
+        if indice is None:
+            config_dup = self.config.get('deteccion_duplicados', {})
+            indice = IndiceSimHash(config_dup.get('distancia_maxima', 6))
+            try:
+                with self.db.usar() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute('SELECT clave, simhash FROM huellas_trabajos WHERE contexto = ?', (contexto,))
+                    for clave, simhash in cursor.fetchall():
+                        indice.agregar(int(simhash, 16), clave)
+            except Exception as e:
+                logging.error(f"Error cargando huellas de {contexto}: {e}")
+            self._indices_duplicados[contexto] = indice
+            logging.info(f"Índice de casi-duplicados '{contexto}': {indice.total} huellas")
+        return indice
+
+    def buscar_casi_duplicado(self, contexto: str, texto: str, clave: str, registrar: bool = True,
+                              excluir_propia: bool = True, persistir: bool = True,
+                              huella: Optional[int] = None) -> Optional[str]:
+        """Devuelve la clave del aviso casi idéntico ya visto en el contexto, o None
+        
+        Si no hay duplicado y registrar es True, la huella se agrega al índice
+        y (salvo persistir=False) se persiste para corridas futuras. Con excluir_propia,
+        la huella guardada bajo la misma clave (el mismo aviso visto en otra corrida)
+        no cuenta. huella evita recalcularla si el llamador ya la tiene.
+        """
+        if not self.deteccion_duplicados_activa():
+            return None
+        
+        if huella is None:
+            huella = IndiceSimHash.calcular(texto)
+        with self._duplicados_lock:
+            indice = self.obtener_indice_duplicados(contexto)
+            original = indice.buscar(huella, excluir=clave if excluir_propia else None)
+            if original is not None or not registrar:
+                return original
+            indice.agregar(huella, clave)
+        
+        if persistir:
+            self.registrar_huella(contexto, clave, huella)
+        return None
+
+    def deteccion_duplicados_activa(self) -> bool:
+        return self.config.get('deteccion_duplicados', {}).get('enabled', False)
+
+    def olvidar_huella(self, contexto: str, clave: str, huella: int):
+        """Saca del índice en memoria una huella registrada con persistir=False"""
+        with self._duplicados_lock:
+            indice = self._indices_duplicados.get(contexto)
+            if indice is not None:
+                indice.quitar(huella, clave)
+
+    def registrar_huella(self, contexto: str, clave: str, huella: int):
+        try:
+            with self.db.usar() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO huellas_trabajos (contexto, clave, simhash, fecha) VALUES (?, ?, ?, ?)',
+                    (contexto, clave, f"{huella:016x}", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+                )
+        except Exception as e:
+            logging.error(f"Error guardando huella de {contexto}: {e}")
+
+    def texto_huella_trabajo(self, trabajo: Dict[str, str]) -> str:
+        return f"{trabajo['title']} {trabajo['company']} {trabajo['description']}"
+
+    def obtener_indice_relevancia(self) -> IndiceBM25:
+        """Índice BM25 de trabajos scrapeados, cargado desde la base la primera vez"""
+        if self._indice_relevancia is None:
+            config_ranking = self.config['scraping_config'].get('ranking', {})
+            indice = IndiceBM25(config_ranking.get('k1', 1.5), config_ranking.get('b', 0.75))
+            try:
+                with self.db.usar() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute('SELECT clave, terminos FROM terminos_trabajos')
+                    for clave, terminos in cursor.fetchall():
+                        indice.agregar(clave, json.loads(terminos))
+            except Exception as e:
+                logging.error(f"Error cargando índice de relevancia: {e}")
+            self._indice_relevancia = indice
+            logging.info(f"Índice de relevancia: {indice.total} trabajos")
+        return self._indice_relevancia
+
+    def terminos_cv_base(self) -> List[str]:
+        """Consulta BM25: términos del CV base"""
+        texto_cv = self.cargar_cv_base()
+        if self._terminos_cv is None or self._terminos_cv[0] != texto_cv:
+            self._terminos_cv = (texto_cv, IndiceBM25.tokenizar(texto_cv))
+        return self._terminos_cv[1]
+
+    def indexar_trabajos_relevancia(self, trabajos: Iterable[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+        """Agrega cada trabajo al índice BM25 a medida que pasa y lo vuelve a entregar
+        
+        Pensado para envolver el stream de iterar_trabajos_automatico: el índice
+        crece de forma incremental y se persiste de a tandas.
+        """
+        indice = self.obtener_indice_relevancia()
+        pendientes = []
+        try:
+            for trabajo in trabajos:
+                clave = self.clave_trabajo(trabajo)
+                frecuencias = IndiceBM25.frecuencias(self.texto_huella_trabajo(trabajo))
+                indice.agregar(clave, frecuencias)
+                pendientes.append((clave, frecuencias))
+                if len(pendientes) >= 50:
+                    self.guardar_terminos_trabajos(pendientes)
+                    pendientes = []
+                yield trabajo
+        finally:
+            self.guardar_terminos_trabajos(pendientes)
+
+    def guardar_terminos_trabajos(self, documentos: List[Tuple[str, Dict[str, int]]]):
+        if not documentos:
+            return
+        ahora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with self.db.usar() as conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO terminos_trabajos (clave, terminos, fecha) VALUES (?, ?, ?)',
+                    [(clave, json.dumps(frecuencias, ensure_ascii=False), ahora) for clave, frecuencias in documentos]
+                )
+        except Exception as e:
+            logging.error(f"Error guardando índice de relevancia: {e}")
+
+    def rankear_trabajos(self, trabajos: Iterable[Dict[str, str]], top_k: Optional[int] = None) -> List[Dict[str, str]]:
+        """Ordena los trabajos por relevancia BM25 contra el CV base (los top_k mejores)
+        
+        Cada trabajo se devuelve con el campo 'relevancia'. Los que no estaban
+        indexados se agregan al índice; el IDF usa todo el histórico.
+        """
+        trabajos = list(self.indexar_trabajos_relevancia(trabajos))
+        claves = [self.clave_trabajo(t) for t in trabajos]
+        puntajes = self.obtener_indice_relevancia().puntuar(self.terminos_cv_base(), claves)
+        
+        for trabajo, clave in zip(trabajos, claves):
+            trabajo['relevancia'] = round(puntajes.get(clave, 0.0), 3)
+        # Orden estable: a igual relevancia se respeta el orden original
+        if top_k is None:
+            return sorted(trabajos, key=lambda t: t['relevancia'], reverse=True)
+        return heapq.nlargest(top_k, trabajos, key=lambda t: t['relevancia'])
+
+    def rankear_csv_trabajos(self, csv_path: str, top_k: int) -> str:
+        """Escribe los top_k trabajos de csv_path, de más a menos relevante (mismo formato que la entrada)
         
-        return jobs
+        Los trabajos ya tienen que estar en el índice (indexar_trabajos_relevancia).
+        """
+        filas = list(leer_tabla(csv_path))
+        fieldnames = (list(filas[0]) if filas else ['empresa', 'title']) + ['relevancia']
+        
+        claves = [self.clave_trabajo({'title': f['title'], 'company': f['empresa']}) for f in filas]
+        mejores = self.obtener_indice_relevancia().mejores(self.terminos_cv_base(), top_k, claves)
+        filas_por_clave = {}
+        for fila, clave in zip(filas, claves):
+            filas_por_clave.setdefault(clave, fila)
+        
+        base, extension = os.path.splitext(csv_path)
+        ranking_path = f"{base}_top{top_k}{extension}"
+        with EscritorTabla(ranking_path, fieldnames, {'relevancia': 'float'}) as salida:
+            for clave, puntaje in mejores:
+                salida.escribir(dict(filas_por_clave[clave], relevancia=round(puntaje, 3)))
+        
+        print(f"🏆 Top {len(mejores)} trabajos por relevancia con tu CV: {ranking_path}")
+        for i, (clave, puntaje) in enumerate(mejores[:10], 1):
+            fila = filas_por_clave[clave]
+            print(f"   {i}. [{puntaje:.2f}] {fila['empresa']} - {fila['title']}")
+        logging.info(f"Ranking de relevancia: {ranking_path} ({len(mejores)}/{len(filas)})")
+        return ranking_path
 
     def limpiar_texto(self, texto: str) -> str:
         """Limpia texto extraído del scraping"""
@@ -869,19 +3145,19 @@ class GeneradorCVInteligente:
 
     def es_trabajo_spam(self, title: str, company: str, description: str) -> bool:
         """Detecta trabajos spam o de baja calidad"""
-        texto_completo = f"{title} {company} {description}".lower()
+        title_lower, company_lower = title.lower(), company.lower()
+        texto_completo = f"{title_lower} {company_lower} {description.lower()}"
+        coincidencias = self.buscar_keywords(texto_completo)
         
         # Palabras spam configurables
-        palabras_spam = self.config['scraping_config']['filtros']['palabras_spam']
-        
-        for spam_word in palabras_spam:
-            if spam_word.lower() in texto_completo:
-                return True
+        if coincidencias.alguna(self.config['scraping_config']['filtros']['palabras_spam']):
+            return True
         
-        # Empresas a excluir
-        empresas_excluir = self.config['scraping_config']['filtros']['excluir_empresas']
-        for empresa_spam in empresas_excluir:
-            if empresa_spam.lower() in company.lower():
+        # Empresas a excluir (solo dentro del nombre de la empresa)
+        inicio_empresa = len(title_lower) + 1
+        fin_empresa = inicio_empresa + len(company_lower)
+        for empresa_spam in self.config['scraping_config']['filtros']['excluir_empresas']:
+            if coincidencias.contiene_en_rango(empresa_spam, inicio_empresa, fin_empresa):
                 return True
         
         # Filtros adicionales básicos
@@ -897,51 +3173,165 @@ class GeneradorCVInteligente:
             return []
         
         todos_trabajos = []
-        keywords_area = self.config['scraping_config']['keywords_busqueda'].get(area_busqueda, [area_busqueda])
-        
-        print(f"\n🔍 BÚSQUEDA AUTOMÁTICA DE TRABAJOS")
-        print(f"📍 Área: {area_busqueda}")
-        print(f"🌎 Ubicación: {ubicacion}")
-        print(f"🔑 Keywords: {', '.join(keywords_area)}")
-        print("=" * 50)
+        tareas = self.preparar_busqueda(area_busqueda, ubicacion)
         
-        # Iterar por cada portal habilitado
-        for portal_name, portal_config in self.config['scraping_config']['portales'].items():
-            if not portal_config['enabled']:
-                continue
-                
-            print(f"\n🕷️ Scrapeando {portal_name.upper()}...")
-            
-            # Buscar con cada keyword del área
-            for keyword in keywords_area:
-                try:
-                    jobs = self.scrape_portal(portal_name, keyword, ubicacion)
-                    todos_trabajos.extend(jobs)
-                    
-                    if jobs:
-                        print(f"   └── '{keyword}': {len(jobs)} trabajos")
-                    
-                except Exception as e:
-                    print(f"   └── ❌ Error con '{keyword}': {e}")
-                    logging.error(f"Error buscando {keyword} en {portal_name}: {e}")
+        # Ordenar por tarea (portal × keyword) para un resultado determinista
+        for _, trabajo in sorted(self._stream_busquedas(tareas, ubicacion), key=lambda item: item[0]):
+            todos_trabajos.append(trabajo)
         
         # Eliminar duplicados basados en título + empresa
         trabajos_unicos = []
         seen = set()
         
+        casi_duplicados = 0
+        
         for trabajo in todos_trabajos:
             key = f"{trabajo['title']}_{trabajo['company']}".lower()
             if key not in seen:
                 seen.add(key)
+                # El mismo aviso republicado en otro portal con otro título
+                if self.buscar_casi_duplicado('scraping', self.texto_huella_trabajo(trabajo), self.clave_trabajo(trabajo),
+                                              persistir=False):
+                    casi_duplicados += 1
+                    continue
                 trabajos_unicos.append(trabajo)
         
-        print(f"\n📊 RESUMEN DE BÚSQUEDA:")
-        print(f"   • Total encontrados: {len(todos_trabajos)}")
-        print(f"   • Únicos (sin duplicados): {len(trabajos_unicos)}")
-        print(f"   • Portales consultados: {len([p for p in self.config['scraping_config']['portales'] if self.config['scraping_config']['portales'][p]['enabled']])}")
+        self.mostrar_resumen_busqueda(len(todos_trabajos), len(trabajos_unicos), casi_duplicados)
         
         return trabajos_unicos
 
+    def iterar_trabajos_automatico(self, area_busqueda: str = "qa", ubicacion: str = "Buenos Aires",
+                                   max_total: Optional[int] = None) -> Iterator[Dict[str, str]]:
+        """Versión streaming de buscar_trabajos_automatico
+        
+        Emite cada trabajo único apenas se parsea (en orden de llegada), sin
+        acumular las páginas en memoria. Se detiene al llegar a max_total.
+        """
+        if not self.config['scraping_config']['enabled']:
+            print("🕷️ Web scraping está deshabilitado")
+            return
+        
+        tareas = self.preparar_busqueda(area_busqueda, ubicacion)
+        total = 0
+        unicos = 0
+        casi_duplicados = 0
+        seen = set()
+        
+        busquedas = self._stream_busquedas(tareas, ubicacion)
+        try:
+            for _, trabajo in busquedas:
+                total += 1
+                key = f"{trabajo['title']}_{trabajo['company']}".lower()
+                if key in seen:
+                    continue
+                seen.add(key)
+                if self.buscar_casi_duplicado('scraping', self.texto_huella_trabajo(trabajo), self.clave_trabajo(trabajo),
+                                              persistir=False):
+                    casi_duplicados += 1
+                    continue
+                unicos += 1
+                yield trabajo
+                
+                if max_total is not None and unicos >= max_total:
+                    print(f"🎯 Objetivo de {max_total} trabajos alcanzado")
+                    break
+        finally:
+            busquedas.close()
+            self.mostrar_resumen_busqueda(total, unicos, casi_duplicados)
+
+    def preparar_busqueda(self, area_busqueda: str, ubicacion: str) -> List[Tuple[str, str]]:
+        """Muestra la cabecera de la búsqueda y devuelve las tareas portal × keyword"""
+        keywords_area = self.config['scraping_config']['keywords_busqueda'].get(area_busqueda, [area_busqueda])
+        
+        print(f"\n🔍 BÚSQUEDA AUTOMÁTICA DE TRABAJOS")
+        print(f"📍 Área: {area_busqueda}")
+        print(f"🌎 Ubicación: {ubicacion}")
+        print(f"🔑 Keywords: {', '.join(keywords_area)}")
+        print("=" * 50)
+        
+        # Una tarea por cada combinación portal × keyword habilitada
+        return [
+            (portal_name, keyword)
+            for portal_name, portal_config in self.config['scraping_config']['portales'].items()
+            if portal_config['enabled']
+            for keyword in keywords_area
+        ]
+
+    def _stream_busquedas(self, tareas: List[Tuple[str, str]], ubicacion: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """Ejecuta las tareas en paralelo y emite (índice_tarea, trabajo) a medida que llegan
+        
+        Los hilos publican en una cola acotada (backpressure); si el consumidor
+        deja de iterar, se les avisa para que terminen sin quedar bloqueados.
+        """
+        scraping_config = self.config['scraping_config']
+        max_concurrency = max(1, scraping_config.get('max_concurrency', 4))
+        deadline_segundos = scraping_config.get('deadline_segundos')
+        deadline = time.monotonic() + deadline_segundos if deadline_segundos else None
+        
+        cola: "queue.Queue[Tuple[int, Any]]" = queue.Queue(maxsize=max(10, max_concurrency * 5))
+        cancelado = threading.Event()
+        FIN = object()
+        
+        def publicar(item) -> bool:
+            while not cancelado.is_set():
+                try:
+                    cola.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def ejecutar(indice: int, portal_name: str, keyword: str):
+            emitidos = 0
+            try:
+                for trabajo in self.iterar_trabajos_portal(portal_name, keyword, ubicacion, deadline=deadline):
+                    if not publicar((indice, trabajo)):
+                        return
+                    emitidos += 1
+                if emitidos:
+                    print(f"   └── {portal_name} '{keyword}': {emitidos} trabajos")
+            except Exception as e:
+                print(f"   └── ❌ Error con '{keyword}' en {portal_name}: {e}")
+                logging.error(f"Error buscando {keyword} en {portal_name}: {e}")
+            finally:
+                publicar((indice, FIN))
+        
+        print(f"⚡ {len(tareas)} búsquedas con hasta {max_concurrency} en paralelo")
+        
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        for indice, (portal_name, keyword) in enumerate(tareas):
+            executor.submit(ejecutar, indice, portal_name, keyword)
+        
+        pendientes = len(tareas)
+        try:
+            while pendientes > 0:
+                timeout = deadline - time.monotonic() if deadline else None
+                try:
+                    if timeout is not None and timeout <= 0:
+                        raise queue.Empty
+                    indice, item = cola.get(timeout=timeout)
+                except queue.Empty:
+                    print(f"⏱️ Deadline de {deadline_segundos}s alcanzado - {pendientes} búsquedas sin completar")
+                    logging.warning(f"Deadline de scraping alcanzado con {pendientes} búsquedas pendientes")
+                    break
+                
+                if item is FIN:
+                    pendientes -= 1
+                else:
+                    yield indice, item
+        finally:
+            cancelado.set()
+            executor.shutdown(wait=False)
+
+    def mostrar_resumen_busqueda(self, total: int, unicos: int, casi_duplicados: int = 0):
+        portales = self.config['scraping_config']['portales']
+        print(f"\n📊 RESUMEN DE BÚSQUEDA:")
+        print(f"   • Total encontrados: {total}")
+        print(f"   • Únicos (sin duplicados): {unicos}")
+        if casi_duplicados:
+            print(f"   • Casi-duplicados descartados: {casi_duplicados}")
+        print(f"   • Portales consultados: {len([p for p in portales if portales[p]['enabled']])}")
+
     def test_portales(self) -> Dict[str, bool]:
         """Testa la conectividad de todos los portales configurados"""
         print("\n🧪 TESTING DE PORTALES")
@@ -961,7 +3351,8 @@ class GeneradorCVInteligente:
                 base_url = portal_config['base_url']
                 print(f"🌐 Testing {portal_name}: {base_url}")
                 
-                response = requests.get(base_url, headers=headers, timeout=10)
+                sesion = self.obtener_sesion(portal_name)
+                response = sesion.get(base_url, headers=headers, timeout=10)
                 
                 if response.status_code == 200:
                     print(f"   ✅ Base OK ({response.status_code})")
@@ -976,7 +3367,7 @@ class GeneradorCVInteligente:
                         )
                     
                     print(f"   🔍 Testing búsqueda: {search_url}")
-                    search_response = requests.get(search_url, headers=headers, timeout=10)
+                    search_response = sesion.get(search_url, headers=headers, timeout=10)
                     
                     if search_response.status_code == 200:
                         print(f"   ✅ Búsqueda OK ({search_response.status_code}) - {len(search_response.content)} bytes")
@@ -1030,8 +3421,8 @@ class GeneradorCVInteligente:
             print(f"🔍 DEBUG HTML de {portal_name.upper()}")
             print(f"📍 URL: {search_url}")
             
-            # Realizar request
-            response = requests.get(search_url, headers=headers, timeout=15)
+            # Realizar request (sin cache: el debug siempre mira el HTML actual)
+            response = self.obtener_sesion(portal_name).get(search_url, headers=headers, timeout=15)
             print(f"📊 Status Code: {response.status_code}")
             print(f"📦 Tamaño: {len(response.content)} bytes")
             
@@ -1162,27 +3553,32 @@ class GeneradorCVInteligente:
             print(f"❌ Error en debug: {e}")
             return ""
 
-    def guardar_trabajos_csv(self, trabajos: List[Dict[str, str]], filename: str = None) -> str:
-        """Guarda trabajos encontrados en CSV para procesamiento batch"""
-        if not trabajos:
-            print("❌ No hay trabajos para guardar")
-            return ""
-        
+    def guardar_trabajos_csv(self, trabajos: Iterable[Dict[str, str]], filename: str = None) -> str:
+        """Guarda trabajos encontrados para procesamiento batch
+        
+        Acepta una lista o un generador (p.ej. iterar_trabajos_automatico):
+        las filas se escriben a medida que llegan. El formato sale de la
+        extensión de filename o de scraping_config.formato_trabajos (csv, jsonl, parquet).
+        Con solo_trabajos_nuevos, los trabajos escritos se registran en trabajos_vistos,
+        y con deteccion_duplicados se persisten sus huellas.
+        """
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"trabajos_encontrados_{timestamp}.csv"
+            formato = self.config['scraping_config'].get('formato_trabajos', 'csv')
+            filename = f"trabajos_encontrados_{timestamp}.{formato}"
         
         filepath = os.path.join(self.carpeta_salida, filename)
+        total = 0
+        registrar = (self.config['scraping_config'].get('solo_trabajos_nuevos', False)
+                     or self.deteccion_duplicados_activa())
+        guardados = []
         
         try:
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['empresa', 'descripcion', 'portal', 'title', 'salary', 'location', 'url', 'scraped_at']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
+            fieldnames = ['empresa', 'descripcion', 'portal', 'title', 'salary', 'location', 'url', 'scraped_at']
+            with EscritorTabla(filepath, fieldnames) as salida:
                 for trabajo in trabajos:
                     # Adaptar formato para el procesador batch existente
-                    writer.writerow({
+                    salida.escribir({
                         'empresa': trabajo['company'],
                         'descripcion': f"{trabajo['title']} - {trabajo['description']}",
                         'portal': trabajo['portal'],
@@ -1192,26 +3588,89 @@ class GeneradorCVInteligente:
                         'url': trabajo['url'],
                         'scraped_at': trabajo['scraped_at']
                     })
+                    total += 1
+                    # Recién ahora el trabajo cuenta como visto (y su huella como conocida)
+                    if registrar:
+                        guardados.append(trabajo)
+                        if len(guardados) >= 50:
+                            self.registrar_trabajos_guardados(guardados)
+                            guardados = []
+            
+            if total == 0:
+                os.remove(filepath)
+                print("❌ No hay trabajos para guardar")
+                return ""
             
-            print(f"💾 Trabajos guardados en: {filepath}")
-            logging.info(f"Trabajos guardados: {filepath}")
+            print(f"💾 {total} trabajos guardados en: {filepath}")
+            logging.info(f"Trabajos guardados: {filepath} ({total})")
             return filepath
             
         except Exception as e:
-            print(f"❌ Error guardando CSV: {e}")
+            print(f"❌ Error guardando trabajos: {e}")
             logging.error(f"Error guardando trabajos CSV: {e}")
             return ""
+        finally:
+            self.registrar_trabajos_guardados(guardados)
+
+    def registrar_trabajos_guardados(self, trabajos: List[Dict[str, str]]):
+        """Persiste lo que el scraping solo tenía en memoria: trabajos vistos y huellas de casi-duplicados"""
+        if not trabajos:
+            return
+        if self.config['scraping_config'].get('solo_trabajos_nuevos', False):
+            self.registrar_trabajos_vistos(trabajos)
+        if self.deteccion_duplicados_activa():
+            with self.db.lote():
+                for trabajo in trabajos:
+                    self.registrar_huella('scraping', self.clave_trabajo(trabajo),
+                                          IndiceSimHash.calcular(self.texto_huella_trabajo(trabajo)))
+
+    def construir_automata_keywords(self) -> AutomataKeywords:
+        """Compila en un solo autómata todos los vocabularios que usan los detectores"""
+        filtros = self.config['scraping_config']['filtros']
+        vocabularios: Dict[str, Iterable[str]] = {
+            'no_conocidas': self.config['tecnologias_no_conocidas'],
+            'qa_general': self.KEYWORDS_QA_GENERAL,
+            'desarrollo_general': self.KEYWORDS_DESARROLLO_GENERAL,
+            'generales': self.KEYWORDS_GENERALES,
+            'spam': filtros['palabras_spam'],
+            'excluir_empresas': filtros['excluir_empresas']
+        }
+        for categoria, keywords in self.perfil_tecnico.items():
+            vocabularios[f'perfil:{categoria}'] = keywords
+        for tipo, keywords in self.KEYWORDS_TIPO_POSICION.items():
+            vocabularios[f'tipo:{tipo}'] = keywords
+        vocabularios['reglas_tipo_posicion'] = self.reglas_tipo_posicion.vocabulario()
+        for nivel, keywords in self.KEYWORDS_SENIORITY.items():
+            vocabularios[f'seniority:{nivel}'] = keywords
+        for tipo_empresa, config in self.config['templates_empresa'].items():
+            vocabularios[f'empresa:{tipo_empresa}'] = config['keywords']
+        for tecnologia, keywords in self.TECNOLOGIAS_PRINCIPALES.items():
+            vocabularios[f'tecnologia:{tecnologia}'] = keywords
+        
+        return AutomataKeywords(vocabularios)
 
-    def detectar_tipo_empresa(self, texto_postulacion: str, empresa: str) -> str:
+    def buscar_keywords(self, texto: str, extra: Optional[str] = None) -> CoincidenciasKeywords:
+        """Escanea el texto una vez con el autómata compartido"""
+        return self.automata_keywords.buscar(texto, extra)
+
+    def crear_contexto(self, texto_postulacion: str, empresa: str = "") -> ContextoAnalisis:
+        """Normaliza, tokeniza y escanea la postulación una sola vez para todos los detectores"""
+        return ContextoAnalisis(texto_postulacion, empresa, self.automata_keywords)
+
+    def _como_contexto(self, contexto) -> ContextoAnalisis:
+        # Los detectores también aceptan texto plano por comodidad
+        return contexto if isinstance(contexto, ContextoAnalisis) else self.crear_contexto(contexto)
+
+    def detectar_tipo_empresa(self, contexto: ContextoAnalisis) -> str:
         """Detecta el tipo de empresa basado en la postulación y nombre"""
-        texto = (texto_postulacion + " " + empresa).lower()
+        coincidencias = contexto.coincidencias
         
         puntuaciones = {}
         
         for tipo_empresa, config in self.config['templates_empresa'].items():
             puntuacion = 0
             for keyword in config['keywords']:
-                if keyword in texto:
+                if coincidencias.contiene_en_todo(keyword):
                     puntuacion += 1
             puntuaciones[tipo_empresa] = puntuacion
         
@@ -1227,79 +3686,39 @@ class GeneradorCVInteligente:
     def cargar_cv_base(self):
         """Carga el CV base desde archivo Word"""
         try:
-            doc = Document(self.cv_base_path)
-            return "\n".join([p.text for p in doc.paragraphs if p.text.strip() != ""])
+            return self.cache_cv_base.obtener()['texto']
         except Exception as e:
             print(f"Error cargando CV base: {e}")
             return ""
 
-    def detectar_tipo_posicion(self, texto_postulacion):
+    def detectar_tipo_posicion(self, contexto: ContextoAnalisis):
         """Detecta el tipo de posición y nivel basado en el texto de la postulación"""
-        texto = texto_postulacion.lower()
-        
-        # Contadores para cada tipo (solo áreas donde tenemos experiencia)
-        puntos = {
-            'qa_automatizacion': 0,
-            'qa_manual': 0,
-            'desarrollador_python': 0,
-            'desarrollador_java': 0,
-            'desarrollador_frontend': 0,
-            'desarrollador_fullstack': 0
-        }
+        contexto = self._como_contexto(contexto)
+        coincidencias = contexto.coincidencias
         
-        # Palabras clave para QA Automatización
-        if any(kw in texto for kw in ['automatización', 'selenium', 'automatizador', 'automation', 'locust', 'cypress']):
-            puntos['qa_automatizacion'] += 3
-        
-        # Palabras clave para QA Manual
-        if any(kw in texto for kw in ['qa funcional', 'testing funcional', 'qa manual', 'casos de prueba']):
-            puntos['qa_manual'] += 3
-            
         # Primero verificar si hay tecnologías que NO conocemos
-        tecnologias_no_conocidas = self.config['tecnologias_no_conocidas']
+        tecnologias_no_conocidas = coincidencias.presentes(self.config['tecnologias_no_conocidas'])
         
-        if any(tech in texto for tech in tecnologias_no_conocidas):
-            print(f">>> 🚫 Tecnologías detectadas fuera de nuestro perfil: {[tech for tech in tecnologias_no_conocidas if tech in texto]}")
+        if tecnologias_no_conocidas:
+            print(f">>> 🚫 Tecnologías detectadas fuera de nuestro perfil: {tecnologias_no_conocidas}")
             return None, None
         
-        # Palabras clave para Python (más específicas)
-        if any(kw in texto for kw in ['python', 'django', 'flask', 'fastapi', 'pandas', 'numpy']):
-            puntos['desarrollador_python'] += 3
-            
-        # Palabras clave para Java
-        if any(kw in texto for kw in ['java', 'spring', 'spring boot', 'hibernate']):
-            puntos['desarrollador_java'] += 3
-            
-        # Palabras clave para Frontend
-        if any(kw in texto for kw in ['vue.js', 'vue', 'angular', 'frontend', 'front-end', 'javascript', 'typescript']):
-            puntos['desarrollador_frontend'] += 3
-            
-        # Palabras clave para Full Stack
-        if any(kw in texto for kw in ['full stack', 'fullstack', 'full-stack']):
-            puntos['desarrollador_fullstack'] += 3
+        # Puntos por tipo desde la tabla compilada de reglas_tipo_posicion
+        puntos, sin_tecnologia = self.reglas_tipo_posicion.puntuar(coincidencias)
         
-        # Palabras generales QA
-        if any(kw in texto for kw in ['qa', 'testing', 'pruebas', 'quality assurance']):
-            puntos['qa_automatizacion'] += 1
-            puntos['qa_manual'] += 1
-            
-        # Palabras generales desarrollo (solo si no hay tecnologías específicas detectadas)
-        palabras_desarrollo_general = ['desarrollador', 'developer', 'programador']
-        if any(kw in texto for kw in palabras_desarrollo_general):
-            # Solo asignar puntos generales si ya hay alguna tecnología específica detectada
-            if max(puntos.values()) > 0:
-                for tipo in puntos:
-                    if puntos[tipo] > 0:
-                        puntos[tipo] += 1
-            else:
-                # Si no hay tecnologías específicas, no asignar puntos automáticamente
-                print(">>> ⚠️ Menciona 'desarrollador' pero sin tecnologías específicas de nuestro perfil")
-                pass
+        if self.config.get('reglas_tipo_posicion', {}).get('modo_regresion', False):
+            puntos_legacy = self.puntos_tipo_posicion_legacy(coincidencias)
+            if puntos_legacy != puntos:
+                logging.warning(f"Regresión en reglas_tipo_posicion: tabla={puntos} legacy={puntos_legacy}")
+        
+        if sin_tecnologia:
+            # Si no hay tecnologías específicas, no asignar puntos automáticamente
+            print(">>> ⚠️ Menciona 'desarrollador' pero sin tecnologías específicas de nuestro perfil")
         
         # Si no detecta nada de nuestras categorías, rechazar automáticamente
         if max(puntos.values()) == 0:
             print(f">>> 🚫 POSICIÓN FUERA DE NUESTRAS ÁREAS DE EXPERIENCIA")
-            print(f">>> Texto analizado: {texto[:200]}...")
+            print(f">>> Texto analizado: {contexto.texto[:200]}...")
             print(f">>> Solo aplicamos a: QA, Python, Java, Frontend, Full Stack")
             return None, None
         
@@ -1310,44 +3729,65 @@ class GeneradorCVInteligente:
         print(f">>> Detección: {tipo_base} (puntos: {max_puntos})")
         
         # Detectar nivel de seniority
-        nivel = self.detectar_nivel_seniority(texto)
+        nivel = self.detectar_nivel_seniority(contexto)
         
         return tipo_base, nivel
+
+    def puntos_tipo_posicion_legacy(self, coincidencias: CoincidenciasKeywords) -> Dict[str, int]:
+        """Cadena de reglas original (constantes de clase), para el modo regresión"""
+        # Contadores para cada tipo (solo áreas donde tenemos experiencia)
+        puntos = {tipo: 0 for tipo in self.KEYWORDS_TIPO_POSICION}
+        
+        for tipo, keywords in self.KEYWORDS_TIPO_POSICION.items():
+            if coincidencias.alguna(keywords):
+                puntos[tipo] += 3
+        
+        # Palabras generales QA
+        if coincidencias.alguna(self.KEYWORDS_QA_GENERAL):
+            puntos['qa_automatizacion'] += 1
+            puntos['qa_manual'] += 1
+            
+        # Palabras generales desarrollo: solo si ya hay alguna tecnología específica detectada
+        if coincidencias.alguna(self.KEYWORDS_DESARROLLO_GENERAL) and max(puntos.values()) > 0:
+            for tipo in puntos:
+                if puntos[tipo] > 0:
+                    puntos[tipo] += 1
+        
+        return puntos
+
+    @classmethod
+    def reglas_tipo_posicion_por_defecto(cls) -> Dict[str, Any]:
+        """Spec equivalente a las constantes de clase (si config.json no trae reglas_tipo_posicion)"""
+        reglas = [{'keywords': keywords, 'puntos': {tipo: 3}} for tipo, keywords in cls.KEYWORDS_TIPO_POSICION.items()]
+        reglas.append({'keywords': cls.KEYWORDS_QA_GENERAL, 'puntos': {'qa_automatizacion': 1, 'qa_manual': 1}})
+        return {
+            'tipos': list(cls.KEYWORDS_TIPO_POSICION),
+            'reglas': reglas,
+            'bono_desarrollo_general': {'keywords': cls.KEYWORDS_DESARROLLO_GENERAL, 'puntos': 1}
+        }
     
-    def detectar_nivel_seniority(self, texto):
+    def detectar_nivel_seniority(self, contexto: ContextoAnalisis):
         """Detecta el nivel de seniority requerido"""
-        texto_lower = texto.lower()
+        coincidencias = self._como_contexto(contexto).coincidencias
         
         # Primero detectar SSR y variantes específicas de semi-senior
-        if any(kw in texto_lower for kw in ['ssr', 'semi senior', 'semi-senior', 'advance', 'intermedio']):
-            return 'semi_senior'
-        elif any(kw in texto_lower for kw in ['junior', 'jr', 'trainee', 'entry level', 'sin experiencia']):
-            return 'junior'
-        elif any(kw in texto_lower for kw in ['senior', ' sr ', 'lead', 'líder', 'tech lead']):
-            return 'senior'
-        else:
-            return 'semi_senior'  # Default
+        for nivel, keywords in self.KEYWORDS_SENIORITY.items():
+            if coincidencias.alguna(keywords):
+                return nivel
+        return 'semi_senior'  # Default
 
-    def extraer_keywords_avanzado(self, texto_postulacion):
+    def extraer_keywords_avanzado(self, contexto: ContextoAnalisis):
         """Extrae keywords relevantes de la postulación"""
-        texto = texto_postulacion.lower()
+        coincidencias = self._como_contexto(contexto).coincidencias
         keywords_encontradas = []
         
         # Buscar en todas las categorías
         for categoria, keywords in self.perfil_tecnico.items():
-            for kw in keywords:
-                if kw in texto:
-                    keywords_encontradas.append(kw)
+            keywords_encontradas.extend(coincidencias.presentes(keywords))
         
         # Si no encuentra nada, buscar palabras más generales
         if not keywords_encontradas:
-            palabras_generales = ['qa', 'testing', 'pruebas', 'developer', 'desarrollador', 
-                                'programador', 'java', 'python', 'sql', 'api', 'web', 
-                                'frontend', 'backend', 'full stack', 'scrum', 'agile']
-            
-            for palabra in palabras_generales:
-                if palabra in texto:
-                    keywords_encontradas.append(palabra)
+            keywords_encontradas = coincidencias.presentes(self.KEYWORDS_GENERALES)
         
         if not keywords_encontradas:
             print(">>> ⚠️  No se detectaron keywords específicas - usando tipo por defecto")
@@ -1403,43 +3843,22 @@ class GeneradorCVInteligente:
     
     def generar_analisis_fit(self, keywords_postulacion, tipo_posicion, nivel, empresa):
         """Genera análisis automático de fit entre CV y postulación"""
-        
-        # Keywords que tenemos en nuestro CV (basado en tu experiencia real)
-        nuestras_fortalezas = ['python', 'fastapi', 'postgresql', 'vue', 'quasar', 'next.js', 
-                              'locust', 'postman', 'qa', 'manual', 'testing', 'scrum', 'kanban', 'git',
-                              'javascript', 'sql', 'api', 'rest', 'agile', 'full stack', 'desarrollador', 
-                              'angular', 'webservices', 'selenium', 'automatización', 'automation',
-                              'frontend', 'backend', 'casos de prueba', 'validaciones', 'metodologías']
+        nuestras_fortalezas = self.FORTALEZAS_CV
         
         coincidencias = []
-        brechas = []
         
         # Analizar coincidencias
         for kw in keywords_postulacion:
             if kw in nuestras_fortalezas:
                 coincidencias.append(kw)
         
-        # Detectar brechas específicas
-        if 'java' in keywords_postulacion and tipo_posicion == 'desarrollador_java':
-            if nivel == 'senior':
-                brechas.append("Java Senior requiere más experiencia - experiencia principal en Python")
-            elif nivel == 'semi_senior':
-                # Para SSR, solo mencionar como área de crecimiento, no como brecha bloqueante
-                if len(coincidencias) < 3:
-                    brechas.append("Java SSR - aprovechar experiencia backend transferible desde Python")
-        
-        if any(kw in keywords_postulacion for kw in ['code review', 'git flow', 'deploy']):
-            if not any(kw in nuestras_fortalezas for kw in ['git', 'github']):
-                brechas.append("Falta experiencia explícita en Git Flow/Code Review")
-        
-        if nivel == 'senior' and len(coincidencias) < 3:
-            brechas.append("Puede requerir más experiencia para nivel Senior")
+        brechas = self.detectar_brechas_fit(keywords_postulacion, tipo_posicion, nivel, len(coincidencias))
         
         # Calcular porcentaje de fit mejorado
         if not keywords_postulacion:
             # Si no hay keywords detectadas, usar heurística basada en tipo de posición
             fit_percentage = 60  # Base mínima
-            if tipo_posicion in ['qa_manual', 'qa_automatizacion']:
+            if tipo_posicion in self.TIPOS_QA:
                 fit_percentage = 75  # Tenemos experiencia sólida en QA
             elif tipo_posicion == 'desarrollador_python':
                 fit_percentage = 85  # Nuestra fortaleza principal
@@ -1448,17 +3867,14 @@ class GeneradorCVInteligente:
             coincidencias_count = len(coincidencias)
             
             # Para QA, usar lógica especial porque es nuestra fortaleza
-            if tipo_posicion in ['qa_manual', 'qa_automatizacion']:
+            if tipo_posicion in self.TIPOS_QA:
                 # Base alta para QA porque es nuestra experiencia
                 base_percentage = 65
                 
                 # Bonificaciones específicas para QA
-                if any(kw in coincidencias for kw in ['qa', 'testing', 'automatización', 'selenium']):
-                    base_percentage += 15
-                if any(kw in coincidencias for kw in ['sql', 'api', 'rest']):
-                    base_percentage += 10
-                if any(kw in coincidencias for kw in ['git', 'scrum', 'agile']):
-                    base_percentage += 5
+                for keywords_bono, puntos in self.BONOS_FIT_QA:
+                    if any(kw in coincidencias for kw in keywords_bono):
+                        base_percentage += puntos
                     
                 # Si tiene Java pero es QA, no penalizar tanto
                 if 'java' in keywords_postulacion and tipo_posicion == 'qa_automatizacion':
@@ -1475,12 +3891,9 @@ class GeneradorCVInteligente:
                     base_percentage = max(base_percentage, 50)  # Base mínima para Java
                     
                     # Bonificaciones para Java
-                    if any(kw in coincidencias for kw in ['sql', 'base de datos']):
-                        base_percentage += 10  # Tenemos experiencia SQL
-                    if any(kw in coincidencias for kw in ['api', 'rest']):
-                        base_percentage += 10  # Experiencia en APIs
-                    if any(kw in coincidencias for kw in ['scrum', 'ágiles', 'agile']):
-                        base_percentage += 5   # Metodologías ágiles
+                    for keywords_bono, puntos in self.BONOS_FIT_JAVA:
+                        if any(kw in coincidencias for kw in keywords_bono):
+                            base_percentage += puntos
                     if 'java' in keywords_postulacion:
                         base_percentage += 5   # Bonus por mencionar Java específicamente
             
@@ -1492,7 +3905,112 @@ class GeneradorCVInteligente:
             'brechas': brechas,
             'recomendaciones': self.generar_recomendaciones(tipo_posicion, nivel, brechas)
         }
-    
+
+    def detectar_brechas_fit(self, keywords_postulacion, tipo_posicion, nivel, coincidencias_count):
+        """Brechas entre la postulación y el CV (compartido por el análisis individual y por lotes)"""
+        brechas = []
+        
+        if 'java' in keywords_postulacion and tipo_posicion == 'desarrollador_java':
+            if nivel == 'senior':
+                brechas.append("Java Senior requiere más experiencia - experiencia principal en Python")
+            elif nivel == 'semi_senior':
+                # Para SSR, solo mencionar como área de crecimiento, no como brecha bloqueante
+                if coincidencias_count < 3:
+                    brechas.append("Java SSR - aprovechar experiencia backend transferible desde Python")
+        
+        if any(kw in keywords_postulacion for kw in self.KEYWORDS_BRECHA_GIT):
+            if not any(kw in self.FORTALEZAS_CV for kw in ['git', 'github']):
+                brechas.append("Falta experiencia explícita en Git Flow/Code Review")
+        
+        if nivel == 'senior' and coincidencias_count < 3:
+            brechas.append("Puede requerir más experiencia para nivel Senior")
+        
+        return brechas
+
+    def calcular_fit_lote(self, postulaciones: List[Tuple[List[str], str, str]]) -> List[int]:
+        """Calcula fit_percentage para muchas postulaciones (keywords, tipo_posicion, nivel) a la vez
+        
+        Arma una matriz postulaciones × vocabulario con la cantidad de apariciones
+        de cada keyword y resuelve coincidencias, bonificaciones y porcentaje con
+        operaciones de NumPy. El resultado es idéntico al de generar_analisis_fit;
+        sin NumPy se calcula postulación por postulación.
+        """
+        if not postulaciones:
+            return []
+        if not NUMPY_AVAILABLE:
+            return [self.generar_analisis_fit(keywords, tipo, nivel, None)['fit_percentage']
+                    for keywords, tipo, nivel in postulaciones]
+        
+        # Vocabulario: fortalezas y keywords de bonos primero, después lo que aparezca
+        vocabulario: Dict[str, int] = {}
+        for kw in self.FORTALEZAS_CV + [kw for grupo, _ in self.BONOS_FIT_QA + self.BONOS_FIT_JAVA for kw in grupo] + ['java', 'python', 'fastapi']:
+            vocabulario.setdefault(kw, len(vocabulario))
+        filas, columnas = [], []
+        for fila, (keywords, _, _) in enumerate(postulaciones):
+            for kw in keywords:
+                filas.append(fila)
+                columnas.append(vocabulario.setdefault(kw, len(vocabulario)))
+        
+        matriz = np.zeros((len(postulaciones), len(vocabulario)), dtype=np.int32)
+        np.add.at(matriz, (np.array(filas, dtype=np.intp), np.array(columnas, dtype=np.intp)), 1)
+        presentes = matriz > 0
+        
+        fortalezas = np.zeros(len(vocabulario), dtype=bool)
+        fortalezas[[vocabulario[kw] for kw in self.FORTALEZAS_CV]] = True
+        
+        def contiene(keywords, solo_fortalezas=False):
+            columnas_kw = [vocabulario[kw] for kw in keywords
+                           if not solo_fortalezas or kw in self.FORTALEZAS_CV]
+            if not columnas_kw:
+                return np.zeros(len(postulaciones), dtype=bool)
+            return presentes[:, columnas_kw].any(axis=1)
+        
+        total_keywords = matriz.sum(axis=1)
+        coincidencias_count = matriz[:, fortalezas].sum(axis=1)
+        tipos = np.array([tipo for _, tipo, _ in postulaciones], dtype=object)
+        es_qa = np.isin(tipos, self.TIPOS_QA)
+        es_python = tipos == 'desarrollador_python'
+        es_java = tipos == 'desarrollador_java'
+        menciona_java = contiene(['java'])
+        
+        # Sin keywords: heurística por tipo de posición
+        fit_sin_keywords = np.where(es_qa, 75, np.where(es_python, 85, 60))
+        
+        # QA: base alta más bonificaciones
+        base_qa = np.full(len(postulaciones), 65)
+        for keywords_bono, puntos in self.BONOS_FIT_QA:
+            base_qa = base_qa + puntos * contiene(keywords_bono, solo_fortalezas=True)
+        base_qa = base_qa + 5 * (menciona_java & (tipos == 'qa_automatizacion'))
+        
+        # Desarrollo: proporción de coincidencias
+        base_desarrollo = coincidencias_count / np.maximum(total_keywords, 1) * 100
+        base_python = base_desarrollo + 15 * contiene(['python', 'fastapi'])
+        base_java = np.maximum(base_desarrollo, 50)
+        for keywords_bono, puntos in self.BONOS_FIT_JAVA:
+            base_java = base_java + puntos * contiene(keywords_bono, solo_fortalezas=True)
+        base_java = base_java + 5 * menciona_java
+        
+        base = np.where(es_qa, base_qa,
+                        np.where(es_python, base_python,
+                                 np.where(es_java, base_java, base_desarrollo)))
+        fit = np.where(total_keywords == 0, fit_sin_keywords, np.minimum(100, base))
+        return [int(valor) for valor in np.round(fit)]
+
+    def generar_analisis_fit_lote(self, postulaciones: List[Tuple[List[str], str, str]]) -> List[Dict[str, Any]]:
+        """Versión por lotes de generar_analisis_fit: mismo resultado para cada postulación"""
+        porcentajes = self.calcular_fit_lote(postulaciones)
+        resultados = []
+        for (keywords, tipo, nivel), fit_percentage in zip(postulaciones, porcentajes):
+            coincidencias = [kw for kw in keywords if kw in self.FORTALEZAS_CV]
+            brechas = self.detectar_brechas_fit(keywords, tipo, nivel, len(coincidencias))
+            resultados.append({
+                'fit_percentage': fit_percentage,
+                'coincidencias': coincidencias,
+                'brechas': brechas,
+                'recomendaciones': self.generar_recomendaciones(tipo, nivel, brechas)
+            })
+        return resultados
+
     def generar_recomendaciones(self, tipo_posicion, nivel, brechas):
         """Genera recomendaciones específicas para mejorar el fit"""
         recomendaciones = []
@@ -1511,12 +4029,25 @@ class GeneradorCVInteligente:
         
         return recomendaciones
 
-    def adaptar_cv(self, cv_base, tipo_posicion, nivel, keywords_encontradas, empresa, texto_postulacion):
+    def obtener_plantilla_cv(self, cv_base: str) -> PlantillaCV:
+        """Plantilla compilada del CV base (se recompila solo si cambió el texto)"""
+        if self._plantilla_cv is None or self._plantilla_cv.texto_cv != cv_base:
+            anclas = self.config.get('plantilla_cv', {})
+            self._plantilla_cv = PlantillaCV(
+                cv_base,
+                anclas.get('ancla_titulo', 'QA Engineer'),
+                anclas.get('seccion_perfil', 'Perfil Profesional'),
+                anclas.get('seccion_logros', 'Logros Relevantes')
+            )
+        return self._plantilla_cv
+
+    def adaptar_cv(self, cv_base, tipo_posicion, nivel, keywords_encontradas, contexto: ContextoAnalisis):
         """Adapta el CV según el tipo de posición, nivel y tipo de empresa detectado"""
         adaptacion = self.adaptaciones_cv.get(tipo_posicion, self.adaptaciones_cv['qa_manual'])
+        plantilla = self.obtener_plantilla_cv(cv_base)
         
         # Detectar tipo de empresa
-        tipo_empresa = self.detectar_tipo_empresa(texto_postulacion, empresa)
+        tipo_empresa = self.detectar_tipo_empresa(contexto)
         template_empresa = self.config['templates_empresa'][tipo_empresa]
         
         # 1. Modificar título principal según el nivel y tipo de empresa
@@ -1531,127 +4062,121 @@ class GeneradorCVInteligente:
         
         # Agregar sufijo según tipo de empresa
         titulo_adaptado += template_empresa['adaptaciones']['titulo_suffix']
-        
-        cv_adaptado = cv_base.replace('QA Engineer', titulo_adaptado)
         print(f">>> 🏢 Empresa tipo: {tipo_empresa} | Título adaptado: {titulo_adaptado}")
         
         # 2. Mejorar el perfil profesional integrando la especialización y tipo de empresa
-        perfil_original = "QA Engineer y Full Stack Developer con experiencia en validación de datos, pruebas de sistemas y desarrollo de aplicaciones en entornos ágiles y arquitecturas de microservicios."
-        
         perfil_mejorado = f"{adaptacion['titulo']} con experiencia en validación de datos, pruebas de sistemas y desarrollo de aplicaciones en entornos ágiles y arquitecturas de microservicios. {adaptacion['resumen_adicional']} {template_empresa['adaptaciones']['enfoque_experiencia']}"
+        if not perfil_mejorado.endswith('.'):
+            perfil_mejorado += '.'
         
-        cv_adaptado = cv_adaptado.replace(perfil_original, perfil_mejorado)
-        
-        # 3. Agregar experiencias relevantes en la sección de logros
-        logros_adicionales = "\n\nExperiencias Técnicas Destacadas:\n"
-        for exp in adaptacion['experiencias_extra']:
-            logros_adicionales += f"• {exp}\n"
+        # 3. Experiencias relevantes al final de la sección de logros
+        logros = ["\n\nExperiencias Técnicas Destacadas:\n"]
+        logros.extend(f"• {exp}\n" for exp in adaptacion['experiencias_extra'])
         
         # Agregar experiencias específicas del tipo de empresa
-        logros_adicionales += f"\nExperiencias orientadas a {tipo_empresa.title()}:\n"
-        for exp_empresa in template_empresa['adaptaciones']['logros_adicionales']:
-            logros_adicionales += f"• {exp_empresa}\n"
+        logros.append(f"\nExperiencias orientadas a {tipo_empresa.title()}:\n")
+        logros.extend(f"• {exp_empresa}\n" for exp_empresa in template_empresa['adaptaciones']['logros_adicionales'])
         
         # Agregar experiencias técnicas específicas según keywords
         logros_tecnicos = self.generar_experiencias_tecnicas_especificas(keywords_encontradas, tipo_posicion)
-        for exp_tec in logros_tecnicos:
-            logros_adicionales += f"• {exp_tec}\n"
+        logros.extend(f"• {exp_tec}\n" for exp_tec in logros_tecnicos)
         
         # Ajustar según nivel de seniority
         if nivel == 'junior':
-            logros_adicionales += "• Enfoque en aprendizaje continuo y adaptación a nuevas tecnologías\n"
+            logros.append("• Enfoque en aprendizaje continuo y adaptación a nuevas tecnologías\n")
         elif nivel == 'senior':
-            logros_adicionales += "• Mentoría a desarrolladores junior y liderazgo técnico en proyectos\n"
+            logros.append("• Mentoría a desarrolladores junior y liderazgo técnico en proyectos\n")
         
-        # Insertar después de "Logros Relevantes"
-        cv_adaptado = cv_adaptado.replace(
-            "Desarrollo de funcionalidades completas en plataformas de compras municipales con stack completo Python/JavaScript.",
-            f"Desarrollo de funcionalidades completas en plataformas de compras municipales con stack completo Python/JavaScript.{logros_adicionales}"
-        )
+        valores = {
+            'titulo': titulo_adaptado,
+            'perfil': perfil_mejorado,
+            'logros': ''.join(logros)
+        }
         
         # 4. Agregar keywords relevantes sutilmente
-        keywords_faltantes = []
-        for kw in keywords_encontradas:
-            if kw not in cv_adaptado.lower() and kw in ['selenium', 'java', 'spring boot', 'automatización', 'katalon', 'uft']:
-                keywords_faltantes.append(kw)
+        keywords_faltantes = [
+            kw for kw in keywords_encontradas
+            if kw in ['selenium', 'java', 'spring boot', 'automatización', 'katalon', 'uft']
+            and not plantilla.contiene(kw, valores)
+        ]
         
         if keywords_faltantes:
-            tech_adicional = f"\n\nTecnologías y herramientas relevantes que fui adquiriendo: {', '.join(keywords_faltantes).title()}"
-            cv_adaptado += tech_adicional
+            valores['tecnologias'] = f"\n\nTecnologías y herramientas relevantes que fui adquiriendo: {', '.join(keywords_faltantes).title()}"
         
-        return cv_adaptado, adaptacion['titulo']
+        return plantilla.renderizar(valores), adaptacion['titulo']
 
     def generar_cv_pdf(self, texto_cv, nombre_archivo):
-        """Genera el CV en formato PDF con mejor formato"""
+        """Genera el CV en formato PDF con mejor formato
+        
+        El PDF se arma en memoria (queda en ultimo_pdf_bytes para adjuntarlo) y
+        después se escribe, en el momento o en segundo plano si
+        escritura_pdf_asincrona está activo. Con el almacén por contenido, un CV
+        idéntico a uno ya generado no se renderiza: nombre_archivo se enlaza al existente.
+        """
         try:
-            from reportlab.lib.styles import ParagraphStyle
-            from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-            from reportlab.lib import colors
-            
-            doc = SimpleDocTemplate(nombre_archivo, pagesize=A4, 
-                                  leftMargin=50, rightMargin=50, 
-                                  topMargin=50, bottomMargin=50)
-            styles = getSampleStyleSheet()
-            
-            # Estilos personalizados
-            titulo_style = ParagraphStyle(
-                'TituloPersonal',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=6,
-                alignment=TA_CENTER,
-                textColor=colors.darkblue
-            )
-            
-            subtitulo_style = ParagraphStyle(
-                'SubtituloPersonal', 
-                parent=styles['Heading2'],
-                fontSize=12,
-                spaceAfter=8,
-                textColor=colors.darkblue,
-                borderWidth=1,
-                borderColor=colors.lightgrey,
-                borderPadding=3
-            )
+            self.ultimo_pdf_reutilizado = False
+            self.ultimo_pdf_bytes = None
+            self.ultima_escritura_pdf = None
+            hash_cv = None
+            if self.almacen_pdfs is not None:
+                hash_cv = AlmacenContenido.calcular_hash(f"pdf-v{RenderizadorPDF.VERSION}", texto_cv)
+                if self.almacen_pdfs.existe(hash_cv):
+                    self.ultimo_pdf_reutilizado = True
+                    self.ultimo_pdf_bytes = self._pdfs_recientes.get(hash_cv)
+                    self.renderizador_pdf.ultima_duracion = 0.0
+                    self.almacen_pdfs.publicar(hash_cv, nombre_archivo)
+                    logging.info(f"PDF reutilizado ({hash_cv[:12]}): {nombre_archivo}")
+                    return True
             
-            contenido = []
-            lineas = texto_cv.split('\n')
+            pdf = self.renderizador_pdf.renderizar_bytes(texto_cv)
+            self.ultimo_pdf_bytes = pdf
+            if hash_cv is not None:
+                self._pdfs_recientes[hash_cv] = pdf
+                while len(self._pdfs_recientes) > 32:
+                    self._pdfs_recientes.popitem(last=False)
+            logging.info(f"PDF generado en {self.renderizador_pdf.ultima_duracion:.3f}s: {nombre_archivo}")
             
-            for i, linea in enumerate(lineas):
-                linea = linea.strip()
-                if not linea:
-                    contenido.append(Spacer(1, 6))
-                    continue
-                
-                # Nombre (primera línea)
-                if i == 0:
-                    contenido.append(Paragraph(linea, titulo_style))
-                    contenido.append(Spacer(1, 12))
-                
-                # Títulos de sección
-                elif linea in ['Perfil Profesional', 'Logros Relevantes', 'Experiencia Profesional', 
-                              'Tecnologías y Herramientas', 'Educación', 'Experiencias Técnicas Destacadas']:
-                    contenido.append(Spacer(1, 12))
-                    contenido.append(Paragraph(linea, subtitulo_style))
-                    contenido.append(Spacer(1, 6))
-                
-                # Subtítulo de trabajo/empresa
-                elif any(empresa in linea for empresa in ['Municipalidad', 'FABRICARG', 'CECAL', 'Proyecto Freelance']):
-                    contenido.append(Spacer(1, 8))
-                    contenido.append(Paragraph(f"<b>{linea}</b>", styles["Normal"]))
-                    contenido.append(Spacer(1, 4))
-                
-                # Contenido normal
-                else:
-                    contenido.append(Paragraph(linea, styles["Normal"]))
-                    contenido.append(Spacer(1, 4))
-            
-            doc.build(contenido)
+            if self.escritura_pdf_asincrona:
+                if self._escritor_pdf is None:
+                    self._escritor_pdf = ThreadPoolExecutor(max_workers=1)
+                self.esperar_escrituras_pdf(pendientes_max=self.MAX_ESCRITURAS_PDF)
+                self.ultima_escritura_pdf = self._escritor_pdf.submit(self.escribir_pdf, pdf, nombre_archivo, hash_cv)
+                self._escrituras_pdf.append((nombre_archivo, self.ultima_escritura_pdf))
+            else:
+                self.escribir_pdf(pdf, nombre_archivo, hash_cv)
             return True
         except Exception as e:
             print(f"Error generando PDF: {e}")
             return False
 
+    def escribir_pdf(self, pdf: bytes, nombre_archivo: str, hash_cv: Optional[str] = None):
+        if hash_cv is None:
+            escribir_archivo_atomico(nombre_archivo, pdf)
+        else:
+            self.almacen_pdfs.guardar_bytes(hash_cv, pdf)
+            self.almacen_pdfs.publicar(hash_cv, nombre_archivo)
+
+    def esperar_escrituras_pdf(self, pendientes_max: Optional[int] = None) -> int:
+        """Espera las escrituras en segundo plano; devuelve cuántas fallaron
+        
+        Con pendientes_max solo se esperan las más viejas hasta dejar a lo sumo
+        esa cantidad en curso (las ya terminadas se revisan y se sacan de la lista).
+        """
+        fallidas = 0
+        en_curso = []
+        for i, (nombre_archivo, futuro) in enumerate(self._escrituras_pdf):
+            if pendientes_max is not None and not futuro.done() and len(self._escrituras_pdf) - i <= pendientes_max:
+                en_curso.append((nombre_archivo, futuro))
+                continue
+            try:
+                futuro.result()
+            except Exception as e:
+                fallidas += 1
+                print(f"❌ Error escribiendo {nombre_archivo}: {e}")
+                logging.error(f"Error escribiendo PDF {nombre_archivo}: {e}")
+        self._escrituras_pdf = en_curso
+        return fallidas
+
     def generar_speech_avanzado(self, empresa, tipo_posicion, nivel, keywords):
         """Genera un speech personalizado según el tipo de posición y nivel"""
         
@@ -1701,12 +4226,79 @@ FECHA: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
         
         return path_completo
 
+    def huella_config_analisis(self) -> str:
+        """Huella de todo lo que influye en analizar_postulacion (config + reglas fijas)"""
+        return CacheAnalisis.calcular_huella(
+            self.VERSION_ANALISIS,
+            self.perfil_tecnico,
+            self.config['tecnologias_no_conocidas'],
+            self.config['deteccion_salarios'],
+            self.config.get('reglas_tipo_posicion'),
+            self.KEYWORDS_TIPO_POSICION, self.KEYWORDS_QA_GENERAL, self.KEYWORDS_DESARROLLO_GENERAL,
+            self.KEYWORDS_SENIORITY, self.KEYWORDS_GENERALES,
+            self.FORTALEZAS_CV, self.TIPOS_QA, self.BONOS_FIT_QA, self.BONOS_FIT_JAVA, self.KEYWORDS_BRECHA_GIT
+        )
+
+    def analizar_postulacion(self, texto_postulacion: str, empresa: str) -> Tuple[Dict[str, Any], Optional[ContextoAnalisis]]:
+        """Tipo de posición, nivel, keywords, salario y fit de una postulación
+        
+        Si la misma postulación ya se analizó con la misma configuración, el
+        resultado sale de cache_analisis y el contexto devuelto es None.
+        """
+        clave = None
+        if self.cache_analisis is not None:
+            clave = self.cache_analisis.clave(texto_postulacion, empresa)
+            analisis = self.cache_analisis.obtener(clave)
+            if analisis is not None:
+                print(">>> ♻️ Postulación ya analizada: se reutiliza el análisis anterior")
+                return analisis, None
+        
+        # Normalización, tokens y keywords se calculan una sola vez para todos los detectores
+        contexto = self.crear_contexto(texto_postulacion, empresa)
+        analisis = {'tipo_posicion': None, 'nivel': None}
+        
+        # 1. Detectar tipo de posición y nivel
+        tipo_posicion, nivel = self.detectar_tipo_posicion(contexto)
+        if tipo_posicion is not None:
+            # 2. Extraer keywords
+            keywords = self.extraer_keywords_avanzado(contexto)
+            
+            # 2.5. Detectar salario
+            try:
+                info_salario = self.detectar_salario(contexto)
+            except Exception as e:
+                logging.warning(f"Error detectando salario: {e}")
+                info_salario = {}
+            
+            # 4. Generar análisis de fit ANTES de crear archivos
+            analisis = {
+                'tipo_posicion': tipo_posicion,
+                'nivel': nivel,
+                'keywords': keywords,
+                'info_salario': info_salario,
+                'analisis_fit': self.generar_analisis_fit(keywords, tipo_posicion, nivel, empresa)
+            }
+        
+        if clave is not None:
+            self.cache_analisis.guardar(clave, analisis)
+        return analisis, contexto
+
     def procesar_postulacion(self, texto_postulacion, empresa):
         """Proceso principal: analiza postulación y genera CV personalizado"""
+        plan = self.preparar_postulacion(texto_postulacion, empresa)
+        if plan is None:
+            return None
+        return self.registrar_postulacion(plan, self.generar_archivos_postulacion(plan))
+
+    def preparar_postulacion(self, texto_postulacion, empresa) -> Optional[Dict[str, Any]]:
+        """Análisis, validaciones y CV adaptado: todo lo previo a escribir archivos
+        
+        Devuelve el plan de la postulación, o None si se rechaza.
+        """
         print(f"\n>>> Analizando postulación de {empresa}...")
         
-        # 1. Detectar tipo de posición y nivel
-        tipo_posicion, nivel = self.detectar_tipo_posicion(texto_postulacion)
+        analisis, contexto = self.analizar_postulacion(texto_postulacion, empresa)
+        tipo_posicion, nivel = analisis['tipo_posicion'], analisis['nivel']
         
         # Si no detectó una posición válida, terminar aquí
         if tipo_posicion is None:
@@ -1714,21 +4306,16 @@ FECHA: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
             
         print(f">>> Tipo detectado: {tipo_posicion} ({nivel})")
         
-        # 2. Extraer keywords
-        keywords = self.extraer_keywords_avanzado(texto_postulacion)
+        keywords = analisis['keywords']
         print(f">>> Keywords encontradas: {', '.join(keywords[:5])}{'...' if len(keywords) > 5 else ''}")
         
-        # 2.5. Detectar salario
-        try:
-            info_salario = self.detectar_salario(texto_postulacion)
-            if info_salario['salario_detectado']:
-                print(f">>> Salario detectado: {info_salario['rango_min']} {info_salario['moneda']}")
-                for alerta in info_salario['alertas']:
-                    print(f">>> {alerta}")
-            else:
-                print(">>> No se detectó información salarial")
-        except Exception as e:
-            logging.warning(f"Error detectando salario: {e}")
+        info_salario = analisis['info_salario']
+        if info_salario.get('salario_detectado'):
+            print(f">>> Salario detectado: {info_salario['rango_min']} {info_salario['moneda']}")
+            for alerta in info_salario['alertas']:
+                print(f">>> {alerta}")
+        elif info_salario:
+            print(">>> No se detectó información salarial")
         
         # 3. Cargar y adaptar CV
         cv_base = self.cargar_cv_base()
@@ -1736,8 +4323,7 @@ FECHA: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
             print(">>> Error: No se pudo cargar el CV base")
             return None
             
-        # 4. Generar análisis de fit ANTES de crear archivos
-        analisis_fit = self.generar_analisis_fit(keywords, tipo_posicion, nivel, empresa)
+        analisis_fit = analisis['analisis_fit']
         print(f">>> Análisis de Fit: {analisis_fit['fit_percentage']}%")
         
         # 5. Validar estrategia de aplicación según nivel
@@ -1770,63 +4356,116 @@ FECHA: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
         print(f"✅ FIT APROPIADO ({analisis_fit['fit_percentage']}%) - Generando CV...")
         
         # 6. Adaptar CV (solo si fit >= 70%)
-        cv_adaptado, titulo_adaptado = self.adaptar_cv(cv_base, tipo_posicion, nivel, keywords, empresa, texto_postulacion)
+        if contexto is None:
+            contexto = self.crear_contexto(texto_postulacion, empresa)
+        cv_adaptado, titulo_adaptado = self.adaptar_cv(cv_base, tipo_posicion, nivel, keywords, contexto)
         
-        # 7. Generar archivos
+        # 7. Nombre del PDF y speech (los archivos se escriben en generar_archivos_postulacion)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M")
         empresa_limpia = self.limpiar_nombre_archivo(empresa)
         nombre_pdf = os.path.join(self.carpeta_salida, f"cv_{empresa_limpia}_{tipo_posicion}_{timestamp}.pdf")
         
-        if self.generar_cv_pdf(cv_adaptado, nombre_pdf):
-            print(f">>> CV generado: {nombre_pdf}")
-        else:
+        return {
+            'empresa': empresa,
+            'texto_postulacion': texto_postulacion,
+            'tipo_posicion': tipo_posicion,
+            'nivel': nivel,
+            'titulo_adaptado': titulo_adaptado,
+            'keywords': keywords,
+            'info_salario': info_salario,
+            'analisis_fit': analisis_fit,
+            'cv_adaptado': cv_adaptado,
+            'nombre_pdf': nombre_pdf,
+            'speech': self.generar_speech_avanzado(empresa, tipo_posicion, nivel, keywords)
+        }
+
+    def generar_archivos_postulacion(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """PDF, postulación y resumen de un plan de preparar_postulacion (sin prints)
+        
+        Es la parte que el modo batch con --workers manda a otros procesos. Si el
+        PDF se está escribiendo en segundo plano, 'escritura' trae ese Future: la
+        postulación no está completa hasta que termine.
+        """
+        if not self.generar_cv_pdf(plan['cv_adaptado'], plan['nombre_pdf']):
+            return {'ok': False}
+        
+        # 8. Guardar postulación
+        path_postulacion = self.guardar_postulacion(plan['texto_postulacion'], plan['empresa'], plan['tipo_posicion'])
+        
+        # 12. Guardar resumen completo
+        self.guardar_resumen(plan['empresa'], plan['tipo_posicion'], plan['nivel'], plan['titulo_adaptado'],
+                             plan['keywords'], plan['speech'], plan['analisis_fit'], plan['nombre_pdf'], path_postulacion)
+        
+        return {
+            'ok': True,
+            'postulacion_path': path_postulacion,
+            'duracion_pdf': self.renderizador_pdf.ultima_duracion,
+            'pdf_reutilizado': self.ultimo_pdf_reutilizado,
+            'escritura': self.ultima_escritura_pdf,
+            # El PDF en memoria solo viaja si se va a adjuntar
+            'pdf': self.ultimo_pdf_bytes if self.config['email_config']['enabled'] else None
+        }
+
+    def registrar_postulacion(self, plan: Dict[str, Any], archivos: Dict[str, Any],
+                              notificar: bool = True) -> Optional[Dict[str, Any]]:
+        """Informa los archivos generados, guarda en base y envía el email (siempre en el proceso principal)
+        
+        Con notificar=False el email queda a cargo del llamador (notificar_postulacion).
+        """
+        if not archivos['ok']:
             print(">>> Error generando PDF")
             return None
         
-        # 8. Guardar postulación
-        path_postulacion = self.guardar_postulacion(texto_postulacion, empresa, tipo_posicion)
+        empresa, tipo_posicion, nivel = plan['empresa'], plan['tipo_posicion'], plan['nivel']
+        nombre_pdf, path_postulacion, speech = plan['nombre_pdf'], archivos['postulacion_path'], plan['speech']
+        if archivos.get('pdf_reutilizado'):
+            print(f">>> CV generado: {nombre_pdf} (mismo contenido que uno anterior, reutilizado)")
+        else:
+            print(f">>> CV generado: {nombre_pdf} ({archivos['duracion_pdf']:.2f}s)")
         print(f">>> Postulación guardada: {path_postulacion}")
         
-        # 9. Generar speech
-        speech = self.generar_speech_avanzado(empresa, tipo_posicion, nivel, keywords)
+        # 9. Speech
         print(f"\n>>> Speech para entrevista:")
         print(f"'{speech}'\n")
         
         # Mostrar áreas de mejora si las hay
-        if analisis_fit['brechas']:
-            print(f">>> Áreas a considerar en entrevista: {', '.join(analisis_fit['brechas'])}")
+        if plan['analisis_fit']['brechas']:
+            print(f">>> Áreas a considerar en entrevista: {', '.join(plan['analisis_fit']['brechas'])}")
         
         # 10. Guardar en base de datos
         try:
             self.guardar_aplicacion_db(
-                empresa, tipo_posicion, nivel, analisis_fit['fit_percentage'],
-                info_salario if 'info_salario' in locals() else {}, keywords,
+                empresa, tipo_posicion, nivel, plan['analisis_fit']['fit_percentage'],
+                plan['info_salario'], plan['keywords'],
                 nombre_pdf, path_postulacion
             )
         except Exception as e:
             logging.warning(f"Error guardando en base de datos: {e}")
         
         # 11. Ofrecer envío de email
-        if self.config['email_config']['enabled']:
-            try:
-                self.enviar_email_aplicacion(empresa, titulo_adaptado, nombre_pdf, speech)
-            except Exception as e:
-                logging.warning(f"Error en envío de email: {e}")
-        
-        # 12. Guardar resumen completo
-        self.guardar_resumen(empresa, tipo_posicion, nivel, titulo_adaptado, keywords, speech, 
-                           analisis_fit, nombre_pdf, path_postulacion)
+        if notificar:
+            self.notificar_postulacion(plan, archivos)
         
         return {
             'empresa': empresa,
             'tipo_posicion': tipo_posicion,
-            'titulo': titulo_adaptado,
-            'keywords': keywords,
+            'titulo': plan['titulo_adaptado'],
+            'keywords': plan['keywords'],
             'cv_path': nombre_pdf,
             'postulacion_path': path_postulacion,
             'speech': speech
         }
 
+    def notificar_postulacion(self, plan: Dict[str, Any], archivos: Dict[str, Any]):
+        """Envía el email de una postulación ya registrada (si el email está habilitado)"""
+        if not self.config['email_config']['enabled']:
+            return
+        try:
+            self.enviar_email_aplicacion(plan['empresa'], plan['titulo_adaptado'], plan['nombre_pdf'],
+                                         plan['speech'], cv_bytes=archivos.get('pdf'))
+        except Exception as e:
+            logging.warning(f"Error en envío de email: {e}")
+
     def guardar_resumen(self, empresa, tipo_posicion, nivel, titulo, keywords, speech, analisis_fit, cv_path, postulacion_path):
         """Guarda un resumen completo de la postulación procesada"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1851,6 +4490,24 @@ FECHA: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
         with open(resumen_path, 'w', encoding='utf-8') as f:
             json.dump(resumen, f, ensure_ascii=False, indent=2)
 
+# Estado de cada proceso del pool de --workers (se inicializa una vez por proceso)
+_GENERADOR_WORKER: Optional[GeneradorCVInteligente] = None
+
+def _inicializar_worker_batch(config_path: str, config: Dict[str, Any], umbral_fit: int):
+    # Config efectiva del proceso principal: el archivo no tiene los overrides de la CLI (--email, --umbral)
+    global _GENERADOR_WORKER
+    _GENERADOR_WORKER = GeneradorCVInteligente(config_path, config)
+    _GENERADOR_WORKER.umbral_fit = umbral_fit
+    _GENERADOR_WORKER.cargar_cv_base()
+
+def _generar_archivos_worker(plan: Dict[str, Any]) -> Dict[str, Any]:
+    archivos = _GENERADOR_WORKER.generar_archivos_postulacion(plan)
+    # Un Future no cruza procesos: el worker espera su propia escritura
+    escritura = archivos.pop('escritura', None)
+    if escritura is not None:
+        escritura.result()
+    return archivos
+
 def parse_arguments():
     """Parsea argumentos de línea de comandos"""
     parser = argparse.ArgumentParser(
@@ -1860,8 +4517,14 @@ def parse_arguments():
 Ejemplos de uso:
   python generador_cv_avanzado.py                          # Modo interactivo
   python generador_cv_avanzado.py --batch postulaciones.csv # Modo batch
+  python generador_cv_avanzado.py --batch trabajos.parquet   # Batch desde JSONL o Parquet
+  python generador_cv_avanzado.py --batch postulaciones.csv --workers 4 # Batch con PDFs en paralelo
+  python generador_cv_avanzado.py --batch postulaciones.csv --resume # Retomar un batch cortado
+  python generador_cv_avanzado.py --batch trabajos.csv --triage --salida aptos.csv # Solo puntuar, ordenado por fit
+  python generador_cv_avanzado.py --batch trabajos.csv --max-applications 20 # Solo las 20 de mejor fit
   python generador_cv_avanzado.py --stats                   # Ver estadísticas
   python generador_cv_avanzado.py --scrape qa --save-jobs   # Buscar trabajos QA
+  python generador_cv_avanzado.py --scrape qa --save-jobs --top-k 10 # Procesar los 10 más relevantes
   python generador_cv_avanzado.py --scrape python --location "Córdoba" # Python en Córdoba
   python generador_cv_avanzado.py --empresa "TechCorp" --postulacion "Descripción..." --email
   python generador_cv_avanzado.py --batch postulaciones.csv --email # Batch con emails
@@ -1891,6 +4554,20 @@ Ejemplos de uso:
                         help='Ubicación para búsqueda (default: Buenos Aires)')
     parser.add_argument('--save-jobs', action='store_true',
                         help='Guardar trabajos encontrados en CSV')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Procesos para generar PDFs en modo batch (default: 1)')
+    parser.add_argument('--resume', action='store_true',
+                        help='En modo batch: saltear las filas ya procesadas de ese mismo CSV')
+    parser.add_argument('--triage', action='store_true',
+                        help='Con --batch: solo analizar y puntuar (sin PDFs, archivos ni base), ordenado por fit')
+    parser.add_argument('--max-applications', type=int,
+                        help='En modo batch: procesar solo las N postulaciones aptas de mayor fit')
+    parser.add_argument('--time-budget', type=float,
+                        help='En modo batch: segundos disponibles; las aptas se procesan de mayor a menor fit hasta agotarlos')
+    parser.add_argument('--salida',
+                        help='Con --triage: archivo de salida .csv, .jsonl o .parquet (default: cv_generados/triage_<fecha>.csv)')
+    parser.add_argument('--top-k', type=int,
+                        help='Con --save-jobs: procesar solo los K trabajos más relevantes para tu CV (override config)')
     parser.add_argument('--test-portales', action='store_true',
                         help='Testear conectividad de todos los portales')
     parser.add_argument('--debug-html', 
@@ -1955,36 +4632,50 @@ def main():
         print(f"🕷️ Scraping habilitado: {'SÍ' if generador.config['scraping_config']['enabled'] else 'NO'}\n")
         
         try:
+            if args.save_jobs:
+                # Streaming: cada trabajo se escribe al CSV apenas se parsea
+                trabajos = generador.iterar_trabajos_automatico(args.scrape, args.location)
+                ranking_config = generador.config['scraping_config'].get('ranking', {})
+                top_k = args.top_k or ranking_config.get('top_k')
+                rankear = bool(top_k) and (ranking_config.get('enabled', False) or args.top_k)
+                if rankear:
+                    trabajos = generador.indexar_trabajos_relevancia(trabajos)
+                csv_path = generador.guardar_trabajos_csv(trabajos)
+                if csv_path and rankear:
+                    # Procesar primero (y solo) los más relevantes para el CV base
+                    csv_path = generador.rankear_csv_trabajos(csv_path, top_k)
+                if csv_path:
+                    # Preguntar si procesar automáticamente
+                    respuesta = input(f"\n¿Procesar los trabajos guardados automáticamente? (y/N): ").strip().lower()
+                    if respuesta in ['y', 'yes', 'sí', 's']:
+                        print(f"\n🚀 Procesando trabajos con modo batch...")
+                        resultados = generador.procesar_batch_csv(csv_path, args.workers)
+                        generador.mostrar_resumen_batch(resultados)
+                    else:
+                        print(f"💾 Trabajos guardados en: {csv_path}")
+                        print("💡 Para procesar después: python generador_cv_avanzado.py --batch " + csv_path)
+                else:
+                    print("❌ No se encontraron trabajos con los criterios especificados")
+                return
+            
             trabajos = generador.buscar_trabajos_automatico(args.scrape, args.location)
+            if trabajos and generador.config['scraping_config'].get('ranking', {}).get('enabled', False):
+                trabajos = generador.rankear_trabajos(trabajos)
             
             if trabajos:
-                # Guardar en CSV si se solicita
-                if args.save_jobs:
-                    csv_path = generador.guardar_trabajos_csv(trabajos)
-                    if csv_path:
-                        # Preguntar si procesar automáticamente
-                        respuesta = input(f"\n¿Procesar estos {len(trabajos)} trabajos automáticamente? (y/N): ").strip().lower()
-                        if respuesta in ['y', 'yes', 'sí', 's']:
-                            print(f"\n🚀 Procesando trabajos con modo batch...")
-                            resultados = generador.procesar_batch_csv(csv_path)
-                            generador.mostrar_resumen_batch(resultados)
-                        else:
-                            print(f"💾 Trabajos guardados en: {csv_path}")
-                            print("💡 Para procesar después: python generador_cv_avanzado.py --batch " + csv_path)
-                else:
-                    # Solo mostrar resumen
-                    print(f"\n📋 TRABAJOS ENCONTRADOS ({len(trabajos)}):")
-                    for i, trabajo in enumerate(trabajos[:10], 1):  # Mostrar primeros 10
-                        print(f"   {i}. {trabajo['company']} - {trabajo['title']}")
-                        if trabajo['salary']:
-                            print(f"      💰 {trabajo['salary']}")
-                        print(f"      📍 {trabajo['location']} | 🌐 {trabajo['portal']}")
-                        print()
-                    
-                    if len(trabajos) > 10:
-                        print(f"   ... y {len(trabajos) - 10} trabajos más")
-                    
-                    print(f"\n💡 Para guardar y procesar: --scrape {args.scrape} --save-jobs")
+                # Solo mostrar resumen
+                print(f"\n📋 TRABAJOS ENCONTRADOS ({len(trabajos)}):")
+                for i, trabajo in enumerate(trabajos[:10], 1):  # Mostrar primeros 10
+                    print(f"   {i}. {trabajo['company']} - {trabajo['title']}")
+                    if trabajo['salary']:
+                        print(f"      💰 {trabajo['salary']}")
+                    print(f"      📍 {trabajo['location']} | 🌐 {trabajo['portal']}")
+                    print()
+                
+                if len(trabajos) > 10:
+                    print(f"   ... y {len(trabajos) - 10} trabajos más")
+                
+                print(f"\n💡 Para guardar y procesar: --scrape {args.scrape} --save-jobs")
             else:
                 print("❌ No se encontraron trabajos con los criterios especificados")
                 
@@ -1993,6 +4684,18 @@ def main():
             logging.error(f"Error en modo scraping: {e}")
         return
     
+    if args.batch and args.triage:
+        # Solo análisis: puntúa el CSV sin generar archivos
+        print(">>> Generador de CV Inteligente v3.0 - TRIAGE")
+        print(f"📁 Analizando archivo: {args.batch}")
+        
+        try:
+            resultados = generador.triage_batch_csv(args.batch, args.salida)
+            generador.mostrar_resumen_triage(resultados)
+        except Exception as e:
+            print(f"❌ Error en triage: {e}")
+        return
+    
     if args.batch:
         # Modo batch
         print(">>> Generador de CV Inteligente v3.0 - MODO BATCH")
@@ -2000,7 +4703,9 @@ def main():
         print(f"🎯 Umbral mínimo de fit: {generador.umbral_fit}%\n")
         
         try:
-            resultados = generador.procesar_batch_csv(args.batch)
+            resultados = generador.procesar_batch_csv(args.batch, args.workers, reanudar=args.resume,
+                                                      max_aplicaciones=args.max_applications,
+                                                      tiempo_limite=args.time_budget)
             generador.mostrar_resumen_batch(resultados)
         except Exception as e:
             print(f"❌ Error en modo batch: {e}")
@@ -0,0 +1,41 @@
+"""Fixtures compartidas: cada test corre en una carpeta temporal con su propia aplicaciones.db."""
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+def cargar_config():
+    with open(os.path.join(RAIZ, 'config.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def carpeta_temporal(tmp_path, monkeypatch):
+    """Carpeta de trabajo con el CV base; la config se escribe con escribir_config"""
+    shutil.copy(os.path.join(RAIZ, 'cv_hilario.docx'), tmp_path)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def escribir_config(carpeta, config):
+    with open(os.path.join(carpeta, 'config.json'), 'w', encoding='utf-8') as f:
+        json.dump(config, f)
+
+
+@pytest.fixture
+def generador(carpeta_temporal):
+    """Generador con la config del repo, sin email ni cache de análisis"""
+    import generador_cv_avanzado as gcv
+    config = cargar_config()
+    config['email_config']['enabled'] = False
+    config['cache_analisis']['enabled'] = False
+    escribir_config(carpeta_temporal, config)
+    generador = gcv.GeneradorCVInteligente()
+    yield generador
+    generador.db.cerrar()
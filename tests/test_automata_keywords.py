@@ -0,0 +1,55 @@
+"""AutomataKeywords: un escaneo con todas las keywords, sus categorías y offsets."""
+import random
+
+import generador_cv_avanzado as gcv
+
+
+def test_solapamientos_y_offsets():
+    automata = gcv.AutomataKeywords({'lenguajes': ['java', 'javascript', 'script']})
+    coincidencias = automata.buscar('sabemos javascript y java')
+    assert sorted(coincidencias.hits) == [(8, 'java'), (8, 'javascript'), (12, 'script'), (21, 'java')]
+
+
+def test_normaliza_tildes_y_mayusculas():
+    automata = gcv.AutomataKeywords({'qa': ['Automatización']})
+    coincidencias = automata.buscar('Experiencia en AUTOMATIZACION de pruebas')
+    assert coincidencias.contiene('automatización')
+    assert coincidencias.contiene('AUTOMATIZACION')
+
+
+def test_siglas_solo_como_palabra_completa():
+    automata = gcv.AutomataKeywords({'siglas': ['jr', 'git', 'api']})
+    assert not automata.buscar('fan de los jrpg y del marketing digital').hits
+    coincidencias = automata.buscar('perfil jr, manejo de git y apis rest')
+    assert coincidencias.presentes(['jr', 'git', 'api']) == ['jr', 'git', 'api']
+
+
+def test_extra_solo_cuenta_en_todo():
+    automata = gcv.AutomataKeywords({'empresas': ['globant']})
+    coincidencias = automata.buscar('buscamos qa', 'Globant')
+    assert not coincidencias.contiene('globant')
+    assert coincidencias.contiene_en_todo('globant')
+
+
+def test_vocabulario_vacio():
+    automata = gcv.AutomataKeywords({'vacia': []})
+    assert automata.buscar('cualquier texto').hits == []
+
+
+def test_equivale_a_buscar_substrings():
+    # Las keywords largas (más que una sigla) se comportan como `kw in texto`
+    keywords = ['python', 'selenium', 'spring boot', 'spring', 'automation', 'front-end', 'vue.js']
+    automata = gcv.AutomataKeywords({'todas': keywords})
+    azar = random.Random(7)
+    palabras = keywords + ['de', 'con', 'equipo', 'boot', 'front', 'end', 'vue', 'js', '.', '-']
+    for _ in range(200):
+        texto = ' '.join(azar.choice(palabras) for _ in range(azar.randint(1, 15)))
+        coincidencias = automata.buscar(texto)
+        assert coincidencias.presentes(keywords) == [kw for kw in keywords if kw in texto]
+
+
+def test_automata_del_generador_cubre_los_vocabularios(generador):
+    categorias = generador.automata_keywords.categorias
+    assert {'qa_general', 'spam', 'tipo:qa_automatizacion', 'seniority:junior'} <= set(categorias)
+    for categoria, keywords in generador.perfil_tecnico.items():
+        assert f'perfil:{categoria}' in categorias
@@ -0,0 +1,74 @@
+"""Regresiones de la detección de casi-duplicados entre corridas."""
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import generador_cv_avanzado as gcv  # noqa: E402
+
+TRABAJO = {
+    'title': 'QA Automation Engineer',
+    'company': 'Acme',
+    'description': ('Buscamos QA Automation con experiencia en Selenium, Python, Postman y APIs REST '
+                    'para sumarse a un equipo ágil de producto en Buenos Aires. Modalidad híbrida, '
+                    'contratación efectiva y capacitaciones.'),
+    'portal': 'computrabajo',
+    'salary': '',
+    'location': 'Buenos Aires',
+    'url': 'https://example.com/aviso/1',
+    'scraped_at': '2024-01-01 00:00:00',
+}
+
+
+@pytest.fixture
+def carpeta(tmp_path, monkeypatch):
+    with open(os.path.join(RAIZ, 'config.json'), encoding='utf-8') as f:
+        config = json.load(f)
+    config['scraping_config']['enabled'] = True
+    config['scraping_config']['solo_trabajos_nuevos'] = False
+    config['deteccion_duplicados']['enabled'] = True
+    for portal in config['scraping_config']['portales'].values():
+        portal['enabled'] = False
+    config['scraping_config']['portales']['computrabajo']['enabled'] = True
+    config['scraping_config']['keywords_busqueda'] = {'qa': ['qa']}
+    with open(tmp_path / 'config.json', 'w', encoding='utf-8') as f:
+        json.dump(config, f)
+    shutil.copy(os.path.join(RAIZ, 'cv_hilario.docx'), tmp_path)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def scrapear(monkeypatch, trabajos, guardar=False):
+    """Una corrida de --scrape con un generador nuevo; con guardar, como --save-jobs"""
+    monkeypatch.setattr(gcv.GeneradorCVInteligente, 'iterar_trabajos_portal',
+                        lambda self, *args, **kwargs: iter([dict(t) for t in trabajos]))
+    generador = gcv.GeneradorCVInteligente()
+    try:
+        emitidos = list(generador.iterar_trabajos_automatico('qa'))
+        if guardar:
+            generador.guardar_trabajos_csv(emitidos, 'trabajos.csv')
+        return emitidos
+    finally:
+        generador.db.cerrar()
+
+
+def test_mismo_trabajo_en_dos_corridas_no_es_casi_duplicado(carpeta, monkeypatch):
+    assert len(scrapear(monkeypatch, [TRABAJO], guardar=True)) == 1
+    assert len(scrapear(monkeypatch, [TRABAJO], guardar=True)) == 1
+
+
+def test_aviso_republicado_sigue_siendo_casi_duplicado(carpeta, monkeypatch):
+    assert len(scrapear(monkeypatch, [TRABAJO], guardar=True)) == 1
+    republicado = dict(TRABAJO, title='QA Automation Engineer (híbrido)')
+    assert scrapear(monkeypatch, [republicado]) == []
+
+
+def test_aviso_solo_listado_no_deja_huella(carpeta, monkeypatch):
+    assert len(scrapear(monkeypatch, [TRABAJO])) == 1
+    republicado = dict(TRABAJO, title='QA Automation Engineer (híbrido)')
+    assert len(scrapear(monkeypatch, [republicado])) == 1
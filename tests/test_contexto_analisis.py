@@ -0,0 +1,41 @@
+"""ContextoAnalisis y los detectores que lo consumen: tildes y límites de palabra."""
+import pytest
+
+
+def test_contexto_normaliza_una_vez(generador):
+    contexto = generador.crear_contexto("  Automatización   QA\tJR ", "")
+    assert contexto.texto == 'automatización qa jr'
+    assert contexto.texto_plegado == 'automatizacion qa jr'
+    assert len(contexto.texto_plegado) == len(contexto.texto)
+    assert contexto.tokens == ['automatizacion', 'qa', 'jr']
+    assert contexto.indice_tokens == {'automatizacion': [0], 'qa': [1], 'jr': [2]}
+    assert contexto.tiene_token('Automatización')
+
+
+def test_con_y_sin_tildes_dan_el_mismo_analisis(generador):
+    con_tilde = generador.crear_contexto('QA automatización con Selenium, junior', 'Acme')
+    sin_tilde = generador.crear_contexto('QA automatizacion con selenium, junior', 'Acme')
+    assert generador.detectar_tipo_posicion(con_tilde) == ('qa_automatizacion', 'junior')
+    assert generador.detectar_tipo_posicion(sin_tilde) == ('qa_automatizacion', 'junior')
+    assert sorted(generador.extraer_keywords_avanzado(con_tilde)) == sorted(generador.extraer_keywords_avanzado(sin_tilde))
+
+
+@pytest.mark.parametrize('texto, nivel', [
+    ('Desarrollador python, fan de jrpg', 'semi_senior'),
+    ('Developer java, spring boot, jr', 'junior'),
+    ('QA manual senior, casos de prueba', 'senior'),
+])
+def test_siglas_de_seniority_como_palabra(generador, texto, nivel):
+    assert generador.detectar_nivel_seniority(generador.crear_contexto(texto)) == nivel
+
+
+def test_siglas_de_keywords_como_palabra(generador):
+    keywords = generador.extraer_keywords_avanzado(generador.crear_contexto('qa con experiencia en git y apis'))
+    assert {'git', 'api'} <= set(keywords)
+    keywords = generador.extraer_keywords_avanzado(generador.crear_contexto('qa para marketing digital'))
+    assert 'git' not in keywords
+
+
+def test_detectores_aceptan_texto_plano(generador):
+    texto = 'QA manual senior, casos de prueba'
+    assert generador.detectar_tipo_posicion(texto) == generador.detectar_tipo_posicion(generador.crear_contexto(texto))
@@ -0,0 +1,45 @@
+"""calcular_fit_lote / generar_analisis_fit_lote contra generar_analisis_fit."""
+import random
+
+import pytest
+
+import generador_cv_avanzado as gcv
+
+NIVELES = ['junior', 'semi_senior', 'senior']
+
+
+def postulaciones_al_azar(generador, cantidad, semilla=11):
+    azar = random.Random(semilla)
+    bonos = [kw for grupo, _ in generador.BONOS_FIT_QA + generador.BONOS_FIT_JAVA for kw in grupo]
+    vocabulario = generador.FORTALEZAS_CV + bonos + ['kotlin', 'php', 'go', 'excel', 'base de datos', 'ágiles']
+    tipos = list(generador.KEYWORDS_TIPO_POSICION)
+    postulaciones = []
+    for _ in range(cantidad):
+        # Con repetidas: una keyword puede aparecer en más de una categoría del perfil
+        keywords = [azar.choice(vocabulario) for _ in range(azar.randint(0, 20))]
+        postulaciones.append((keywords, azar.choice(tipos), azar.choice(NIVELES)))
+    return postulaciones
+
+
+def test_fit_lote_identico_al_individual(generador):
+    postulaciones = postulaciones_al_azar(generador, 500)
+    esperados = [generador.generar_analisis_fit(kw, tipo, nivel, None)['fit_percentage']
+                 for kw, tipo, nivel in postulaciones]
+    assert generador.calcular_fit_lote(postulaciones) == esperados
+
+
+def test_analisis_lote_identico_al_individual(generador):
+    postulaciones = postulaciones_al_azar(generador, 100, semilla=3)
+    esperados = [generador.generar_analisis_fit(kw, tipo, nivel, None) for kw, tipo, nivel in postulaciones]
+    assert generador.generar_analisis_fit_lote(postulaciones) == esperados
+
+
+def test_sin_numpy_mismo_resultado(generador, monkeypatch):
+    postulaciones = postulaciones_al_azar(generador, 50, semilla=5)
+    con_numpy = generador.calcular_fit_lote(postulaciones)
+    monkeypatch.setattr(gcv, 'NUMPY_AVAILABLE', False)
+    assert generador.calcular_fit_lote(postulaciones) == con_numpy
+
+
+def test_lote_vacio(generador):
+    assert generador.calcular_fit_lote([]) == []
@@ -0,0 +1,86 @@
+"""journal_batch: --resume saltea las filas terminadas y reintenta las que fallaron."""
+import csv
+import sqlite3
+
+import pytest
+
+import generador_cv_avanzado as gcv
+from conftest import cargar_config, escribir_config
+
+FILAS = [
+    ('Acme', 'QA Automation Engineer con Selenium, Python y Postman, junior'),
+    ('Globex', 'Desarrollador Python FastAPI y PostgreSQL, semi senior'),
+    ('Initech', 'QA manual, casos de prueba y testing funcional de APIs REST'),
+    ('Umbrella', 'Vendedor de seguros para zona norte'),
+]
+
+
+@pytest.fixture
+def batch(carpeta_temporal):
+    config = cargar_config()
+    config['email_config']['enabled'] = False
+    config['cache_analisis']['enabled'] = False
+    config['deteccion_duplicados']['enabled'] = False
+    escribir_config(carpeta_temporal, config)
+    ruta = carpeta_temporal / 'postulaciones.csv'
+    with open(ruta, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(['empresa', 'descripcion'])
+        escritor.writerows(FILAS)
+    return str(ruta)
+
+
+def correr(archivo, reanudar=False, asincrona=False):
+    generador = gcv.GeneradorCVInteligente()
+    generador.config['configuracion_general']['escritura_pdf_asincrona'] = asincrona
+    try:
+        return generador.procesar_batch_csv(archivo, reanudar=reanudar)
+    finally:
+        generador.db.cerrar()
+
+
+def aplicaciones():
+    with sqlite3.connect('aplicaciones.db') as conn:
+        return conn.execute('SELECT COUNT(*) FROM aplicaciones').fetchone()[0]
+
+
+def estados_journal():
+    with sqlite3.connect('aplicaciones.db') as conn:
+        return dict(conn.execute('SELECT fila, estado FROM journal_batch'))
+
+
+def test_resume_saltea_filas_terminadas(batch):
+    primera = correr(batch)
+    assert primera['procesadas'] == len(FILAS)
+    assert primera['exitosas'] == 3
+    assert aplicaciones() == 3
+    
+    segunda = correr(batch, reanudar=True)
+    assert segunda['reanudadas'] == len(FILAS)
+    assert segunda['procesadas'] == 0
+    assert aplicaciones() == 3
+
+
+def test_sin_resume_se_procesa_de_nuevo(batch):
+    correr(batch)
+    assert correr(batch)['procesadas'] == len(FILAS)
+
+
+@pytest.mark.parametrize('asincrona', [False, True])
+def test_error_de_escritura_se_reintenta(batch, monkeypatch, asincrona):
+    def disco_lleno(self, *args, **kwargs):
+        raise OSError('No space left on device')
+    
+    with monkeypatch.context() as m:
+        m.setattr(gcv.GeneradorCVInteligente, 'escribir_pdf', disco_lleno)
+        fallida = correr(batch, asincrona=asincrona)
+    assert fallida['exitosas'] == 0
+    assert fallida['errores'] == 3
+    assert aplicaciones() == 0
+    assert sorted(estados_journal().values()) == ['error', 'error', 'error', 'rechazada']
+    
+    reintento = correr(batch, reanudar=True, asincrona=asincrona)
+    assert reintento['reanudadas'] == 1
+    assert reintento['exitosas'] == 3
+    assert aplicaciones() == 3
+    assert 'error' not in estados_journal().values()
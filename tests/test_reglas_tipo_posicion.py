@@ -0,0 +1,69 @@
+"""ReglasTipoPosicion: la tabla compilada puntúa igual que la cadena de reglas original."""
+import copy
+import logging
+
+import pytest
+
+import generador_cv_avanzado as gcv
+
+POSTULACIONES = [
+    'QA Automation con Selenium y Cypress',
+    'QA manual, casos de prueba y testing funcional',
+    'Desarrollador Python Django, pandas',
+    'Developer Java Spring Boot, hibernate',
+    'Programador frontend Vue.js y TypeScript',
+    'Desarrollador full-stack Angular + Spring',
+    'Desarrollador con ganas de aprender',
+    'Quality assurance para app bancaria',
+    'Vendedor de seguros',
+    'Automatización de pruebas con Python y Locust, programador QA',
+]
+
+
+@pytest.mark.parametrize('texto', POSTULACIONES)
+def test_tabla_igual_a_legacy(generador, texto):
+    coincidencias = generador.crear_contexto(texto, 'Acme').coincidencias
+    puntos, _ = generador.reglas_tipo_posicion.puntuar(coincidencias)
+    assert puntos == generador.puntos_tipo_posicion_legacy(coincidencias)
+
+
+def test_spec_por_defecto_equivale_a_config(generador):
+    por_defecto = gcv.ReglasTipoPosicion(gcv.GeneradorCVInteligente.reglas_tipo_posicion_por_defecto())
+    for texto in POSTULACIONES:
+        coincidencias = generador.crear_contexto(texto).coincidencias
+        assert por_defecto.puntuar(coincidencias) == generador.reglas_tipo_posicion.puntuar(coincidencias)
+
+
+def test_desarrollo_sin_tecnologia(generador):
+    puntos, sin_tecnologia = generador.reglas_tipo_posicion.puntuar(generador.crear_contexto('Desarrollador junior').coincidencias)
+    assert sin_tecnologia
+    assert max(puntos.values()) == 0
+
+
+def test_empresa_no_suma_puntos(generador):
+    coincidencias = generador.crear_contexto('Vendedor de seguros', 'Python Software').coincidencias
+    puntos, _ = generador.reglas_tipo_posicion.puntuar(coincidencias)
+    assert puntos['desarrollador_python'] == 0
+
+
+def test_tipo_desconocido():
+    spec = gcv.GeneradorCVInteligente.reglas_tipo_posicion_por_defecto()
+    spec['reglas'].append({'keywords': ['go'], 'puntos': {'desarrollador_go': 3}})
+    with pytest.raises(gcv.ConfigurationError):
+        gcv.ReglasTipoPosicion(spec)
+
+
+def test_modo_regresion_avisa_diferencias(generador, caplog):
+    generador.config['reglas_tipo_posicion']['modo_regresion'] = True
+    contexto = generador.crear_contexto('Desarrollador Python Django')
+    
+    with caplog.at_level(logging.WARNING):
+        generador.detectar_tipo_posicion(contexto)
+    assert 'Regresión en reglas_tipo_posicion' not in caplog.text
+    
+    spec = copy.deepcopy(generador.config['reglas_tipo_posicion'])
+    spec['reglas'][2]['puntos'] = {'desarrollador_python': 5}
+    generador.reglas_tipo_posicion = gcv.ReglasTipoPosicion(spec)
+    with caplog.at_level(logging.WARNING):
+        generador.detectar_tipo_posicion(contexto)
+    assert 'Regresión en reglas_tipo_posicion' in caplog.text
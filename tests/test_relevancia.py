@@ -0,0 +1,80 @@
+"""IndiceBM25 y el ranking de trabajos scrapeados contra el CV base."""
+import math
+
+import pytest
+
+import generador_cv_avanzado as gcv
+
+DOCUMENTOS = {
+    'a': 'QA automation con Selenium y Python',
+    'b': 'Desarrollador Java Spring Boot',
+    'c': 'Vendedor de seguros para zona norte',
+    'd': 'Python FastAPI PostgreSQL, testing de APIs con Python',
+}
+
+
+def indice_con(documentos):
+    indice = gcv.IndiceBM25()
+    for clave, texto in documentos.items():
+        indice.agregar(clave, gcv.IndiceBM25.frecuencias(texto))
+    return indice
+
+
+def test_tokenizar_sin_stopwords_numeros_ni_tildes():
+    assert gcv.IndiceBM25.tokenizar('Automatización de la API en 2024, con Python') == ['automatizacion', 'api', 'python']
+
+
+def test_puntaje_bm25():
+    indice = indice_con(DOCUMENTOS)
+    k1, b = indice.k1, indice.b
+    largos = {clave: len(gcv.IndiceBM25.tokenizar(texto)) for clave, texto in DOCUMENTOS.items()}
+    promedio = sum(largos.values()) / len(largos)
+    df = 2  # 'python' aparece en a y d
+    idf = math.log(1 + (len(DOCUMENTOS) - df + 0.5) / (df + 0.5))
+    esperado_d = idf * 2 * (k1 + 1) / (2 + k1 * (1 - b + b * largos['d'] / promedio))
+    puntajes = indice.puntuar(['python'])
+    assert set(puntajes) == {'a', 'd'}
+    assert puntajes['d'] == pytest.approx(esperado_d)
+
+
+def test_mejores_ordena_y_filtra():
+    indice = indice_con(DOCUMENTOS)
+    consulta = gcv.IndiceBM25.tokenizar('Python testing Selenium QA')
+    mejores = [clave for clave, _ in indice.mejores(consulta, 2)]
+    assert set(mejores) == {'a', 'd'}
+    assert [clave for clave, _ in indice.mejores(consulta, 5, claves=['b', 'c', 'd'])] == ['d']
+
+
+def test_actualizacion_incremental():
+    completo = indice_con(DOCUMENTOS)
+    incremental = indice_con(dict(DOCUMENTOS, e='Recepcionista bilingüe'))
+    incremental.quitar('e')
+    # Reemplazar un documento con su mismo contenido no cambia nada
+    incremental.agregar('a', gcv.IndiceBM25.frecuencias(DOCUMENTOS['a']))
+    consulta = ['python', 'java', 'selenium']
+    assert incremental.total == completo.total
+    assert incremental.puntuar(consulta) == pytest.approx(completo.puntuar(consulta))
+
+
+def trabajo(titulo, descripcion):
+    return {'title': titulo, 'company': 'Acme', 'description': descripcion, 'portal': 'p',
+            'salary': '', 'location': '', 'url': '', 'scraped_at': ''}
+
+
+def test_rankear_trabajos_y_persistencia(generador):
+    trabajos = [
+        trabajo('Vendedor', 'Venta de seguros puerta a puerta'),
+        trabajo('QA Automation', 'Selenium, Python, Postman, APIs REST, SQL, Scrum'),
+        trabajo('Cocinero', 'Cocina de restaurante'),
+    ]
+    ranking = generador.rankear_trabajos(trabajos, top_k=2)
+    assert [t['title'] for t in ranking][0] == 'QA Automation'
+    assert len(ranking) == 2
+    assert ranking[0]['relevancia'] > ranking[1]['relevancia']
+
+    # Otra corrida carga el índice desde aplicaciones.db
+    otro = gcv.GeneradorCVInteligente()
+    try:
+        assert otro.obtener_indice_relevancia().total == 3
+    finally:
+        otro.db.cerrar()
@@ -0,0 +1,59 @@
+"""MotorSalarios: importes, rangos y análisis en lote."""
+import json
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import generador_cv_avanzado as gcv  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def motor():
+    with open(os.path.join(RAIZ, 'config.json'), encoding='utf-8') as f:
+        return gcv.MotorSalarios(json.load(f)['deteccion_salarios'])
+
+
+@pytest.mark.parametrize('texto, moneda, minimo, maximo', [
+    ('usd 1.200 - 1.800', 'USD', 1200, 1800),
+    ('entre 1.2 - 1.8k usd', 'USD', 1200, 1800),
+    ('1000 a 1500 dolares', 'USD', 1000, 1500),
+    ('sueldo 1.5k usd', 'USD', 1500, None),
+    ('u$s 2000', 'USD', 2000, None),
+    ('$ 150 mil', 'ARS', 150000, None),
+    ('200000 - 300000 pesos', 'ARS', 200000, 300000),
+])
+def test_importes_y_rangos(motor, texto, moneda, minimo, maximo):
+    resultado = motor.analizar(texto)
+    assert resultado['salario_detectado']
+    assert (resultado['moneda'], resultado['rango_min'], resultado['rango_max']) == (moneda, minimo, maximo)
+
+
+@pytest.mark.parametrize('texto, montos', [
+    ('usd 1200 a 3 años de experiencia', [1200]),
+    ('2000 - 1500 usd', [1500]),
+    ('3 a 1500 usd', [1500]),
+])
+def test_no_son_rangos(motor, texto, montos):
+    assert [m['valor'] for m in motor.extraer_montos(texto)] == montos
+
+
+def test_usd_tiene_prioridad_sobre_ars(motor):
+    resultado = motor.analizar('$ 900000 pesos o usd 1500')
+    assert resultado['moneda'] == 'USD'
+    assert resultado['rango_min'] == 1500
+
+
+def test_sin_salario(motor):
+    resultado = motor.analizar('buscamos qa con 3 años de experiencia')
+    assert not resultado['salario_detectado']
+    assert resultado['moneda'] is None
+
+
+def test_lote_equivale_a_uno_por_uno(motor):
+    textos = ['USD 1.200 - 1.800', '', None, 'entre 1.2 - 1.8k USD', '$ 150 mil', 'Sin datos', 'u$s 2000']
+    por_texto = [motor.analizar(gcv.plegar_acentos(' '.join((t or '').lower().split()))) for t in textos]
+    assert motor.analizar_lote(textos) == por_texto
@@ -0,0 +1,78 @@
+"""leer_tabla y EscritorTabla: ida y vuelta en CSV, JSONL y Parquet."""
+import pytest
+
+import generador_cv_avanzado as gcv
+
+COLUMNAS = ['empresa', 'descripcion', 'fit', 'puntaje', 'apta']
+TIPOS = {'fit': 'int', 'puntaje': 'float', 'apta': 'bool'}
+FILAS = [
+    {'empresa': 'Acme', 'descripcion': 'QA "automation", Selenium\ny Python', 'fit': 80, 'puntaje': 1.5, 'apta': True},
+    {'empresa': 'Ñandú S.A.', 'descripcion': 'Desarrollador Java', 'fit': 40, 'puntaje': 0.25, 'apta': False},
+    {'empresa': 'Globex', 'descripcion': '', 'fit': 0, 'puntaje': 0.0, 'apta': False},
+]
+
+requiere_pyarrow = pytest.mark.skipif(not gcv.PYARROW_AVAILABLE, reason='pyarrow no instalado')
+
+
+def escribir(ruta, filas=FILAS, **kwargs):
+    with gcv.EscritorTabla(str(ruta), COLUMNAS, tipos=TIPOS, **kwargs) as escritor:
+        for fila in filas:
+            escritor.escribir(fila)
+    return escritor
+
+
+@pytest.mark.parametrize('extension, formato', [
+    ('.csv', 'csv'), ('.CSV', 'csv'), ('.jsonl', 'jsonl'), ('.ndjson', 'jsonl'),
+    ('.parquet', 'parquet'), ('.pq', 'parquet'), ('.txt', 'csv'),
+])
+def test_formato_por_extension(extension, formato):
+    assert gcv.formato_tabla(f'datos{extension}') == formato
+
+
+def test_csv_ida_y_vuelta(tmp_path):
+    ruta = tmp_path / 'reporte.csv'
+    assert escribir(ruta).total == len(FILAS)
+    # CSV no tiene tipos: todo vuelve como texto
+    assert list(gcv.leer_tabla(str(ruta))) == [{c: str(v) for c, v in fila.items()} for fila in FILAS]
+
+
+def test_jsonl_ida_y_vuelta(tmp_path):
+    ruta = tmp_path / 'reporte.jsonl'
+    escribir(ruta)
+    assert list(gcv.leer_tabla(str(ruta))) == FILAS
+
+
+@requiere_pyarrow
+def test_parquet_ida_y_vuelta_en_varios_grupos(tmp_path):
+    ruta = tmp_path / 'reporte.parquet'
+    escribir(ruta, filas_por_grupo=2)
+    assert gcv.pq.ParquetFile(str(ruta)).num_row_groups == 2
+    assert list(gcv.leer_tabla(str(ruta), filas_por_lote=1)) == FILAS
+
+
+@pytest.mark.parametrize('nombre', [
+    'reporte.csv', 'reporte.jsonl', pytest.param('reporte.parquet', marks=requiere_pyarrow),
+])
+def test_proyeccion_de_columnas(tmp_path, nombre):
+    ruta = tmp_path / nombre
+    escribir(ruta)
+    filas = list(gcv.leer_tabla(str(ruta), ['descripcion', 'empresa', 'no_existe']))
+    assert [sorted(fila) for fila in filas] == [['descripcion', 'empresa']] * len(FILAS)
+    assert [fila['empresa'] for fila in filas] == [fila['empresa'] for fila in FILAS]
+
+
+def test_columnas_de_mas_y_de_menos(tmp_path):
+    filas = [{'empresa': 'Acme', 'descripcion': 'QA', 'extra': 'x'}]
+    escribir(tmp_path / 'r.csv', filas)
+    escribir(tmp_path / 'r.jsonl', filas)
+    assert list(gcv.leer_tabla(str(tmp_path / 'r.csv'))) == [
+        {'empresa': 'Acme', 'descripcion': 'QA', 'fit': '', 'puntaje': '', 'apta': ''}]
+    assert list(gcv.leer_tabla(str(tmp_path / 'r.jsonl'))) == [{'empresa': 'Acme', 'descripcion': 'QA'}]
+
+
+def test_parquet_sin_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(gcv, 'PYARROW_AVAILABLE', False)
+    with pytest.raises(gcv.FileProcessingError):
+        gcv.EscritorTabla(str(tmp_path / 'reporte.parquet'), COLUMNAS)
+    with pytest.raises(gcv.FileProcessingError):
+        list(gcv.leer_tabla(str(tmp_path / 'reporte.parquet')))